@@ -0,0 +1,89 @@
+from typing import AsyncGenerator, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import db_manager, replica_router
+from app.schemas.auth import UserResponse
+from app.services.rate_limit import client_ip
+from app.services.sessions import hash_token, session_store
+
+# Set by ReadYourWritesMiddleware after a write; reads go to the primary while present
+READ_PRIMARY_COOKIE = "db_read_primary"
+
+
+def get_session_token(request: Request) -> Optional[str]:
+    """
+    Read the session token from an `Authorization: Bearer` header or,
+    failing that, from the session_token cookie set by /auth/verify.
+    """
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token.strip():
+            return token.strip()
+
+    return request.cookies.get("session_token")
+
+
+async def get_current_user(request: Request, token: Optional[str] = Depends(get_session_token)) -> UserResponse:
+    """
+    Dependency resolving the authenticated user of a request.
+    Usage with FastAPI:
+        @router.get("/things")
+        async def get_things(user: UserResponse = Depends(get_current_user)):
+            ...
+
+    The user id is also stored on `request.state` for the activity log.
+
+    Raises:
+        HTTPException 401 if the session is missing, expired or revoked
+    """
+    user = await session_store.validate(token)
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    request.state.user_id = user.id
+    return user
+
+
+def client_key(request: Request) -> str:
+    """Identify the client of a request: its session, or its IP address when anonymous"""
+    token = get_session_token(request)
+    if token:
+        return f"session:{hash_token(token)}"
+    return f"ip:{client_ip(request)}"
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only handlers: a session on a read replica when one
+    is configured, healthy and within REPLICA_MAX_LAG_SECONDS, otherwise on
+    the primary. Clients that wrote in the last READ_YOUR_WRITES_SECONDS
+    read from the primary so they see their own writes.
+    Usage with FastAPI:
+        @router.get("/things")
+        async def get_things(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    prefer_primary = replica_router.enabled and (
+        READ_PRIMARY_COOKIE in request.cookies
+        or replica_router.is_sticky(client_key(request))
+    )
+
+    async with db_manager.get_read_session(prefer_primary) as db:
+        try:
+            yield db
+        except (OSError, DBAPIError) as e:
+            # Connection-level failure: take the replica out of rotation
+            # until the monitor sees it healthy again
+            replica = db.info.get("replica")
+            if replica and (isinstance(e, OSError) or e.connection_invalidated):
+                replica_router.mark_failed(replica, e)
+            raise
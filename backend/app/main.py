@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
@@ -16,8 +17,20 @@ sys.path.insert(0, str(project_root))
 # Load .env from project root
 load_dotenv(dotenv_path=project_root / ".env")
 
-from app.database import init_db, engine
-from app.routers import auth, ingredients
+from app.database import QUERY_PROFILING, init_db, db_manager, replica_router
+from app.metrics import loop_lag_monitor, registry
+from app.middleware import (
+    ActivityLogMiddleware, MetricsMiddleware, QueryProfilingMiddleware, ReadYourWritesMiddleware
+)
+from app.routers import auth, dashboard, ingredients, meal_plans, recipes, shopping_lists, telemetry
+from app.services.activity_log import activity_log_buffer
+from app.services.cache import ingredient_cache
+from app.services.email_outbox import email_outbox
+from app.services.maintenance import register_maintenance_jobs
+from app.services.rate_limit import RATE_LIMITERS
+from app.services.scheduler import scheduler
+from app.services.sessions import session_store
+from app.services.telemetry import telemetry_buffer
 
 
 @asynccontextmanager
@@ -29,10 +42,30 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting up SmartKitchen API...")
     print("Database connection established")
+    await loop_lag_monitor.start()
+    # Replica health and lag checks (no-op without DATABASE_REPLICA_URLS)
+    await replica_router.start()
+    try:
+        await session_store.start_listener()
+    except Exception as e:
+        print(f"Session revocation listener not started: {e}")
+    await telemetry_buffer.start()
+    await activity_log_buffer.start()
+    await email_outbox.start()
+    # Partition upkeep, retention and token sweeps (log_partitions runs first)
+    await scheduler.start()
     yield
     # Shutdown
     print("Shutting down SmartKitchen API...")
-    engine.dispose()
+    await scheduler.stop()
+    await email_outbox.stop()
+    await telemetry_buffer.stop()
+    # Requests have finished by now; write out their buffered activity
+    await activity_log_buffer.stop()
+    await session_store.stop_listener()
+    await replica_router.stop()
+    await loop_lag_monitor.stop()
+    await db_manager.dispose()
 
 
 app = FastAPI(
@@ -51,9 +84,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Buffered, asynchronously flushed request activity (activity_logs)
+app.add_middleware(ActivityLogMiddleware)
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware)
+if QUERY_PROFILING:
+    app.add_middleware(QueryProfilingMiddleware)
+# Added last so it is outermost and times the whole request
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(ingredients.router, prefix="/ingredients", tags=["Ingredients"])
+app.include_router(recipes.router, prefix="/recipes", tags=["Recipes"])
+app.include_router(meal_plans.router, prefix="/meal-plans", tags=["Meal Plans"])
+app.include_router(shopping_lists.router, prefix="/shopping-lists", tags=["Shopping Lists"])
+app.include_router(telemetry.router, prefix="/telemetry", tags=["Telemetry"])
+app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+
+register_maintenance_jobs(scheduler)
+
+# Gauges read from the pools and background services at scrape time
+registry.gauges("db_pool", db_manager.pool_status, label="engine")
+registry.gauges("telemetry", telemetry_buffer.stats)
+registry.gauges("activity_log", activity_log_buffer.stats)
+registry.gauges("email_outbox", email_outbox.stats)
+registry.gauges("session_cache", lambda: session_store.cache.stats())
+registry.gauges("ingredient_cache", lambda: {
+    name: stats for name, stats in ingredient_cache.stats().items() if isinstance(stats, dict)
+}, label="cache")
+registry.gauges("rate_limit", lambda: {name: limiter.stats() for name, limiter in RATE_LIMITERS.items()},
+                label="limiter")
+registry.gauges("db_replicas", replica_router.stats)
+registry.gauges("db_replica", replica_router.replica_stats, label="replica")
+registry.gauges("scheduler_job", lambda: scheduler.stats()["jobs"], label="job")
 
 
 @app.get("/")
@@ -69,11 +133,24 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    from app.database import db_manager
+    db_healthy = await db_manager.async_health_check()
 
-    db_healthy = db_manager.health_check()
-
-    return {
+    health = {
         "status": "healthy" if db_healthy else "unhealthy",
         "database": "connected" if db_healthy else "disconnected"
     }
+    if replica_router.enabled:
+        health["replicas"] = replica_router.replica_stats()
+    return health
+
+
+@app.get("/maintenance")
+async def maintenance_stats():
+    """Maintenance scheduler jobs and their last runs in this process"""
+    return scheduler.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this process (text exposition format)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,258 @@
+"""
+Process metrics in the Prometheus text exposition format, served at /metrics.
+
+Kept dependency-free: a handful of counters and histograms updated from
+the request middleware and SQLAlchemy engine events, plus gauges read
+from the pools and background services when the endpoint is scraped.
+Values are per process; with several workers, scrape each of them or
+aggregate by instance.
+"""
+
+import asyncio
+import math
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PREFIX = "smartkitchen"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = f"{PREFIX}_{name}"
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets and optional labels.
+    An observation is a bisect and two additions.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = f"{PREFIX}_{name}"
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self.series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, labels: Labels = ()):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class GaugeCollector:
+    """
+    Gauges read at scrape time from a stats function.
+
+    `stats` returns a (possibly nested) dict of numbers; nested keys are
+    joined into the metric name. With `label`, the top-level keys of the
+    dict become values of that label instead (e.g. one series per job).
+    """
+
+    def __init__(self, name: str, stats: Callable[[], Dict[str, Any]], label: Optional[str] = None):
+        self.name = f"{PREFIX}_{name}"
+        self.stats = stats
+        self.label = label
+
+    @staticmethod
+    def _flatten(stats: Dict[str, Any], prefix: str = "") -> Iterable[Tuple[str, float]]:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                yield from GaugeCollector._flatten(value, f"{prefix}{key}_")
+            elif isinstance(value, (bool, int, float)):
+                yield f"{prefix}{key}", float(value)
+
+    def render(self) -> List[str]:
+        try:
+            stats = self.stats()
+        except Exception:
+            return []
+
+        samples: Dict[str, List[str]] = {}
+        if self.label:
+            for label_value, values in stats.items():
+                labels = _format_labels((self.label,), (label_value,))
+                for key, value in self._flatten(values):
+                    samples.setdefault(key, []).append(f"{self.name}_{key}{labels} {_format_value(value)}")
+        else:
+            for key, value in self._flatten(stats):
+                samples.setdefault(key, []).append(f"{self.name}_{key} {_format_value(value)}")
+
+        lines = []
+        for key, series in samples.items():
+            lines.append(f"# TYPE {self.name}_{key} gauge")
+            lines.extend(series)
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Any] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def gauges(self, name: str, stats: Callable[[], Dict[str, Any]], label: Optional[str] = None):
+        """Expose the numbers returned by `stats` as gauges named <prefix>_<name>_<key>"""
+        return self.register(GaugeCollector(name, stats, label))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+))
+HTTP_REQUEST_DB_STATEMENTS = registry.register(Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request", ("method", "route"),
+    buckets=COUNT_BUCKETS
+))
+HTTP_REQUEST_DB_SECONDS = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per HTTP request", ("method", "route")
+))
+DB_STATEMENT_DURATION = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time", ("engine",)
+))
+DB_STATEMENT_ERRORS = registry.register(Counter(
+    "db_statement_errors_total", "SQL statements that raised an error", ("engine",)
+))
+DB_POOL_WAIT = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", ("engine",)
+))
+
+# [statements, seconds] of the current request, set by the metrics middleware
+request_db_usage: ContextVar[Optional[list]] = ContextVar("request_db_usage", default=None)
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Time every statement executed on a (sync) engine and count it against the current request"""
+    labels = (name,)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        DB_STATEMENT_DURATION.observe(elapsed, labels)
+        usage = request_db_usage.get()
+        if usage is not None:
+            usage[0] += 1
+            usage[1] += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        DB_STATEMENT_ERRORS.inc(labels=labels)
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how late a sleep of `interval` seconds wakes
+    up. Sustained lag means something is blocking the loop (sync I/O or
+    CPU-bound work in a handler).
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.histogram = registry.register(Histogram(
+            "event_loop_lag_seconds", "Event loop wake-up delay",
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+        ))
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.histogram.observe(lag)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"last_lag_seconds": round(self.last_lag, 6), "max_lag_seconds": round(self.max_lag, 6)}
+
+
+# Create a singleton instance
+loop_lag_monitor = LoopLagMonitor()
+registry.gauges("event_loop", loop_lag_monitor.stats)
@@ -0,0 +1,219 @@
+import math
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import ReplicaRouter, replica_router
+from app.dependencies import READ_PRIMARY_COOKIE, client_key, get_session_token
+from app import profiling
+from app.metrics import HTTP_REQUEST_DB_SECONDS, HTTP_REQUEST_DB_STATEMENTS, HTTP_REQUEST_DURATION, request_db_usage
+from app.services.activity_log import ActivityLogBuffer, activity_log_buffer
+from app.services.rate_limit import client_ip
+
+ACTIVITY_LOG_METHODS = os.getenv("ACTIVITY_LOG_METHODS", "POST,PUT,PATCH,DELETE")
+ACTIVITY_LOG_EXCLUDE = os.getenv("ACTIVITY_LOG_EXCLUDE", "/telemetry")
+
+
+class ActivityLogMiddleware:
+    """
+    Record one activity_logs entry per matched request into the activity
+    log buffer, after the response has been sent.
+
+    Only `methods` are recorded (state-changing requests by default), and
+    paths under `exclude` prefixes are skipped. Written as plain ASGI
+    middleware rather than BaseHTTPMiddleware, so responses are passed
+    through untouched and the only cost per request is building the entry.
+
+    The action is the method and route template, e.g.
+    "PUT /recipes/{recipe_id}"; entity_type is the first path segment and
+    entity_id the first UUID path parameter.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        buffer: Optional[ActivityLogBuffer] = None,
+        methods: Iterable[str] = ACTIVITY_LOG_METHODS.split(","),
+        exclude: Iterable[str] = ACTIVITY_LOG_EXCLUDE.split(",")
+    ):
+        self.app = app
+        self.buffer = buffer or activity_log_buffer
+        self.methods = {method.strip().upper() for method in methods if method.strip()}
+        self.exclude = tuple(prefix.strip() for prefix in exclude if prefix.strip())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or (self.exclude and scope["path"].startswith(self.exclude))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        created_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._record(scope, status_code, created_at, time.perf_counter() - started)
+
+    def _record(self, scope: Scope, status_code: int, created_at: datetime, elapsed: float):
+        route = scope.get("route")
+        if route is None:
+            # No route matched (404/405)
+            return
+
+        request = Request(scope)
+        path = getattr(route, "path_format", scope["path"])
+        entity_id = None
+        for value in scope.get("path_params", {}).values():
+            if isinstance(value, uuid.UUID):
+                entity_id = value
+                break
+            try:
+                entity_id = uuid.UUID(str(value))
+                break
+            except ValueError:
+                continue
+
+        user_agent = request.headers.get("User-Agent")
+        ip_address = client_ip(request)
+        self.buffer.record({
+            "user_id": scope.get("state", {}).get("user_id"),
+            "session_token": get_session_token(request),
+            "action": f"{scope['method']} {path}"[:100],
+            "entity_type": path.strip("/").split("/", 1)[0][:100] or None,
+            "entity_id": entity_id,
+            "details": {"status": status_code, "duration_ms": round(elapsed * 1000, 2)},
+            "ip_address": ip_address[:45] if ip_address != "unknown" else None,
+            "user_agent": user_agent[:500] if user_agent else None,
+            "created_at": created_at,
+        })
+
+
+class MetricsMiddleware:
+    """
+    Observe latency, SQL statement count and SQL time of every HTTP request,
+    labelled by route template so that path parameters do not create new
+    series. Requests that match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = [0, 0.0]
+        token = request_db_usage.set(usage)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_db_usage.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path_format", "unmatched") if route else "unmatched")
+            HTTP_REQUEST_DURATION.observe(elapsed, (*labels, str(status_code)))
+            HTTP_REQUEST_DB_STATEMENTS.observe(usage[0], labels)
+            HTTP_REQUEST_DB_SECONDS.observe(usage[1], labels)
+
+
+class QueryProfilingMiddleware:
+    """
+    Profile the SQL of every HTTP request (QUERY_PROFILING=true only).
+
+    Adds X-Query-Count and X-Query-Time-Ms response headers, prints a report
+    for requests with N+1 patterns, slow statements or a blown query budget,
+    and in strict mode raises QueryBudgetExceeded after the response, which
+    makes the request fail under TestClient.
+    """
+
+    def __init__(self, app: ASGIApp, strict: bool = profiling.STRICT):
+        self.app = app
+        self.strict = strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profiling.profile_queries() as profile:
+            async def send_with_headers(message: Message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(profile.count).encode()))
+                    headers.append((b"x-query-time-ms", f"{profile.seconds * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        route = scope.get("route")
+        profile.label = f"{scope['method']} {getattr(route, 'path_format', scope['path'])}"
+        profile.budget = profiling.budget_for(getattr(route, "endpoint", None))
+
+        if profile.has_findings:
+            print(profile.report())
+        if self.strict and profile.over_budget:
+            raise profiling.QueryBudgetExceeded(profile.report())
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for a short while after it writes, so reads
+    routed through get_read_db see the write even if replicas lag behind.
+
+    Successful requests with a state-changing method mark the client (its
+    session, or IP address when anonymous) in the router, and set a short
+    lived cookie so other workers and processes, which do not share the
+    router state, route the client's reads to the primary too.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app: ASGIApp, router: Optional[ReplicaRouter] = None):
+        self.app = app
+        self.router = router or replica_router
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={max(1, math.ceil(self.router.sticky_seconds))}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.router.mark_write(client_key(Request(scope)))
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", self.cookie))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
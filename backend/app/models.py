@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, Date, DateTime, ForeignKey, Text, Enum, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -7,6 +7,9 @@ import enum
 
 Base = declarative_base()
 
+# Trigram operators/indexes used by the ingredient search
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 
 class UserRole(enum.Enum):
     ADMIN = "admin"
@@ -27,6 +30,13 @@ class RecipeDifficulty(enum.Enum):
     HARD = "hard"
 
 
+class EmailStatus(enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -41,27 +51,107 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Username prefix scans (LIKE 'abc%' regardless of collation) for suffix allocation
+        Index("ix_users_username_pattern", "username", postgresql_ops={"username": "text_pattern_ops"}),
+    )
+
     recipes = relationship("Recipe", back_populates="user", cascade="all, delete-orphan")
     meal_plans = relationship("MealPlan", back_populates="user", cascade="all, delete-orphan")
     shopping_lists = relationship("ShoppingList", back_populates="user", cascade="all, delete-orphan")
     appliances = relationship("Appliance", back_populates="user", cascade="all, delete-orphan")
     activity_logs = relationship("ActivityLog", back_populates="user", cascade="all, delete-orphan")
     magic_links = relationship("MagicLink", back_populates="user", cascade="all, delete-orphan")
+    sessions = relationship("UserSession", back_populates="user", cascade="all, delete-orphan")
 
 
 class MagicLink(Base):
+    """
+    One-time login token sent by email. Only the SHA-256 hash of the token
+    is stored.
+    """
     __tablename__ = "magic_links"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token = Column(String(255), unique=True, nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     is_used = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Verification only ever looks up unused tokens; used ones drop out of the index
+        Index("ix_magic_links_unused_token_hash", "token_hash", unique=True, postgresql_where=text("NOT is_used")),
+    )
+
     user = relationship("User", back_populates="magic_links")
 
 
+class UserSession(Base):
+    """
+    Login session created by a verified magic link. Only the SHA-256 hash
+    of the session token is stored.
+    """
+    __tablename__ = "user_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True))
+    ip_address = Column(String(45))
+    user_agent = Column(String(500))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    user = relationship("User", back_populates="sessions")
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email queued by request handlers and delivered in batches by
+    EmailOutboxWorker, so requests never wait on SMTP.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(Enum(EmailStatus), default=EmailStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest next delivery attempt; while SENDING, the end of the worker's lease
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Due-message scan of the workers; delivered and failed messages drop out
+        Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('PENDING', 'SENDING')")
+        ),
+    )
+
+
+class RateLimitBucket(Base):
+    """
+    Shared rate limiter state for multi-worker deployments (see
+    app.services.rate_limit). One row per limited key holding its GCRA
+    theoretical arrival time; the table is UNLOGGED because the state is
+    disposable.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(300), primary_key=True)
+    # Epoch seconds; the key is back to a full burst once this has passed
+    tat = Column(Float, nullable=False, index=True)
+
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+
 class Recipe(Base):
     __tablename__ = "recipes"
 
@@ -79,11 +169,60 @@ class Recipe(Base):
     tags = Column(JSONB, default=[])
     is_public = Column(Boolean, default=False)
     image_url = Column(String(500))
+    # Number of distinct entries in recipe_ingredients, used for pantry coverage
+    ingredient_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_recipes_name_id", "name", "id"),
+        Index("ix_recipes_tags", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+    )
+
     user = relationship("User", back_populates="recipes")
     meal_plan_recipes = relationship("MealPlanRecipe", back_populates="recipe", cascade="all, delete-orphan")
+    ingredient_index = relationship(
+        "RecipeIngredient", back_populates="recipe", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class RecipeIngredient(Base):
+    """
+    Inverted index of Recipe.ingredients: one row per (recipe, normalized
+    ingredient name). Maintained by RecipeService whenever a recipe's
+    ingredients change.
+    """
+    __tablename__ = "recipe_ingredients"
+
+    recipe_id = Column(UUID(as_uuid=True), ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(255), primary_key=True)
+
+    __table_args__ = (
+        # Posting list lookup by ingredient name, answered from the index alone
+        Index("ix_recipe_ingredients_name_recipe_id", "name", "recipe_id"),
+    )
+
+    recipe = relationship("Recipe", back_populates="ingredient_index")
+
+
+class RecipeNutrition(Base):
+    """
+    Materialized nutrition rollup of a recipe, computed from the ingredient
+    catalog by NutritionService. Rows are flagged stale when an ingredient
+    they depend on changes and recomputed lazily or by a refresh pass.
+    """
+    __tablename__ = "recipe_nutrition"
+
+    recipe_id = Column(UUID(as_uuid=True), ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    totals = Column(JSONB, nullable=False, default={})
+    per_serving = Column(JSONB, nullable=False, default={})
+    unmatched = Column(JSONB, nullable=False, default=[])
+    is_stale = Column(Boolean, default=False, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_recipe_nutrition_stale", "recipe_id", postgresql_where=text("is_stale")),
+    )
 
 
 class Ingredient(Base):
@@ -98,6 +237,25 @@ class Ingredient(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Keyset pagination order, optionally narrowed by category
+        Index("ix_ingredients_name_id", "name", "id"),
+        Index("ix_ingredients_category_name_id", "category", "name", "id"),
+        # Case-insensitive prefix search (LIKE 'abc%' regardless of collation)
+        Index(
+            "ix_ingredients_name_lower_prefix",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+        ),
+        # Typo-tolerant search: `name % :q` filtering and `name <-> :q` KNN ordering
+        Index(
+            "ix_ingredients_name_trgm",
+            "name",
+            postgresql_using="gist",
+            postgresql_ops={"name": "gist_trgm_ops"},
+        ),
+    )
+
 
 class Appliance(Base):
     __tablename__ = "appliances"
@@ -146,6 +304,11 @@ class MealPlanRecipe(Base):
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Scheduled recipes of a plan within a date range
+        Index("ix_meal_plan_recipes_plan_date", "meal_plan_id", "scheduled_date"),
+    )
+
     meal_plan = relationship("MealPlan", back_populates="meal_plan_recipes")
     recipe = relationship("Recipe", back_populates="meal_plan_recipes")
 
@@ -158,6 +321,8 @@ class ShoppingList(Base):
     name = Column(String(255), nullable=False)
     items = Column(JSONB, nullable=False, default=[])
     is_completed = Column(Boolean, default=False)
+    # Bumped by every item-level write; sent as the ETag for If-Match checks
+    version = Column(Integer, default=1, server_default="1", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -165,6 +330,11 @@ class ShoppingList(Base):
 
 
 class ActivityLog(Base):
+    """
+    User activity, range-partitioned by month on created_at (see
+    app.services.log_partitions). Rows outside the pre-created monthly
+    partitions land in activity_logs_default.
+    """
     __tablename__ = "activity_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -175,12 +345,22 @@ class ActivityLog(Base):
     details = Column(JSONB, default={})
     ip_address = Column(String(45))
     user_agent = Column(String(500))
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Part of the primary key because it is the partition key
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True, index=True)
+
+    __table_args__ = (
+        Index("ix_activity_logs_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     user = relationship("User", back_populates="activity_logs")
 
 
 class ApplianceUsageLog(Base):
+    """
+    Appliance telemetry, range-partitioned by month on created_at like
+    ActivityLog.
+    """
     __tablename__ = "appliance_usage_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -192,6 +372,95 @@ class ApplianceUsageLog(Base):
     settings_used = Column(JSONB, default={})
     metrics = Column(JSONB, default={})
     error_logs = Column(JSONB, default=[])
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Part of the primary key because it is the partition key
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True, index=True)
+
+    __table_args__ = (
+        Index("ix_appliance_usage_logs_appliance_id_created_at", "appliance_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     appliance = relationship("Appliance", back_populates="usage_logs")
+
+
+class ApplianceEnergyHourly(Base):
+    """
+    Hourly (UTC) rollup of appliance_usage_logs per appliance. Maintained
+    incrementally by a statement-level insert trigger on the log table, and
+    kept after raw log partitions are dropped by retention.
+    """
+    __tablename__ = "appliance_energy_hourly"
+
+    appliance_id = Column(UUID(as_uuid=True), ForeignKey("appliances.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    events = Column(Integer, nullable=False, default=0)
+    duration = Column(BigInteger, nullable=False, default=0)
+    energy_used = Column(Float, nullable=False, default=0)
+
+
+class UserActivityDaily(Base):
+    """
+    Daily (UTC) count of activity_logs actions per user, maintained like
+    ApplianceEnergyHourly.
+    """
+    __tablename__ = "user_activity_daily"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    action = Column(String(100), primary_key=True)
+    events = Column(Integer, nullable=False, default=0)
+
+
+# Default partitions catch rows outside the monthly partitions created by
+# app.services.log_partitions.ensure_partitions.
+for _table in (ActivityLog.__table__, ApplianceUsageLog.__table__):
+    event.listen(_table, "after_create", DDL(
+        "CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT"
+    ))
+
+# Rollups are updated once per INSERT statement from its transition table,
+# so a multi-row insert costs one aggregate upsert. Groups are upserted in
+# key order to keep concurrent writers from deadlocking.
+event.listen(ApplianceUsageLog.__table__, "after_create", DDL("""
+CREATE OR REPLACE FUNCTION rollup_appliance_usage_logs() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO appliance_energy_hourly AS r (appliance_id, bucket, events, duration, energy_used)
+    SELECT appliance_id,
+           date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+           count(*), coalesce(sum(duration), 0), coalesce(sum(energy_used), 0)
+    FROM new_rows
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (appliance_id, bucket) DO UPDATE SET
+        events = r.events + EXCLUDED.events,
+        duration = r.duration + EXCLUDED.duration,
+        energy_used = r.energy_used + EXCLUDED.energy_used;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""))
+event.listen(ApplianceUsageLog.__table__, "after_create", DDL("""
+CREATE TRIGGER appliance_usage_logs_rollup AFTER INSERT ON appliance_usage_logs
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION rollup_appliance_usage_logs()
+"""))
+
+event.listen(ActivityLog.__table__, "after_create", DDL("""
+CREATE OR REPLACE FUNCTION rollup_activity_logs() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_activity_daily AS r (user_id, day, action, events)
+    SELECT user_id, CAST(created_at AT TIME ZONE 'UTC' AS date), action, count(*)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (user_id, day, action) DO UPDATE SET
+        events = r.events + EXCLUDED.events;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""))
+event.listen(ActivityLog.__table__, "after_create", DDL("""
+CREATE TRIGGER activity_logs_rollup AFTER INSERT ON activity_logs
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION rollup_activity_logs()
+"""))
@@ -0,0 +1,77 @@
+import base64
+import json
+from typing import Any, Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: Iterable[Any]) -> str:
+    """
+    Encode the keyset position of the last row of a page into an opaque cursor.
+
+    Args:
+        values: Sort key values of the last returned row (e.g. name, id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string from a previous page
+        size: Expected number of sort key values
+
+    Returns:
+        List of sort key values
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+    return values
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated sparse field selection.
+
+    Args:
+        fields: Value of the `fields` query parameter (e.g. "id,name")
+        allowed: Field names that may be selected
+
+    Returns:
+        Set of selected field names, or None when all fields are requested
+
+    Raises:
+        HTTPException: 400 if an unknown field is requested
+    """
+    if not fields:
+        return None
+
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - set(allowed)
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(sorted(unknown))}"
+        )
+
+    return selected
@@ -0,0 +1,221 @@
+"""
+Opt-in query profiling for development, staging and tests.
+
+Enabled with QUERY_PROFILING=true (see app.database). Every SQL statement
+executed while a profile is active is fingerprinted (literals and bind
+parameters replaced, IN lists collapsed) and attributed to the first
+application frame that caused it. At the end of a request the profile
+reports:
+
+- N+1 patterns: one fingerprint executed QUERY_PROFILING_REPEAT_THRESHOLD
+  or more times, and ORM relationships lazy-loaded that often
+- slow statements over QUERY_PROFILING_SLOW_MS
+- query budget violations (see `query_budget`), which raise
+  QueryBudgetExceeded in strict mode so tests fail
+
+Outside requests, `profile_queries()` profiles any block of code:
+
+    with profile_queries() as profile:
+        await RecipeService.list_recipes(db)
+    assert profile.count <= 2, profile.report()
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+REPEAT_THRESHOLD = int(os.getenv("QUERY_PROFILING_REPEAT_THRESHOLD", "5"))
+SLOW_QUERY_MS = float(os.getenv("QUERY_PROFILING_SLOW_MS", "100"))
+# Budget for endpoints without their own query_budget (unset: no limit)
+DEFAULT_BUDGET = int(os.getenv("QUERY_PROFILING_DEFAULT_BUDGET", "0")) or None
+STRICT = os.getenv("QUERY_PROFILING_STRICT", "false").lower() == "true"
+
+_APP_DIR = str(Path(__file__).resolve().parent)
+# Frames in these files are plumbing, not the code that issued the query
+_SKIP_FILES = tuple(
+    os.path.join(_APP_DIR, name) for name in ("database.py", "profiling.py", "middleware.py", "metrics.py")
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Binds may carry a cast, e.g. $2::UUID or $3::TIMESTAMP WITH TIME ZONE (asyncpg)
+_PARAM = re.compile(
+    r"(?:\$\d+|%\(\w+\)s|%s)"
+    r"(?:::(?:DOUBLE PRECISION|\w+)(?:\(\d+(?:, ?\d+)?\))?(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])*)?"
+)
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request executed more SQL statements than its query budget allows"""
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with literals and parameters replaced by ?"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _LIST.sub("(?...)", shape)
+
+
+def _call_site() -> str:
+    """
+    First application frame on the stack. Under the asyncio extension the
+    statement runs in a greenlet, so the frames of the awaiting coroutines
+    are found through the parent greenlets.
+    """
+    frame = sys._getframe(2)
+    current = getcurrent()
+
+    while True:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(_APP_DIR) and not filename.startswith(_SKIP_FILES):
+                return f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+
+        current = current.parent if current is not None else None
+        if current is None:
+            return "unknown"
+        frame = current.gr_frame
+
+
+class QueryStats:
+    __slots__ = ("statement", "count", "seconds", "call_sites")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.seconds = 0.0
+        self.call_sites: Counter = Counter()
+
+
+class QueryProfile:
+    """Statements executed during one request (or profile_queries block)"""
+
+    def __init__(self, label: str = "", budget: Optional[int] = None):
+        self.label = label
+        self.budget = budget
+        self.count = 0
+        self.seconds = 0.0
+        self.queries: Dict[str, QueryStats] = {}
+        self.relationship_loads: Counter = Counter()
+        self.slow: List[tuple] = []
+
+    def add(self, statement: str, seconds: float, call_site: str):
+        shape = fingerprint(statement)
+        stats = self.queries.get(shape)
+        if stats is None:
+            stats = self.queries[shape] = QueryStats(statement)
+        stats.count += 1
+        stats.seconds += seconds
+        stats.call_sites[call_site] += 1
+        self.count += 1
+        self.seconds += seconds
+
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            self.slow.append((seconds, call_site, statement))
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> List[QueryStats]:
+        """Fingerprints executed at least `threshold` times, most frequent first"""
+        return sorted((q for q in self.queries.values() if q.count >= threshold), key=lambda q: -q.count)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    @property
+    def has_findings(self) -> bool:
+        return bool(self.repeated() or self.slow or self.over_budget or any(
+            count >= REPEAT_THRESHOLD for count in self.relationship_loads.values()
+        ))
+
+    def report(self) -> str:
+        lines = [f"{self.label or 'profile'}: {self.count} statements in {self.seconds * 1000:.1f} ms"]
+
+        if self.over_budget:
+            lines.append(f"  over query budget: {self.count} > {self.budget}")
+        for stats in self.repeated():
+            site, _ = stats.call_sites.most_common(1)[0]
+            lines.append(f"  repeated {stats.count}x ({stats.seconds * 1000:.1f} ms) from {site}:")
+            lines.append(f"    {_WHITESPACE.sub(' ', stats.statement)[:300]}")
+        for relationship, count in self.relationship_loads.most_common():
+            if count >= REPEAT_THRESHOLD:
+                lines.append(f"  lazy-loaded {relationship} {count}x (use selectinload/joinedload)")
+        for seconds, site, statement in self.slow:
+            lines.append(f"  slow {seconds * 1000:.1f} ms from {site}:")
+            lines.append(f"    {_WHITESPACE.sub(' ', statement)[:300]}")
+        return "\n".join(lines)
+
+
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_profile", default=None)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare the SQL statement budget of an endpoint:
+
+        @router.get("/{recipe_id}")
+        @query_budget(3)
+        async def get_recipe(...):
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+
+def budget_for(endpoint: Optional[Callable]) -> Optional[int]:
+    return getattr(endpoint, "__query_budget__", DEFAULT_BUDGET)
+
+
+@contextmanager
+def profile_queries(label: str = "", budget: Optional[int] = None):
+    """Profile the statements executed inside the block (needs QUERY_PROFILING=true)"""
+    profile = QueryProfile(label, budget)
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+def install(*engines: Engine):
+    """Hook statement execution of the given (sync) engines and ORM relationship loads"""
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    started = getattr(context, "_profiling_started", None)
+    if profile is not None and started is not None:
+        profile.add(statement, time.perf_counter() - started, _call_site())
+
+
+def _do_orm_execute(orm_execute_state):
+    profile = current_profile.get()
+    if profile is not None and orm_execute_state.is_relationship_load:
+        path = orm_execute_state.loader_strategy_path
+        profile.relationship_loads[str(path[-1]) if path else "relationship"] += 1
+
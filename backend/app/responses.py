@@ -0,0 +1,56 @@
+"""
+Fast JSON path for large list responses.
+
+By default list endpoints return dicts or Pydantic models, which FastAPI
+validates against the response_model and encodes with the standard json
+module. With FAST_JSON_RESPONSES=true they instead fetch plain column rows,
+build dicts directly and return a response rendered by orjson, skipping
+per-row model construction and response validation.
+
+The output stays compatible with the declared schemas: rows are selected by
+schema field name, and orjson renders UUIDs, enums and datetimes (UTC as
+"Z") the way Pydantic does. Values a schema would coerce are normalized by
+the endpoint (see app.routers.recipes).
+"""
+
+import os
+from typing import Any, Optional, Set
+
+import orjson
+from starlette.responses import Response
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes, with the same value formats as Pydantic's JSON mode"""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    `content` may also be bytes already produced by `dumps`, e.g. a cached
+    page, which are sent as they are.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def row_to_dict(row, selected: Optional[Set[str]] = None) -> dict:
+    """
+    Turn a result row (Row tuple) into a dict keyed by column label,
+    optionally keeping only `selected` keys (sparse fields).
+    """
+    if selected is None:
+        return dict(row._mapping)
+    return {key: value for key, value in row._mapping.items() if key in selected}
+
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db
+from app.dependencies import get_current_user, get_session_token
 from app.schemas.auth import (
     MagicLinkRequest,
     MagicLinkResponse,
@@ -10,39 +12,55 @@ from app.schemas.auth import (
     UserResponse
 )
 from app.services.auth_service import AuthService
-from app.services.email_service import email_service
-from app.models import User
+from app.services.email_outbox import email_outbox
+from app.services.email_service import render_magic_link_email
+from app.services.rate_limit import RATE_LIMITERS, magic_link_per_email, magic_link_per_ip, verify_per_ip
+from app.services.sessions import session_store, user_response
 
 router = APIRouter()
 
 
-@router.post("/magic-link", response_model=MagicLinkResponse, status_code=status.HTTP_200_OK)
+@router.post(
+    "/magic-link",
+    response_model=MagicLinkResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(magic_link_per_ip)]
+)
 async def request_magic_link(
     request: MagicLinkRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Request a magic link for passwordless authentication.
 
+    Requests are rate limited per client IP and per email address (HTTP 429
+    with Retry-After when exceeded).
+
     This endpoint:
     1. Creates a user if they don't exist
     2. Generates a secure magic link token
-    3. Sends the magic link via email (mock for now)
+    3. Queues the magic link email in the outbox (delivered in the background)
 
     Args:
         request: MagicLinkRequest containing email and optional full_name
+        http_request: Incoming request (the user is noted for the activity log)
         db: Database session
 
     Returns:
         MagicLinkResponse with confirmation message
     """
+    await magic_link_per_email.check(request.email.lower())
+
     # Create or get user
-    user = AuthService.create_or_get_user(
+    user = await AuthService.create_or_get_user(
         db=db,
         email=request.email,
         full_name=request.full_name
     )
 
+    http_request.state.user_id = user.id
+
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -50,27 +68,20 @@ async def request_magic_link(
             detail="User account is inactive. Please contact support."
         )
 
-    # Create magic link
-    magic_link = AuthService.create_magic_link(db=db, email=request.email, expiry_minutes=15)
+    # Create magic link; it is committed together with its outbox message
+    created = await AuthService.create_magic_link(db=db, email=request.email, expiry_minutes=15, commit=False)
 
-    if not magic_link:
+    if not created:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate magic link. Please try again."
         )
 
-    # Send magic link via email (mock)
-    email_sent = email_service.send_magic_link(
-        email=request.email,
-        token=magic_link.token,
-        expires_at=magic_link.expires_at
-    )
-
-    if not email_sent:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send magic link email. Please try again."
-        )
+    # Queue the magic link email (this commits the link too); the outbox
+    # workers deliver it
+    token, magic_link = created
+    subject, body = render_magic_link_email(token=token, expires_at=magic_link.expires_at)
+    await email_outbox.enqueue(db=db, recipient=request.email, subject=subject, body=body, kind="magic_link")
 
     return MagicLinkResponse(
         message="Magic link sent successfully! Check your email (or terminal for mock email).",
@@ -79,14 +90,21 @@ async def request_magic_link(
     )
 
 
-@router.post("/verify", response_model=VerifyTokenResponse, status_code=status.HTTP_200_OK)
+@router.post(
+    "/verify",
+    response_model=VerifyTokenResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(verify_per_ip)]
+)
 async def verify_magic_link(
     request: VerifyTokenRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verify a magic link token and authenticate the user.
+    Attempts are rate limited per client IP.
 
     This endpoint:
     1. Validates the magic link token
@@ -98,13 +116,14 @@ async def verify_magic_link(
     Args:
         request: VerifyTokenRequest containing the token
         response: FastAPI Response object for setting cookies
+        http_request: Incoming request (client address and User-Agent)
         db: Database session
 
     Returns:
         VerifyTokenResponse with user data and session token
     """
     # Verify the token
-    user = AuthService.verify_token(db=db, token=request.token)
+    user = await AuthService.verify_token(db=db, token=request.token)
 
     if not user:
         raise HTTPException(
@@ -112,6 +131,8 @@ async def verify_magic_link(
             detail="Invalid or expired token. Please request a new magic link."
         )
 
+    http_request.state.user_id = user.id
+
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -119,49 +140,51 @@ async def verify_magic_link(
             detail="User account is inactive. Please contact support."
         )
 
-    # Generate session token (for now, using the same token generation method)
-    # In production, use JWT or a proper session management system
-    session_token = AuthService.generate_token(length=48)
+    # Create a server-side session; only its hash is stored
+    session_token, _ = await session_store.create(
+        db=db,
+        user=user,
+        ip_address=http_request.client.host if http_request.client else None,
+        user_agent=http_request.headers.get("User-Agent")
+    )
 
     # Set session cookie (httponly for security)
     response.set_cookie(
         key="session_token",
         value=session_token,
         httponly=True,
-        max_age=86400,  # 24 hours
+        max_age=int(session_store.session_ttl.total_seconds()),
         samesite="lax",
         secure=False  # Set to True in production with HTTPS
     )
 
-    # Convert user to response schema
-    user_response = UserResponse(
-        id=user.id,
-        email=user.email,
-        username=user.username,
-        full_name=user.full_name,
-        role=user.role.value,
-        is_active=user.is_active,
-        created_at=user.created_at
-    )
-
     return VerifyTokenResponse(
         message="Authentication successful!",
-        user=user_response,
+        user=user_response(user),
         session_token=session_token
     )
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    session_token: Optional[str] = Depends(get_session_token),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Logout the current user by clearing the session cookie.
+    Logout the current user by revoking the session and clearing the cookie.
 
     Args:
         response: FastAPI Response object for clearing cookies
+        session_token: Session token (from Authorization header or cookie)
+        db: Database session
 
     Returns:
         Confirmation message
     """
+    if session_token:
+        await session_store.revoke(db, session_token)
+
     # Clear session cookie
     response.delete_cookie(key="session_token")
 
@@ -169,29 +192,30 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
-async def get_current_user(
-    session_token: str = None,
-    db: Session = Depends(get_db)
-):
+async def get_me(user: UserResponse = Depends(get_current_user)):
     """
     Get current authenticated user information.
 
-    Note: This is a simplified version. In production, you would:
-    1. Validate the session_token from cookies or Authorization header
-    2. Look up the user associated with that session
-    3. Return the user data
-
-    For now, this is a placeholder endpoint.
-
-    Args:
-        session_token: Session token (from cookie or header)
-        db: Database session
+    The session token is read from the Authorization header (Bearer) or the
+    session_token cookie and validated through the session cache.
 
     Returns:
         UserResponse with current user data
     """
-    # This is a placeholder - implement proper session validation
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Session validation not yet implemented. Use /auth/verify to authenticate."
-    )
+    return user
+
+
+@router.get("/email-outbox/stats")
+async def get_email_outbox_stats():
+    """
+    Get email outbox delivery counters of this process.
+    """
+    return email_outbox.stats()
+
+
+@router.get("/rate-limits/stats")
+async def get_rate_limit_stats():
+    """
+    Get allowed/limited counters of the auth rate limiters in this process.
+    """
+    return {name: limiter.stats() for name, limiter in RATE_LIMITERS.items()}
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+import uuid
+
+from app.dependencies import get_read_db
+from app.schemas.dashboard import ActivityCount, ApplianceEnergyResponse
+from app.services.usage_rollups import GRANULARITIES, UsageRollupService
+
+router = APIRouter()
+
+
+@router.get("/appliances/{appliance_id}/energy", response_model=ApplianceEnergyResponse)
+async def get_appliance_energy(
+    appliance_id: uuid.UUID,
+    start: Optional[datetime] = Query(None, description="Range start (default: 7 days ago)"),
+    end: Optional[datetime] = Query(None, description="Range end, exclusive (default: now)"),
+    granularity: str = Query("hour", description="hour or day"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the energy use of an appliance per hour or day (UTC), read from the
+    hourly rollup instead of the raw usage logs.
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"granularity must be one of: {', '.join(GRANULARITIES)}"
+        )
+
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=7)
+
+    points = await UsageRollupService.appliance_energy(db, appliance_id, start, end, granularity)
+    return ApplianceEnergyResponse(granularity=granularity, points=points)
+
+
+@router.get("/users/{user_id}/activity", response_model=List[ActivityCount])
+async def get_user_activity(
+    user_id: uuid.UUID,
+    start: Optional[date] = Query(None, description="First day (default: 30 days ago)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    action: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get daily action counts of a user (UTC), read from the daily rollup.
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=30)
+
+    return await UsageRollupService.user_activity(db, user_id, start, end, action)
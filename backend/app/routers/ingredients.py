@@ -1,33 +1,285 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, List, Optional, Set
+import hashlib
+import json
+import time
+import uuid
 
-from app.database import get_db
+from app.database import REPLICA_MAX_LAG_SECONDS, db_manager, get_async_db
+from app.dependencies import get_read_db
 from app.models import Ingredient
+from app.pagination import decode_cursor, encode_cursor, parse_fields
+from app.responses import FAST_JSON_RESPONSES, FastJSONResponse, dumps, row_to_dict
 from app.schemas.ingredients import (
     IngredientCreate,
     IngredientUpdate,
-    IngredientResponse
+    IngredientResponse,
+    IngredientPage,
+    IngredientImportResult,
+    IngredientSearchResult
 )
+from app.services.cache import ingredient_cache
+from app.services.ingredient_import import (
+    DEFAULT_BATCH_SIZE,
+    SUPPORTED_FORMATS,
+    import_ingredients,
+    iter_lines
+)
+from app.services.ingredient_search import search_ingredients
+from app.services.nutrition_service import NutritionService
 
 router = APIRouter()
 
+# Fields that can be requested through the `fields` query parameter
+INGREDIENT_FIELDS = list(IngredientResponse.model_fields)
+
+
+def _listing_query(
+    selected: Optional[Set[str]],
+    category: Optional[str] = None,
+    unit: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Build the keyset-ordered ingredient listing query.
+
+    Only the selected columns are fetched (plus name and id, which form the
+    keyset), so rows come back as lightweight tuples instead of ORM objects.
+    """
+    keys = set(INGREDIENT_FIELDS if selected is None else selected) | {"name", "id"}
+    stmt = select(*(getattr(Ingredient, field) for field in INGREDIENT_FIELDS if field in keys))
+
+    if category is not None:
+        stmt = stmt.where(Ingredient.category == category)
+
+    if unit is not None:
+        stmt = stmt.where(Ingredient.unit == unit)
+
+    if cursor is not None:
+        name, ingredient_id = decode_cursor(cursor, 2)
+        try:
+            ingredient_id = uuid.UUID(ingredient_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        stmt = stmt.where(tuple_(Ingredient.name, Ingredient.id) > tuple_(name, ingredient_id))
+
+    return stmt.order_by(Ingredient.name, Ingredient.id)
+
+
+def _json_default(value: Any) -> str:
+    """JSON encoder fallback for the NDJSON export"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _compute_etag(payload: dict) -> str:
+    """Strong ETag derived from the serialized response body"""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return _body_etag(body.encode())
+
+
+def _body_etag(body: bytes) -> str:
+    """Strong ETag of a response body that is already serialized"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak tags) against etag"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cache_generation(db: AsyncSession) -> int:
+    """
+    Generation to cache a read under. A replica may not have replayed a
+    write made in the last REPLICA_MAX_LAG_SECONDS yet, so reads from a
+    replica in that window are not cached (-1 never matches).
+    """
+    if db.info.get("replica") and time.monotonic() - ingredient_cache.last_write_at < REPLICA_MAX_LAG_SECONDS:
+        return -1
+    return ingredient_cache.generation
+
+
+def _serialize_ingredient(ingredient: Ingredient) -> dict:
+    return IngredientResponse.model_validate(ingredient).model_dump(mode="json")
+
+
+@router.get("", response_model=IngredientPage)
+async def get_ingredients(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    unit: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a page of ingredients ordered by name.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    `fields` takes a comma-separated list of fields to include in each item.
+    Responses carry an ETag; sending it back in If-None-Match yields a 304
+    when the page has not changed. With FAST_JSON_RESPONSES the page is
+    rendered by orjson straight from the rows (see app.responses).
+    """
+    selected = parse_fields(fields, INGREDIENT_FIELDS)
+    cache_key = (limit, cursor, category, unit, frozenset(selected) if selected else None)
+    cached = ingredient_cache.get_page(cache_key)
+
+    if cached is None:
+        generation = _cache_generation(db)
+        stmt = _listing_query(selected, category, unit, cursor).limit(limit + 1)
+        rows = (await db.execute(stmt)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor((rows[-1].name, rows[-1].id))
+
+        if FAST_JSON_RESPONSES:
+            # Rendered once; the cache keeps the body bytes
+            page = dumps({"items": [row_to_dict(row, selected) for row in rows], "next_cursor": next_cursor})
+            etag = _body_etag(page)
+        else:
+            page = IngredientPage(
+                items=[row_to_dict(row, selected) for row in rows],
+                next_cursor=next_cursor
+            ).model_dump(mode="json")
+            etag = _compute_etag(page)
+        ingredient_cache.put_page(cache_key, page, etag, generation)
+    else:
+        page, etag = cached
 
-@router.get("", response_model=List[IngredientResponse])
-async def get_ingredients(db: Session = Depends(get_db)):
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(page, headers=headers)
+
+    response.headers.update(headers)
+    return page
+
+
+@router.get("/search", response_model=List[IngredientSearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
-    Get all ingredients.
+    Autocomplete ingredient names with typo tolerance.
+
+    Prefix matches come first, followed by trigram-similar names
+    (e.g. "tomatoe" finds "tomato").
+    """
+    return await search_ingredients(db=db, query=q.strip() or q, limit=limit)
+
+
+@router.get("/export")
+async def export_ingredients(
+    category: Optional[str] = None,
+    unit: Optional[str] = None,
+    fields: Optional[str] = None,
+    batch_size: int = Query(1000, ge=1, le=10000)
+):
     """
-    ingredients = db.query(Ingredient).order_by(Ingredient.name).all()
-    return ingredients
+    Stream the ingredient catalog as NDJSON (one ingredient per line).
+
+    Rows are pulled from a server-side cursor in batches of `batch_size`,
+    so memory use stays constant regardless of catalog size.
+    """
+    selected = parse_fields(fields, INGREDIENT_FIELDS)
+    stmt = _listing_query(selected, category, unit).execution_options(yield_per=batch_size)
+
+    async def generate():
+        # The request-scoped session is closed before a streaming body is
+        # sent, so the export owns its session for the whole stream.
+        async with db_manager.get_read_session() as db:
+            result = await db.stream(stmt)
+            async for batch in result.partitions():
+                yield "".join(
+                    json.dumps(row_to_dict(row, selected), default=_json_default) + "\n"
+                    for row in batch
+                )
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.post("/import", response_model=IngredientImportResult)
+async def bulk_import_ingredients(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk create or update ingredients from a CSV or NDJSON request body.
+
+    The body is consumed as a stream and upserted by name in batches, so
+    existing ingredients with the same name are updated in place. Invalid
+    rows are skipped and reported by line number.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        format = {
+            "text/csv": "csv",
+            "application/x-ndjson": "ndjson",
+            "application/jsonl": "ndjson",
+        }.get(content_type)
+
+    if format not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass format=csv|ndjson"
+        )
+
+    return await import_ingredients(
+        db=db,
+        lines=iter_lines(request.stream()),
+        fmt=format,
+        batch_size=batch_size
+    )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Get hit/miss/eviction counters of the in-process ingredient cache.
+    """
+    return ingredient_cache.stats()
 
 
 @router.get("/{ingredient_id}", response_model=IngredientResponse)
-async def get_ingredient(ingredient_id: str, db: Session = Depends(get_db)):
+async def get_ingredient(ingredient_id: str, db: AsyncSession = Depends(get_read_db)):
     """
     Get a specific ingredient by ID.
     """
-    ingredient = db.query(Ingredient).filter(Ingredient.id == ingredient_id).first()
+    try:
+        # Canonical form, so that the cache key matches what writes invalidate
+        ingredient_id = str(uuid.UUID(ingredient_id))
+    except ValueError:
+        pass
+
+    cached = ingredient_cache.get(ingredient_id)
+    if cached is not None:
+        return cached
+
+    generation = _cache_generation(db)
+    result = await db.execute(select(Ingredient).where(Ingredient.id == ingredient_id))
+    ingredient = result.scalars().first()
 
     if not ingredient:
         raise HTTPException(
@@ -35,21 +287,24 @@ async def get_ingredient(ingredient_id: str, db: Session = Depends(get_db)):
             detail="Ingredient not found"
         )
 
-    return ingredient
+    data = _serialize_ingredient(ingredient)
+    ingredient_cache.put(data, generation)
+    return data
 
 
 @router.post("", response_model=IngredientResponse, status_code=status.HTTP_201_CREATED)
 async def create_ingredient(
     ingredient_data: IngredientCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new ingredient.
     """
     # Check if ingredient with same name already exists
-    existing = db.query(Ingredient).filter(
-        Ingredient.name == ingredient_data.name
-    ).first()
+    result = await db.execute(
+        select(Ingredient).where(Ingredient.name == ingredient_data.name)
+    )
+    existing = result.scalars().first()
 
     if existing:
         raise HTTPException(
@@ -67,8 +322,11 @@ async def create_ingredient(
     )
 
     db.add(ingredient)
-    db.commit()
-    db.refresh(ingredient)
+    # Recipes that already reference this name can now be resolved
+    await NutritionService.mark_stale_for_ingredients(db, [ingredient.name])
+    await db.commit()
+    await db.refresh(ingredient)
+    ingredient_cache.invalidate(ingredient.id)
 
     return ingredient
 
@@ -77,12 +335,13 @@ async def create_ingredient(
 async def update_ingredient(
     ingredient_id: str,
     ingredient_data: IngredientUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing ingredient.
     """
-    ingredient = db.query(Ingredient).filter(Ingredient.id == ingredient_id).first()
+    result = await db.execute(select(Ingredient).where(Ingredient.id == ingredient_id))
+    ingredient = result.scalars().first()
 
     if not ingredient:
         raise HTTPException(
@@ -90,13 +349,18 @@ async def update_ingredient(
             detail="Ingredient not found"
         )
 
+    old_name = ingredient.name
+
     # Update fields if provided
     if ingredient_data.name is not None:
         # Check if new name conflicts with existing ingredient
-        existing = db.query(Ingredient).filter(
-            Ingredient.name == ingredient_data.name,
-            Ingredient.id != ingredient_id
-        ).first()
+        result = await db.execute(
+            select(Ingredient).where(
+                Ingredient.name == ingredient_data.name,
+                Ingredient.id != ingredient_id
+            )
+        )
+        existing = result.scalars().first()
 
         if existing:
             raise HTTPException(
@@ -118,18 +382,27 @@ async def update_ingredient(
     if ingredient_data.additional_data is not None:
         ingredient.additional_data = ingredient_data.additional_data
 
-    db.commit()
-    db.refresh(ingredient)
+    # Only values that feed recipe nutrition rollups make them stale
+    if any(
+        getattr(ingredient_data, field) is not None
+        for field in ("name", "unit", "calories_per_unit", "additional_data")
+    ):
+        await NutritionService.mark_stale_for_ingredients(db, [old_name, ingredient.name])
+
+    await db.commit()
+    await db.refresh(ingredient)
+    ingredient_cache.invalidate(ingredient.id)
 
     return ingredient
 
 
 @router.delete("/{ingredient_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_ingredient(ingredient_id: str, db: Session = Depends(get_db)):
+async def delete_ingredient(ingredient_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Delete an ingredient.
     """
-    ingredient = db.query(Ingredient).filter(Ingredient.id == ingredient_id).first()
+    result = await db.execute(select(Ingredient).where(Ingredient.id == ingredient_id))
+    ingredient = result.scalars().first()
 
     if not ingredient:
         raise HTTPException(
@@ -137,7 +410,9 @@ async def delete_ingredient(ingredient_id: str, db: Session = Depends(get_db)):
             detail="Ingredient not found"
         )
 
-    db.delete(ingredient)
-    db.commit()
+    await db.delete(ingredient)
+    await NutritionService.mark_stale_for_ingredients(db, [ingredient.name])
+    await db.commit()
+    ingredient_cache.invalidate(ingredient.id)
 
     return None
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+
+from app.database import get_async_db
+from app.schemas.meal_plans import ShoppingListGenerateRequest
+from app.schemas.shopping_lists import ShoppingListResponse
+from app.services.shopping_list_service import ShoppingListService
+
+router = APIRouter()
+
+
+@router.post(
+    "/{meal_plan_id}/shopping-list",
+    response_model=ShoppingListResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def generate_shopping_list(
+    meal_plan_id: uuid.UUID,
+    request: ShoppingListGenerateRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Generate a consolidated shopping list for a date range of a meal plan.
+
+    Quantities of the same ingredient across all scheduled recipes are
+    merged (converting between compatible units) and the list is saved.
+    """
+    if request.start_date and request.end_date and request.start_date > request.end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
+
+    shopping_list = await ShoppingListService.generate_for_meal_plan(
+        db=db,
+        meal_plan_id=meal_plan_id,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        name=request.name
+    )
+
+    if not shopping_list:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meal plan not found"
+        )
+
+    return shopping_list
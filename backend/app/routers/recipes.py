@@ -0,0 +1,244 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import uuid
+
+from app.database import get_async_db
+from app.dependencies import get_read_db
+from app.models import Recipe, User
+from app.pagination import decode_cursor, encode_cursor
+from app.profiling import query_budget
+from app.responses import FAST_JSON_RESPONSES, FastJSONResponse, row_to_dict
+from app.schemas.recipes import (
+    RecipeCreate,
+    RecipeUpdate,
+    RecipeIngredientItem,
+    RecipeResponse,
+    RecipePage,
+    CookableRequest,
+    CookableRecipe,
+    RecipeNutritionResponse
+)
+from app.services.nutrition_service import NutritionService
+from app.services.recipe_service import RecipeService
+
+router = APIRouter()
+
+
+# Columns of a RecipeResponse, for listings that skip ORM objects (FAST_JSON_RESPONSES)
+RECIPE_COLUMNS = [getattr(Recipe, field) for field in RecipeResponse.model_fields]
+_INGREDIENT_ITEM_FIELDS = set(RecipeIngredientItem.model_fields)
+
+
+def _ingredient_item(item: dict) -> dict:
+    """A Recipe.ingredients entry as RecipeIngredientItem would serialize it"""
+    amount = item.get("amount")
+    data = {"name": item["name"], "amount": None if amount is None else float(amount), "unit": item.get("unit")}
+    data.update((key, value) for key, value in item.items() if key not in _INGREDIENT_ITEM_FIELDS)
+    return data
+
+
+async def _get_recipe_or_404(db: AsyncSession, recipe_id: uuid.UUID) -> Recipe:
+    result = await db.execute(select(Recipe).where(Recipe.id == recipe_id))
+    recipe = result.scalars().first()
+
+    if not recipe:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+
+    return recipe
+
+
+@router.get("", response_model=RecipePage)
+@query_budget(1)
+async def get_recipes(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    user_id: Optional[uuid.UUID] = None,
+    is_public: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a page of recipes ordered by name.
+
+    `tag` filters with JSONB containment on the GIN-indexed tags column.
+    With FAST_JSON_RESPONSES the page is built from column rows and
+    rendered by orjson, without RecipeResponse objects.
+    """
+    stmt = select(*RECIPE_COLUMNS) if FAST_JSON_RESPONSES else select(Recipe)
+
+    if tag is not None:
+        stmt = stmt.where(Recipe.tags.contains([tag]))
+
+    if user_id is not None:
+        stmt = stmt.where(Recipe.user_id == user_id)
+
+    if is_public is not None:
+        stmt = stmt.where(Recipe.is_public == is_public)
+
+    if cursor is not None:
+        name, recipe_id = decode_cursor(cursor, 2)
+        try:
+            recipe_id = uuid.UUID(recipe_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        stmt = stmt.where(tuple_(Recipe.name, Recipe.id) > tuple_(name, recipe_id))
+
+    stmt = stmt.order_by(Recipe.name, Recipe.id).limit(limit + 1)
+    result = await db.execute(stmt)
+    recipes = result.all() if FAST_JSON_RESPONSES else result.scalars().all()
+
+    next_cursor = None
+    if len(recipes) > limit:
+        recipes = recipes[:limit]
+        next_cursor = encode_cursor((recipes[-1].name, recipes[-1].id))
+
+    if FAST_JSON_RESPONSES:
+        items = [row_to_dict(recipe) for recipe in recipes]
+        for item in items:
+            item["ingredients"] = [_ingredient_item(entry) for entry in item["ingredients"]]
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+    return RecipePage(
+        items=[RecipeResponse.model_validate(recipe) for recipe in recipes],
+        next_cursor=next_cursor
+    )
+
+
+@router.post("/cookable", response_model=List[CookableRecipe])
+async def find_cookable_recipes(
+    request: CookableRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Find recipes that can be made from a pantry, ranked by ingredient coverage.
+
+    Coverage is the fraction of a recipe's ingredients present in the pantry;
+    each result lists the ingredients still missing.
+    """
+    return await RecipeService.find_cookable(
+        db=db,
+        pantry=request.pantry,
+        min_coverage=request.min_coverage,
+        limit=request.limit,
+        user_id=request.user_id
+    )
+
+
+@router.get("/{recipe_id}", response_model=RecipeResponse)
+@query_budget(1)
+async def get_recipe(recipe_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get a specific recipe by ID.
+    """
+    return await _get_recipe_or_404(db, recipe_id)
+
+
+@router.get("/{recipe_id}/nutrition", response_model=RecipeNutritionResponse)
+async def get_recipe_nutrition(recipe_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the nutrition rollup (totals and per serving) of a recipe.
+
+    Served from the materialized rollup; it is only recomputed when missing
+    or flagged stale by an ingredient catalog change.
+    """
+    nutrition = await NutritionService.get_or_compute(db, recipe_id)
+
+    if not nutrition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+
+    return nutrition
+
+
+@router.post("", response_model=RecipeResponse, status_code=status.HTTP_201_CREATED)
+async def create_recipe(
+    recipe_data: RecipeCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new recipe.
+    """
+    result = await db.execute(select(User.id).where(User.id == recipe_data.user_id))
+    if not result.first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    recipe = Recipe(
+        user_id=recipe_data.user_id,
+        name=recipe_data.name,
+        description=recipe_data.description,
+        difficulty=recipe_data.difficulty,
+        prep_time=recipe_data.prep_time,
+        cook_time=recipe_data.cook_time,
+        servings=recipe_data.servings,
+        ingredients=[item.model_dump(exclude_none=True) for item in recipe_data.ingredients],
+        instructions=recipe_data.instructions,
+        nutrition_info=recipe_data.nutrition_info or {},
+        tags=recipe_data.tags or [],
+        is_public=recipe_data.is_public,
+        image_url=recipe_data.image_url
+    )
+
+    db.add(recipe)
+    await db.flush()
+    await RecipeService.sync_ingredient_index(db, recipe)
+    await db.flush()
+    await NutritionService.recompute(db, [recipe.id])
+    await db.commit()
+    await db.refresh(recipe)
+
+    return recipe
+
+
+@router.put("/{recipe_id}", response_model=RecipeResponse)
+async def update_recipe(
+    recipe_id: uuid.UUID,
+    recipe_data: RecipeUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update an existing recipe.
+    """
+    recipe = await _get_recipe_or_404(db, recipe_id)
+
+    # Update fields if provided
+    for field, value in recipe_data.model_dump(exclude_none=True).items():
+        setattr(recipe, field, value)
+
+    if recipe_data.ingredients is not None:
+        recipe.ingredients = [item.model_dump(exclude_none=True) for item in recipe_data.ingredients]
+        await RecipeService.sync_ingredient_index(db, recipe)
+
+    if recipe_data.ingredients is not None or recipe_data.servings is not None:
+        await db.flush()
+        await NutritionService.recompute(db, [recipe.id])
+
+    await db.commit()
+    await db.refresh(recipe)
+
+    return recipe
+
+
+@router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recipe(recipe_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Delete a recipe.
+    """
+    recipe = await _get_recipe_or_404(db, recipe_id)
+
+    await db.delete(recipe)
+    await db.commit()
+
+    return None
@@ -0,0 +1,158 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import uuid
+
+from app.database import get_async_db
+from app.dependencies import get_read_db
+from app.models import ShoppingList
+from app.schemas.shopping_lists import (
+    ShoppingListItem,
+    ShoppingListItemCreate,
+    ShoppingListItemUpdate,
+    ShoppingListResponse
+)
+from app.services.shopping_list_service import ItemWriteStatus, ShoppingListService
+
+router = APIRouter()
+
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+    """List version required by an If-Match header (None for absent or *)"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be the ETag of the shopping list"
+        )
+
+
+def _check_write(write_status: ItemWriteStatus, version: Optional[int], item: Optional[dict]):
+    """Raise the HTTP error matching a rejected item write"""
+    if write_status == ItemWriteStatus.LIST_NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shopping list not found")
+    if write_status == ItemWriteStatus.ITEM_NOT_FOUND:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    if write_status == ItemWriteStatus.PRECONDITION_FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Shopping list was modified (current version {version})",
+            headers={"ETag": _etag(version)}
+        )
+    if write_status == ItemWriteStatus.CONFLICT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Item was modified concurrently (current version {item.get('version', 0)})",
+            headers={"ETag": _etag(version)}
+        )
+
+
+@router.get("/{list_id}", response_model=ShoppingListResponse)
+async def get_shopping_list(list_id: uuid.UUID, response: Response, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get a shopping list. The ETag is the list version, for If-Match on
+    item writes.
+    """
+    shopping_list = await db.get(ShoppingList, list_id)
+    if not shopping_list:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Shopping list not found"
+        )
+
+    response.headers["ETag"] = _etag(shopping_list.version)
+    return shopping_list
+
+
+@router.post("/{list_id}/items", response_model=ShoppingListItem, status_code=status.HTTP_201_CREATED)
+async def add_shopping_list_item(
+    list_id: uuid.UUID,
+    item_data: ShoppingListItemCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Append an item to a shopping list without rewriting the other items.
+    """
+    write_status, version, item = await ShoppingListService.add_item(
+        db=db,
+        list_id=list_id,
+        item=item_data.model_dump(),
+        list_version=_expected_version(if_match)
+    )
+    _check_write(write_status, version, item)
+
+    response.headers["ETag"] = _etag(version)
+    return item
+
+
+@router.patch("/{list_id}/items/{item_id}", response_model=ShoppingListItem)
+async def update_shopping_list_item(
+    list_id: uuid.UUID,
+    item_id: str,
+    item_data: ShoppingListItemUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update one item of a shopping list in place.
+
+    Edits of different items by concurrent clients all apply. Pass the
+    item's `version` to reject the update (409) if someone else changed
+    that item first, or the list ETag in If-Match to require an unchanged
+    list (412).
+    """
+    changes = item_data.model_dump(exclude_none=True, exclude={"version"})
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+
+    write_status, version, item = await ShoppingListService.update_item(
+        db=db,
+        list_id=list_id,
+        item_id=item_id,
+        changes=changes,
+        list_version=_expected_version(if_match),
+        item_version=item_data.version
+    )
+    _check_write(write_status, version, item)
+
+    response.headers["ETag"] = _etag(version)
+    return item
+
+
+@router.delete("/{list_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_shopping_list_item(
+    list_id: uuid.UUID,
+    item_id: str,
+    version: Optional[int] = Query(None, description="Only delete if the item is at this version"),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Remove one item from a shopping list in place.
+    """
+    write_status, list_version, item = await ShoppingListService.remove_item(
+        db=db,
+        list_id=list_id,
+        item_id=item_id,
+        list_version=_expected_version(if_match),
+        item_version=version
+    )
+    _check_write(write_status, list_version, item)
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={"ETag": _etag(list_version)})
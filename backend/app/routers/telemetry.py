@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from app.schemas.telemetry import TelemetryAccepted, TelemetryBatch, TelemetryEvent
+from app.services.telemetry import telemetry_buffer
+
+router = APIRouter()
+
+
+@router.post("/events", response_model=TelemetryAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_events(batch: TelemetryBatch):
+    """
+    Accept a batch of appliance usage events for asynchronous storage.
+
+    Events are buffered in memory and written in multi-row batches. When the
+    buffer is full the whole batch is refused with 503 and Retry-After, and
+    the device should resend it later.
+    """
+    if not telemetry_buffer.offer(batch.events):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Telemetry buffer is full, retry later",
+            headers={"Retry-After": "1"}
+        )
+
+    return TelemetryAccepted(accepted=len(batch.events))
+
+
+@router.websocket("/ws")
+async def ingest_stream(websocket: WebSocket):
+    """
+    Stream appliance usage events over a WebSocket.
+
+    Each message is one event or a JSON array of events and is acknowledged
+    with {"accepted": n}. While the buffer is full the server stops reading,
+    which throttles the sender.
+    """
+    await websocket.accept()
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            try:
+                events = [
+                    TelemetryEvent.model_validate(item)
+                    for item in (message if isinstance(message, list) else [message])
+                ]
+            except ValidationError as e:
+                await websocket.send_json({"error": e.errors(include_url=False)})
+                continue
+
+            accepted = 0
+            for event in events:
+                if not await telemetry_buffer.put(event):
+                    break
+                accepted += 1
+
+            await websocket.send_json({"accepted": accepted})
+            if accepted < len(events):
+                await websocket.close(code=1013)  # Try again later
+                return
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/stats")
+async def get_telemetry_stats():
+    """
+    Get buffer depth and accepted/rejected/written counters.
+    """
+    return telemetry_buffer.stats()
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date, datetime
+
+
+class EnergyUsagePoint(BaseModel):
+    """Energy use of an appliance in one hour or day"""
+    period: datetime
+    events: int
+    duration: int
+    energy_used: float
+
+
+class ApplianceEnergyResponse(BaseModel):
+    """Response schema for an appliance energy series"""
+    granularity: str
+    points: List[EnergyUsagePoint]
+
+
+class ActivityCount(BaseModel):
+    """Number of times a user performed an action on one day"""
+    day: date
+    action: str
+    events: int
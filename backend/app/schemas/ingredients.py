@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -31,3 +31,35 @@ class IngredientResponse(IngredientBase):
 
     class Config:
         from_attributes = True
+
+
+class IngredientPage(BaseModel):
+    """One page of a keyset-paginated ingredient listing"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class IngredientImportError(BaseModel):
+    """A row rejected by a bulk import"""
+    line: int
+    error: str
+
+
+class IngredientImportResult(BaseModel):
+    """Summary of a bulk ingredient import"""
+    total_rows: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[IngredientImportError]
+    errors_truncated: bool = False
+
+
+class IngredientSearchResult(BaseModel):
+    """A ranked ingredient search hit"""
+    id: uuid.UUID
+    name: str
+    category: Optional[str] = None
+    unit: Optional[str] = None
+    match: str
+    score: float
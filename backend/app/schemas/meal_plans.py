@@ -0,0 +1,20 @@
+from pydantic import BaseModel, field_validator
+from typing import Optional
+from datetime import datetime, timezone
+
+
+class ShoppingListGenerateRequest(BaseModel):
+    """Request schema for generating a shopping list from a meal plan"""
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    name: Optional[str] = None
+
+    @field_validator("start_date", "end_date")
+    @classmethod
+    def to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Read dates without an offset as UTC, so they compare with aware ones"""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
@@ -0,0 +1,96 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from app.models import RecipeDifficulty
+
+
+class RecipeIngredientItem(BaseModel):
+    """One entry of Recipe.ingredients"""
+    name: str
+    amount: Optional[float] = None
+    unit: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+
+class RecipeBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    difficulty: Optional[RecipeDifficulty] = RecipeDifficulty.MEDIUM
+    prep_time: Optional[int] = None
+    cook_time: Optional[int] = None
+    servings: Optional[int] = 1
+    ingredients: List[RecipeIngredientItem] = []
+    instructions: List[dict] = []
+    nutrition_info: Optional[dict] = {}
+    tags: Optional[List[str]] = []
+    is_public: Optional[bool] = False
+    image_url: Optional[str] = None
+
+
+class RecipeCreate(RecipeBase):
+    user_id: uuid.UUID
+
+
+class RecipeUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    difficulty: Optional[RecipeDifficulty] = None
+    prep_time: Optional[int] = None
+    cook_time: Optional[int] = None
+    servings: Optional[int] = None
+    ingredients: Optional[List[RecipeIngredientItem]] = None
+    instructions: Optional[List[dict]] = None
+    nutrition_info: Optional[dict] = None
+    tags: Optional[List[str]] = None
+    is_public: Optional[bool] = None
+    image_url: Optional[str] = None
+
+
+class RecipeResponse(RecipeBase):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RecipePage(BaseModel):
+    """One page of a keyset-paginated recipe listing"""
+    items: List[RecipeResponse]
+    next_cursor: Optional[str] = None
+
+
+class CookableRequest(BaseModel):
+    """Request schema for pantry-based recipe matching"""
+    pantry: List[str] = Field(..., min_length=1, max_length=500)
+    min_coverage: float = Field(0.5, ge=0.0, le=1.0)
+    limit: int = Field(20, ge=1, le=100)
+    user_id: Optional[uuid.UUID] = None
+
+
+class CookableRecipe(BaseModel):
+    """A recipe ranked by how much of it the pantry covers"""
+    id: uuid.UUID
+    name: str
+    matched: int
+    total: int
+    coverage: float
+    missing: List[str]
+
+
+class RecipeNutritionResponse(BaseModel):
+    """Materialized nutrition rollup of a recipe"""
+    recipe_id: uuid.UUID
+    totals: dict
+    per_serving: dict
+    unmatched: List[str]
+    computed_at: datetime
+
+    class Config:
+        from_attributes = True
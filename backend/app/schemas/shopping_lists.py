@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+
+class ShoppingListItem(BaseModel):
+    """One entry of ShoppingList.items"""
+    id: str
+    name: str
+    amount: Optional[float] = None
+    unit: Optional[str] = None
+    checked: bool = False
+    # Bumped by every update of the item (absent on generated items: 0)
+    version: int = 0
+
+    class Config:
+        extra = "allow"
+
+
+class ShoppingListItemCreate(BaseModel):
+    """Request schema for adding an item to a shopping list"""
+    name: str = Field(..., min_length=1, max_length=255)
+    amount: Optional[float] = None
+    unit: Optional[str] = Field(None, max_length=50)
+    checked: bool = False
+
+
+class ShoppingListItemUpdate(BaseModel):
+    """
+    Request schema for updating one item; omitted fields are kept.
+    `version` is the item version the client last saw: the update is
+    rejected with 409 if the item changed since.
+    """
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    amount: Optional[float] = None
+    unit: Optional[str] = Field(None, max_length=50)
+    checked: Optional[bool] = None
+    version: Optional[int] = None
+
+
+class ShoppingListResponse(BaseModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    name: str
+    items: List[ShoppingListItem]
+    is_completed: bool
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+
+class TelemetryEvent(BaseModel):
+    """One appliance usage event reported by a device"""
+    appliance_id: uuid.UUID
+    action: str = Field(..., max_length=100)
+    duration: Optional[int] = None
+    energy_used: Optional[float] = None
+    temperature: Optional[float] = None
+    settings_used: Optional[dict] = None
+    metrics: Optional[dict] = None
+    error_logs: Optional[list] = None
+    timestamp: Optional[datetime] = None
+
+
+class TelemetryBatch(BaseModel):
+    """Request schema for batched telemetry ingestion"""
+    events: List[TelemetryEvent] = Field(..., min_length=1, max_length=5000)
+
+
+class TelemetryAccepted(BaseModel):
+    """Response schema for accepted telemetry"""
+    accepted: int
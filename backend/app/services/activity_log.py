@@ -0,0 +1,183 @@
+import asyncio
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import async_engine
+from app.models import ActivityLog, User, UserSession
+from app.services.sessions import hash_token
+
+# 9 bind parameters per row stays below the 32767 parameter limit of the
+# PostgreSQL wire protocol.
+MAX_ROWS_PER_STATEMENT = 3000
+
+
+class ActivityLogBuffer:
+    """
+    Ring buffer of request activity, written to activity_logs in the background.
+
+    `record` only appends to a bounded deque, so it never waits and costs
+    the request well under a microsecond. When the buffer is full the
+    oldest entry is overwritten and counted in `overwritten`. A flush task
+    drains the buffer every `flush_interval` seconds, or as soon as
+    `batch_size` entries are pending, and writes them with multi-row
+    INSERTs (the rollup trigger then runs once per statement).
+
+    Entries carry either the user id set by the request (see
+    app.dependencies.get_current_user) or the raw session token; tokens are
+    resolved to users with one user_sessions query per batch, off the
+    request path. Entries that cannot be attributed to a user are skipped,
+    since activity_logs.user_id is required.
+    """
+
+    def __init__(self, max_pending: int = 50000, batch_size: int = 1000, flush_interval: float = 1.0):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.recorded = 0
+        self.overwritten = 0
+        self.unattributed = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def record(self, entry: Dict[str, Any]):
+        """
+        Buffer one activity entry without waiting.
+
+        Args:
+            entry: ActivityLog column values plus an optional "session_token"
+                (used when "user_id" is not known)
+        """
+        if self._task is None or self._stopping:
+            self.dropped += 1
+            return
+
+        if len(self.buffer) == self.max_pending:
+            self.overwritten += 1
+        self.buffer.append(entry)
+        self.recorded += 1
+
+        if len(self.buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self):
+        """Start the flush task (called from the application lifespan)"""
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting entries, write out everything buffered and stop the flush task"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self.buffer:
+                count = min(self.batch_size, len(self.buffer))
+                await self._flush([self.buffer.popleft() for _ in range(count)])
+
+            if self._stopping:
+                return
+
+    @staticmethod
+    async def _attribute(conn, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Resolve session tokens to user ids; returns the rows that have a user"""
+        pending = {}
+        for entry in entries:
+            token = entry.pop("session_token", None)
+            if entry.get("user_id") is None and token:
+                pending.setdefault(hash_token(token), []).append(entry)
+
+        if pending:
+            sessions = (await conn.execute(
+                select(UserSession.token_hash, UserSession.user_id, UserSession.expires_at, UserSession.revoked_at)
+                .where(UserSession.token_hash.in_(list(pending)))
+            )).all()
+            for session in sessions:
+                for entry in pending[session.token_hash]:
+                    # The session must have been valid when the request was made
+                    if session.expires_at > entry["created_at"] and (
+                        session.revoked_at is None or session.revoked_at >= entry["created_at"]
+                    ):
+                        entry["user_id"] = session.user_id
+
+        return [entry for entry in entries if entry.get("user_id") is not None]
+
+    @staticmethod
+    async def _insert(conn, rows: List[Dict[str, Any]]):
+        for start in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+            await conn.execute(insert(ActivityLog.__table__).values(rows[start:start + MAX_ROWS_PER_STATEMENT]))
+
+    async def _flush(self, entries: List[Dict[str, Any]]):
+        """Attribute entries to users and write them with multi-row INSERTs"""
+        rows: List[Dict[str, Any]] = []
+        try:
+            try:
+                async with async_engine.begin() as conn:
+                    rows = await self._attribute(conn, entries)
+                    attributed = len(rows)
+                    if rows:
+                        await self._insert(conn, rows)
+            except IntegrityError:
+                # Some users were deleted since their requests
+                async with async_engine.begin() as conn:
+                    known = set((await conn.execute(
+                        select(User.id).where(User.id.in_({row["user_id"] for row in rows}))
+                    )).scalars())
+                    valid = [row for row in rows if row["user_id"] in known]
+                    if valid:
+                        await self._insert(conn, valid)
+                self.dropped += len(rows) - len(valid)
+                rows = valid
+        except Exception as e:
+            self.failed_batches += 1
+            self.dropped += len(entries)
+            print(f"Activity log flush of {len(entries)} entries failed: {e}")
+            return
+
+        self.unattributed += len(entries) - attributed
+        self.batches += 1
+        self.written += len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self.buffer),
+            "max_pending": self.max_pending,
+            "recorded": self.recorded,
+            "overwritten": self.overwritten,
+            "unattributed": self.unattributed,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+        }
+
+
+# Create a singleton instance
+activity_log_buffer = ActivityLogBuffer(
+    max_pending=int(os.getenv("ACTIVITY_LOG_MAX_PENDING", "50000")),
+    batch_size=int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "1000")),
+    flush_interval=float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "1.0")),
+)
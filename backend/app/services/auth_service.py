@@ -1,10 +1,19 @@
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from sqlalchemy import Integer, case, cast, delete, func, not_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User, MagicLink
+from app.services.ingredient_search import LIKE_ESCAPE, escape_like
+from app.services.sessions import hash_token
+
+# Leaves room in users.username (100 characters) for a numeric suffix
+MAX_USERNAME_BASE_LENGTH = 90
+MAX_USERNAME_ATTEMPTS = 5
+# Expired magic links deleted per transaction
+CLEANUP_BATCH_SIZE = 5000
 
 
 class AuthService:
@@ -16,20 +25,30 @@ class AuthService:
         return secrets.token_urlsafe(length)
 
     @staticmethod
-    def create_magic_link(db: Session, email: str, expiry_minutes: int = 15) -> Optional[MagicLink]:
+    async def create_magic_link(
+        db: AsyncSession,
+        email: str,
+        expiry_minutes: int = 15,
+        commit: bool = True
+    ) -> Optional[Tuple[str, MagicLink]]:
         """
         Create a magic link for a user.
 
+        Only the hash of the token is stored, so the plain token returned
+        here is the only copy and must go into the email.
+
         Args:
             db: Database session
             email: User's email address
             expiry_minutes: Token expiration time in minutes (default: 15)
+            commit: Commit the link; False leaves it to the caller's transaction
 
         Returns:
-            MagicLink object if user exists, None otherwise
+            (token, MagicLink) if user exists, None otherwise
         """
         # Find user by email
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
 
         if not user:
             return None
@@ -38,27 +57,32 @@ class AuthService:
         token = AuthService.generate_token()
 
         # Calculate expiration time
-        expires_at = datetime.utcnow() + timedelta(minutes=expiry_minutes)
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
 
         # Create magic link
         magic_link = MagicLink(
             user_id=user.id,
-            token=token,
+            token_hash=hash_token(token),
             expires_at=expires_at,
             is_used=False
         )
 
         db.add(magic_link)
-        db.commit()
-        db.refresh(magic_link)
+        if commit:
+            await db.commit()
 
-        return magic_link
+        return token, magic_link
 
     @staticmethod
-    def verify_token(db: Session, token: str) -> Optional[User]:
+    async def verify_token(db: AsyncSession, token: str) -> Optional[User]:
         """
         Verify a magic link token and return the associated user.
 
+        The token is consumed and its user loaded by a single
+        `UPDATE ... WHERE NOT is_used AND expires_at > now() RETURNING`
+        joined to users. Concurrent verifications of the same token
+        serialize on the row lock, and only the first one matches.
+
         Args:
             db: Database session
             token: Magic link token to verify
@@ -66,48 +90,98 @@ class AuthService:
         Returns:
             User object if token is valid, None otherwise
         """
-        # Find the magic link
-        magic_link = db.query(MagicLink).filter(
-            and_(
-                MagicLink.token == token,
-                MagicLink.is_used == False,
-                MagicLink.expires_at > datetime.utcnow()
+        consumed = (
+            update(MagicLink)
+            .where(
+                MagicLink.token_hash == hash_token(token),
+                not_(MagicLink.is_used),
+                MagicLink.expires_at > func.now()
             )
-        ).first()
-
-        if not magic_link:
-            return None
+            .values(is_used=True)
+            .returning(MagicLink.user_id)
+            .cte("consumed")
+        )
 
-        # Mark token as used
-        magic_link.is_used = True
-        db.commit()
+        result = await db.execute(select(User).join(consumed, User.id == consumed.c.user_id))
+        user = result.scalars().first()
+        await db.commit()
 
-        # Get and return the user
-        user = db.query(User).filter(User.id == magic_link.user_id).first()
         return user
 
     @staticmethod
-    def cleanup_expired_tokens(db: Session) -> int:
+    async def cleanup_expired_tokens(db: AsyncSession, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
         """
         Clean up expired magic link tokens.
 
+        Tokens are deleted `batch_size` at a time, committing after every
+        batch, so a large backlog never turns into one long transaction.
+
         Args:
             db: Database session
+            batch_size: Tokens deleted per transaction
 
         Returns:
             Number of tokens deleted
         """
-        deleted = db.query(MagicLink).filter(
-            MagicLink.expires_at < datetime.utcnow()
-        ).delete()
-        db.commit()
-        return deleted
+        deleted = 0
+
+        while True:
+            expired = (
+                select(MagicLink.id)
+                .where(MagicLink.expires_at < func.now())
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(delete(MagicLink).where(MagicLink.id.in_(expired.scalar_subquery())))
+            await db.commit()
+
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
 
     @staticmethod
-    def create_or_get_user(db: Session, email: str, username: str = None, full_name: str = None) -> User:
+    async def next_username(db: AsyncSession, base: str) -> str:
+        """
+        Find a free username for `base` with one index-backed prefix scan.
+
+        Returns `base` itself if it is free, otherwise `base` followed by one
+        more than the highest numeric suffix in use (info, info1, ... info41
+        gives info42).
+
+        Args:
+            db: Database session
+            base: Desired username
+
+        Returns:
+            A username that was free when the query ran
+        """
+        suffix = func.substr(User.username, len(base) + 1)
+        result = await db.execute(
+            select(
+                func.bool_or(User.username == base),
+                func.max(case((User.username == base, 0), else_=cast(suffix, Integer)))
+            ).where(
+                User.username.like(escape_like(base) + "%", escape=LIKE_ESCAPE),
+                or_(User.username == base, suffix.op("~")("^[0-9]{1,9}$"))
+            )
+        )
+        base_taken, max_suffix = result.one()
+
+        if not base_taken:
+            return base
+        return f"{base}{max_suffix + 1}"
+
+    @staticmethod
+    async def create_or_get_user(db: AsyncSession, email: str, username: str = None, full_name: str = None) -> User:
         """
         Get existing user or create a new one.
 
+        Takes one query for an existing user. A new user takes a username
+        scan and an `INSERT ... ON CONFLICT DO NOTHING`, whatever the number
+        of users sharing the username. A conflict means a concurrent
+        signup won: either it registered the same email, which is then
+        returned, or it took the username, which is then reallocated.
+
         Args:
             db: Database session
             email: User's email address
@@ -118,32 +192,42 @@ class AuthService:
             User object
         """
         # Check if user exists
-        user = db.query(User).filter(User.email == email).first()
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
 
         if user:
             return user
 
-        # Create new user
-        if not username:
-            username = email.split('@')[0]
-
-        # Ensure username is unique
-        base_username = username
-        counter = 1
-        while db.query(User).filter(User.username == username).first():
-            username = f"{base_username}{counter}"
-            counter += 1
-
-        user = User(
-            email=email,
-            username=username,
-            password_hash="",  # No password for magic link auth
-            full_name=full_name or username,
-            is_active=True
-        )
+        base_username = (username or email.split('@')[0])[:MAX_USERNAME_BASE_LENGTH]
+
+        for attempt in range(MAX_USERNAME_ATTEMPTS):
+            if attempt < MAX_USERNAME_ATTEMPTS - 1:
+                candidate = await AuthService.next_username(db, base_username)
+            else:
+                # Still losing races on the next suffix: step aside with a random one
+                candidate = f"{base_username}{secrets.randbelow(10 ** 9)}"
+
+            result = await db.execute(
+                pg_insert(User)
+                .values(
+                    email=email,
+                    username=candidate,
+                    password_hash="",  # No password for magic link auth
+                    full_name=full_name or candidate,
+                    is_active=True
+                )
+                .on_conflict_do_nothing()
+                .returning(User)
+            )
+            user = result.scalars().first()
 
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+            if user:
+                await db.commit()
+                return user
 
-        return user
+            result = await db.execute(select(User).where(User.email == email))
+            user = result.scalars().first()
+            if user:
+                return user
+
+        raise RuntimeError(f"Could not allocate a username for {base_username!r}")
@@ -0,0 +1,149 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a fixed time-to-live.
+
+    Intended for use from the event loop thread only, so no locking is done.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss or expiry"""
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        """Remove key from the cache if present"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class IngredientCache:
+    """
+    Read cache for the ingredient catalog.
+
+    Single ingredients are cached by id; listing pages are cached by their
+    query parameters together with their ETag. Every write bumps
+    `generation`, so a read that raced with a write can tell that its result
+    is stale and skip storing it. `last_write_at` (monotonic) lets reads
+    from a lagging replica avoid caching rows that predate a recent write.
+
+    The cache is per process: writes made by other workers become visible
+    here once the TTL expires.
+    """
+
+    def __init__(self, maxsize: int = 10000, page_maxsize: int = 256, ttl: float = 60.0):
+        self.by_id = TTLCache(maxsize, ttl)
+        self.pages = TTLCache(page_maxsize, ttl)
+        self.generation = 0
+        self.last_write_at = 0.0
+
+    def get(self, ingredient_id: str) -> Optional[dict]:
+        return self.by_id.get(ingredient_id)
+
+    def put(self, ingredient: dict, generation: int):
+        """Cache a serialized ingredient unless a write happened since generation"""
+        if generation != self.generation:
+            return
+        self.by_id.set(str(ingredient["id"]), ingredient)
+
+    def get_page(self, key: Hashable) -> Optional[tuple]:
+        return self.pages.get(key)
+
+    def put_page(self, key: Hashable, page: dict, etag: str, generation: int):
+        """Cache a serialized listing page and its ETag unless a write happened since generation"""
+        if generation != self.generation:
+            return
+        self.pages.set(key, (page, etag))
+
+    def invalidate(self, ingredient_id: Optional[str] = None):
+        """
+        Drop cached entries affected by a write.
+
+        Args:
+            ingredient_id: Id of the created/updated/deleted ingredient
+        """
+        self.generation += 1
+        self.last_write_at = time.monotonic()
+        if ingredient_id is not None:
+            self.by_id.delete(str(ingredient_id))
+        # Any listing page may include the changed row
+        self.pages.clear()
+
+    def invalidate_all(self):
+        """Drop every cached entry, e.g. after a bulk import"""
+        self.generation += 1
+        self.last_write_at = time.monotonic()
+        self.by_id.clear()
+        self.pages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "by_id": self.by_id.stats(),
+            "pages": self.pages.stats(),
+            "generation": self.generation,
+        }
+
+
+# Create a singleton instance
+ingredient_cache = IngredientCache(
+    maxsize=int(os.getenv("INGREDIENT_CACHE_SIZE", "10000")),
+    page_maxsize=int(os.getenv("INGREDIENT_CACHE_PAGES", "256")),
+    ttl=float(os.getenv("INGREDIENT_CACHE_TTL", "60")),
+)
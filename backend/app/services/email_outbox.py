@@ -0,0 +1,265 @@
+import asyncio
+import os
+import random
+import smtplib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_engine
+from app.models import EmailOutbox, EmailStatus
+from app.services.email_service import create_email_sender
+
+# Retry delay before attempt n + 1: backoff_base * 2^(n - 1), capped, +-20% jitter
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 3600.0
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Errors that will not go away by retrying (rejected recipient, 5xx reply)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    code = getattr(error, "smtp_code", None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+class EmailOutboxWorker:
+    """
+    Delivery worker pool for the email_outbox table.
+
+    Each worker claims up to `batch_size` due messages with
+    `UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING`,
+    so several workers and API processes can drain the table without
+    sending a message twice. A claim is a lease: messages of a worker that
+    died are picked up again once `lease_seconds` have passed.
+
+    Every worker owns one sender, whose SMTP connection is reused across
+    batches; sending runs in a thread so the event loop is not blocked.
+    Failed messages are retried with exponential backoff up to
+    `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        lease_seconds: float = 300.0,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        sender_factory: Callable[[], Any] = create_email_sender
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.sender_factory = sender_factory
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+        self.claim_errors = 0
+        self.delivery_seconds_total = 0.0
+        self.delivery_seconds_max = 0.0
+
+    async def enqueue(self, db: AsyncSession, recipient: str, subject: str, body: str, kind: str) -> EmailOutbox:
+        """
+        Store a message for delivery and wake the workers.
+
+        Args:
+            db: Database session (committed here)
+            recipient: Recipient address
+            subject: Subject line
+            body: Plain text body
+            kind: Message type, e.g. "magic_link"
+
+        Returns:
+            The queued EmailOutbox row
+        """
+        message = EmailOutbox(kind=kind, recipient=recipient, subject=subject, body=body)
+        db.add(message)
+        await db.commit()
+
+        self.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return message
+
+    async def start(self):
+        """Start the delivery workers (called from the application lifespan)"""
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Let the workers finish their current batch, then stop them"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self):
+        sender = self.sender_factory()
+
+        try:
+            while not self._stopping:
+                try:
+                    claimed = await self._claim()
+                except Exception as e:
+                    self.claim_errors += 1
+                    print(f"Email outbox claim failed: {e}")
+                    claimed = []
+
+                if not claimed:
+                    await self._idle()
+                    continue
+
+                results = await asyncio.to_thread(self._deliver, sender, claimed)
+                try:
+                    await self._record(claimed, results)
+                except Exception as e:
+                    # The lease expires and the batch is retried (at-least-once)
+                    print(f"Email outbox could not record {len(claimed)} deliveries: {e}")
+                self.batches += 1
+        finally:
+            await asyncio.to_thread(sender.close)
+
+    async def _idle(self):
+        """Sleep until a message is enqueued in this process or the poll interval passes"""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        if not self._stopping:
+            self._wakeup.clear()
+
+    async def _claim(self) -> List[Any]:
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status.in_((EmailStatus.PENDING, EmailStatus.SENDING)),
+                EmailOutbox.next_attempt_at <= func.now()
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with async_engine.begin() as conn:
+            result = await conn.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(due.scalar_subquery()))
+                .values(
+                    status=EmailStatus.SENDING,
+                    attempts=EmailOutbox.attempts + 1,
+                    next_attempt_at=func.now() + timedelta(seconds=self.lease_seconds)
+                )
+                .returning(
+                    EmailOutbox.id,
+                    EmailOutbox.recipient,
+                    EmailOutbox.subject,
+                    EmailOutbox.body,
+                    EmailOutbox.attempts,
+                    EmailOutbox.created_at
+                )
+            )
+            return result.all()
+
+    @staticmethod
+    def _deliver(sender, claimed: List[Any]) -> List[Optional[Exception]]:
+        """Send a claimed batch on the worker's sender (runs in a thread)"""
+        results = []
+        for message in claimed:
+            try:
+                sender.send_message(message.recipient, message.subject, message.body)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(BACKOFF_MAX_SECONDS, self.backoff_base * 2 ** (attempts - 1))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    async def _record(self, claimed: List[Any], results: List[Optional[Exception]]):
+        now = datetime.now(timezone.utc)
+        sent_ids = []
+        latencies = []
+        failures = []
+
+        for message, error in zip(claimed, results):
+            if error is None:
+                sent_ids.append(message.id)
+                latencies.append((now - message.created_at).total_seconds())
+                continue
+
+            give_up = _is_permanent(error) or message.attempts >= self.max_attempts
+            failures.append({
+                "message_id": message.id,
+                "status": EmailStatus.FAILED if give_up else EmailStatus.PENDING,
+                "next_attempt_at": now + self._backoff(message.attempts),
+                "last_error": f"{type(error).__name__}: {error}"[:1000],
+            })
+
+        async with async_engine.begin() as conn:
+            if sent_ids:
+                await conn.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(sent_ids))
+                    .values(status=EmailStatus.SENT, sent_at=func.now(), last_error=None)
+                )
+            if failures:
+                table = EmailOutbox.__table__
+                await conn.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("message_id"))
+                    .values(
+                        status=bindparam("status"),
+                        next_attempt_at=bindparam("next_attempt_at"),
+                        last_error=bindparam("last_error")
+                    ),
+                    failures
+                )
+
+        self.sent += len(sent_ids)
+        self.delivery_seconds_total += sum(latencies)
+        self.delivery_seconds_max = max([self.delivery_seconds_max, *latencies])
+        for failure in failures:
+            if failure["status"] is EmailStatus.FAILED:
+                self.failed += 1
+            else:
+                self.retried += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "batches": self.batches,
+            "claim_errors": self.claim_errors,
+            "avg_delivery_seconds": round(self.delivery_seconds_total / self.sent, 3) if self.sent else 0.0,
+            "max_delivery_seconds": round(self.delivery_seconds_max, 3),
+        }
+
+
+# Create a singleton instance
+email_outbox = EmailOutboxWorker(
+    workers=int(os.getenv("EMAIL_OUTBOX_WORKERS", "2")),
+    batch_size=int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50")),
+    poll_interval=float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", "1.0")),
+    max_attempts=int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8")),
+)
@@ -1,5 +1,37 @@
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
+from email.message import EmailMessage
+import os
+import smtplib
+
+EMAIL_FROM = os.getenv("EMAIL_FROM", "SmartKitchen <no-reply@smartkitchen.local>")
+MAGIC_LINK_URL = os.getenv("MAGIC_LINK_URL", "http://localhost:8000/auth/verify")
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+
+def render_magic_link_email(token: str, expires_at: datetime) -> Tuple[str, str]:
+    """
+    Build the magic link email.
+
+    Returns:
+        (subject, plain text body)
+    """
+    body = (
+        "Hello,\n\n"
+        "You requested to sign in to SmartKitchen. Click the link below to continue:\n\n"
+        f"{MAGIC_LINK_URL}?token={token}\n\n"
+        f"This link will expire at: {expires_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
+        "If you didn't request this, you can safely ignore this email.\n\n"
+        "Best regards,\n"
+        "The SmartKitchen Team\n"
+    )
+    return "Your SmartKitchen Login Link", body
 
 
 class MockEmailService:
@@ -71,6 +103,103 @@ class MockEmailService:
 
         return True
 
+    @staticmethod
+    def send_message(recipient: str, subject: str, body: str):
+        """Print an outbox message to the console"""
+        print("\n" + "=" * 80)
+        print("📧 MOCK EMAIL SERVICE")
+        print("=" * 80)
+        print(f"To: {recipient}")
+        print(f"Subject: {subject}")
+        print("-" * 80)
+        print(body)
+        print("=" * 80 + "\n")
+
+    def close(self):
+        pass
+
+
+class SMTPEmailService:
+    """
+    SMTP delivery over one reused connection.
+
+    Blocking (smtplib); the outbox workers call it from a thread, each with
+    its own instance. The connection is opened on first use and reopened
+    once if the server dropped it in between.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 10.0,
+        sender: str = EMAIL_FROM
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sender = sender
+        self._smtp: Optional[smtplib.SMTP] = None
+        self.connections = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        self.connections += 1
+        return smtp
+
+    def send_message(self, recipient: str, subject: str, body: str):
+        """
+        Send one plain text email.
+
+        Raises:
+            smtplib.SMTPException or OSError if delivery failed
+        """
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self._smtp = self._connect()
+            self._smtp.send_message(message)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def create_email_sender():
+    """New sender for one outbox worker: SMTP if SMTP_HOST is set, else the console mock"""
+    if SMTP_HOST:
+        return SMTPEmailService(
+            host=SMTP_HOST,
+            port=SMTP_PORT,
+            username=SMTP_USERNAME,
+            password=SMTP_PASSWORD,
+            starttls=SMTP_STARTTLS,
+            timeout=SMTP_TIMEOUT
+        )
+    return MockEmailService()
+
 
 # Create a singleton instance
 email_service = MockEmailService()
@@ -0,0 +1,245 @@
+import codecs
+import csv
+import json
+import uuid
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ingredient
+from app.schemas.ingredients import (
+    IngredientCreate,
+    IngredientImportError,
+    IngredientImportResult
+)
+from app.services.cache import ingredient_cache
+from app.services.nutrition_service import NutritionService
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# 6 bind parameters per row keeps a 1000-row batch far below the
+# 32767 parameter limit of the PostgreSQL wire protocol.
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into decoded text lines.
+
+    Args:
+        chunks: Raw body chunks (e.g. from Request.stream())
+
+    Yields:
+        Lines without their trailing newline
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+def _parse_csv_value(column: str, value: str):
+    if value == "":
+        return None
+    if column == "additional_data":
+        return json.loads(value)
+    return value
+
+
+async def iter_records(
+    lines: AsyncIterable[str],
+    fmt: str
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Parse CSV (with a header row) or NDJSON lines into raw records.
+
+    CSV fields must not contain embedded newlines; `additional_data` may be
+    given as a JSON object string.
+
+    Yields:
+        (line number, record or None, error message or None)
+    """
+    header = None
+    line_no = 0
+
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        try:
+            if fmt == "ndjson":
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+            elif header is None:
+                header = [column.strip() for column in next(csv.reader([line]))]
+                continue
+            else:
+                values = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+                record = {
+                    column: _parse_csv_value(column, value)
+                    for column, value in zip(header, values)
+                }
+        except (ValueError, csv.Error) as e:
+            yield line_no, None, f"Malformed {fmt} row: {e}"
+            continue
+
+        yield line_no, record, None
+
+
+class IngredientImporter:
+    """
+    Batched ingredient upsert.
+
+    Rows are validated with IngredientCreate, de-duplicated by name within a
+    batch (last one wins) and written with a single
+    `INSERT ... ON CONFLICT (name) DO UPDATE` per batch. A batch that fails
+    as a whole is retried row by row so errors can be attributed to lines.
+    """
+
+    def __init__(self, db: AsyncSession, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.batch = {}
+        self.total_rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[IngredientImportError] = []
+
+    def record_error(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(IngredientImportError(line=line, error=error))
+
+    async def add(self, line: int, record: dict):
+        """Validate a raw record and queue it, flushing when the batch is full"""
+        self.total_rows += 1
+
+        try:
+            data = IngredientCreate.model_validate(record)
+        except ValidationError as e:
+            self.record_error(line, "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            ))
+            return
+
+        if data.name in self.batch:
+            # Superseded by a later row for the same name
+            self.updated += 1
+            del self.batch[data.name]
+
+        self.batch[data.name] = (line, {
+            "id": uuid.uuid4(),
+            "name": data.name,
+            "category": data.category,
+            "unit": data.unit,
+            "calories_per_unit": data.calories_per_unit,
+            "additional_data": data.additional_data or {},
+        })
+
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    @staticmethod
+    def _upsert_statement(rows: List[dict]):
+        stmt = pg_insert(Ingredient).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[Ingredient.name],
+            set_={
+                "category": stmt.excluded.category,
+                "unit": stmt.excluded.unit,
+                "calories_per_unit": stmt.excluded.calories_per_unit,
+                "additional_data": stmt.excluded.additional_data,
+                "updated_at": func.now(),
+            }
+        ).returning(literal_column("xmax = 0").label("inserted"))
+
+    async def _write(self, rows: List[dict]):
+        result = await self.db.execute(self._upsert_statement(rows))
+        inserted = sum(1 for row in result if row.inserted)
+        await NutritionService.mark_stale_for_ingredients(self.db, [row["name"] for row in rows])
+        await self.db.commit()
+        self.inserted += inserted
+        self.updated += len(rows) - inserted
+
+    async def flush(self):
+        """Write the pending batch"""
+        if not self.batch:
+            return
+
+        entries = list(self.batch.values())
+        self.batch = {}
+
+        try:
+            await self._write([row for _, row in entries])
+        except SQLAlchemyError:
+            await self.db.rollback()
+            for line, row in entries:
+                try:
+                    await self._write([row])
+                except SQLAlchemyError as e:
+                    await self.db.rollback()
+                    self.record_error(line, str(getattr(e, "orig", e)).strip())
+
+    def result(self) -> IngredientImportResult:
+        return IngredientImportResult(
+            total_rows=self.total_rows,
+            inserted=self.inserted,
+            updated=self.updated,
+            failed=self.failed,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors)
+        )
+
+
+async def import_ingredients(
+    db: AsyncSession,
+    lines: AsyncIterable[str],
+    fmt: str,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> IngredientImportResult:
+    """
+    Upsert ingredients from a CSV or NDJSON line stream.
+
+    Args:
+        db: Database session
+        lines: Text lines of the import file
+        fmt: "csv" or "ndjson"
+        batch_size: Rows per INSERT ... ON CONFLICT statement
+
+    Returns:
+        IngredientImportResult with counts and per-row errors
+    """
+    importer = IngredientImporter(db, batch_size=batch_size)
+
+    try:
+        async for line, record, error in iter_records(lines, fmt):
+            if error:
+                importer.total_rows += 1
+                importer.record_error(line, error)
+            else:
+                await importer.add(line, record)
+
+        await importer.flush()
+    finally:
+        ingredient_cache.invalidate_all()
+
+    return importer.result()
@@ -0,0 +1,76 @@
+from typing import List
+
+from sqlalchemy import func, literal, not_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ingredient
+from app.schemas.ingredients import IngredientSearchResult
+
+
+LIKE_ESCAPE = "!"
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally"""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def build_search_query(query: str, limit: int):
+    """
+    Build the autocomplete query for an ingredient name fragment.
+
+    Two index-backed branches are combined in one round trip:
+    - prefix: `lower(name) LIKE 'abc%'` via ix_ingredients_name_lower_prefix
+    - fuzzy: trigram `name % :q` ordered by `name <-> :q` (KNN on
+      ix_ingredients_name_trgm), excluding names already matched by prefix
+
+    Each branch is limited on its own, so at most 2 * limit rows come back.
+    """
+    lowered = func.lower(Ingredient.name)
+    prefix_match = lowered.like(escape_like(query.lower()) + "%", escape=LIKE_ESCAPE)
+    columns = (
+        Ingredient.id,
+        Ingredient.name,
+        Ingredient.category,
+        Ingredient.unit,
+    )
+
+    prefix = (
+        select(*columns, literal("prefix").label("match"),
+               func.similarity(Ingredient.name, query).label("score"))
+        .where(prefix_match)
+        .order_by(lowered)
+        .limit(limit)
+    )
+
+    fuzzy = (
+        select(*columns, literal("fuzzy").label("match"),
+               func.similarity(Ingredient.name, query).label("score"))
+        .where(Ingredient.name.op("%")(query), not_(prefix_match))
+        .order_by(Ingredient.name.op("<->")(query))
+        .limit(limit)
+    )
+
+    return union_all(prefix, fuzzy)
+
+
+async def search_ingredients(db: AsyncSession, query: str, limit: int = 10) -> List[IngredientSearchResult]:
+    """
+    Search ingredients by name with prefix and typo-tolerant matching.
+
+    Args:
+        db: Database session
+        query: Name fragment typed by the user
+        limit: Maximum number of results
+
+    Returns:
+        Results ranked prefix matches first, then by trigram similarity
+    """
+    rows = (await db.execute(build_search_query(query, limit))).all()
+    rows.sort(key=lambda row: (row.match != "prefix", -row.score, row.name))
+
+    return [IngredientSearchResult(**row._mapping) for row in rows[:limit]]
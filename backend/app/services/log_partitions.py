@@ -0,0 +1,232 @@
+"""
+Monthly range partitions and retention for the activity and usage logs.
+
+Functions take a synchronous Connection so they can run from init_db() and
+the CLI directly, and from async code through `AsyncConnection.run_sync`:
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(ensure_partitions)
+"""
+
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.models import ApplianceEnergyHourly, Base, UserActivityDaily
+
+# Retained months of raw rows per partitioned log table (rollups are kept)
+RETENTION_MONTHS: Dict[str, int] = {
+    "activity_logs": int(os.getenv("ACTIVITY_LOG_RETENTION_MONTHS", "12")),
+    "appliance_usage_logs": int(os.getenv("USAGE_LOG_RETENTION_MONTHS", "6")),
+}
+MONTHS_AHEAD = int(os.getenv("LOG_PARTITION_MONTHS_AHEAD", "2"))
+# Rollup table fed by each log table's insert trigger
+ROLLUP_TABLES = {
+    "activity_logs": UserActivityDaily.__table__,
+    "appliance_usage_logs": ApplianceEnergyHourly.__table__,
+}
+# When set, expired partitions are moved into this schema instead of dropped
+ARCHIVE_SCHEMA = os.getenv("LOG_ARCHIVE_SCHEMA") or None
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month(now: Optional[datetime] = None) -> date:
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    return date(now.year, now.month, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _start(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def retention_cutoff(table: str, now: Optional[datetime] = None) -> datetime:
+    """Rows of `table` created before this instant are past retention"""
+    return _start(add_months(current_month(now), -RETENTION_MONTHS[table]))
+
+
+def _bound(month: date) -> str:
+    """Partition bound literal (DDL does not take bind parameters)"""
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, date]]:
+    """
+    Monthly partitions currently attached to a log table.
+
+    Returns:
+        (partition name, first day of its month), oldest first
+    """
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": table}).scalars()
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match and match.group("table") == table:
+            partitions.append((name, date(int(match.group("year")), int(match.group("month")), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(conn: Connection, table: str, month: date) -> bool:
+    """
+    Create the partition of `table` for one month if it does not exist.
+
+    The partition is built detached, receives any rows of its range that
+    already landed in the default partition, and is then attached, so it
+    works whether or not the default partition holds matching rows.
+
+    Returns:
+        True if a partition was created
+    """
+    name = partition_name(table, month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return False
+
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {table}_default WHERE created_at >= :lower AND created_at < :upper RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ), {"lower": _start(month), "upper": _start(add_months(month, 1))})
+    conn.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    return True
+
+
+def ensure_partitions(
+    conn: Connection,
+    months_ahead: int = MONTHS_AHEAD,
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create the monthly partitions from the current month up to
+    `months_ahead` months in the future for every partitioned log table.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    start = current_month(now)
+    created = []
+
+    for table in RETENTION_MONTHS:
+        for offset in range(months_ahead + 1):
+            month = add_months(start, offset)
+            if create_partition(conn, table, month):
+                created.append(partition_name(table, month))
+
+    return created
+
+
+def apply_retention(
+    conn: Connection,
+    now: Optional[datetime] = None,
+    archive_schema: Optional[str] = ARCHIVE_SCHEMA,
+    purge_default: bool = True
+) -> List[str]:
+    """
+    Detach the partitions that fell out of each table's retention window
+    and drop them, or move them to `archive_schema` if one is given.
+
+    Rows older than the window in the default partition are deleted unless
+    `purge_default` is False (the maintenance scheduler deletes them in
+    batches instead). Rollup tables are not affected.
+
+    Returns:
+        Names of the partitions that were dropped or archived
+    """
+    expired = []
+
+    if archive_schema:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    for table, months in RETENTION_MONTHS.items():
+        cutoff = add_months(current_month(now), -months)
+
+        for name, month in list_partitions(conn, table):
+            if month >= cutoff:
+                break
+            conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if archive_schema:
+                conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+            else:
+                conn.execute(text(f"DROP TABLE {name}"))
+            expired.append(name)
+
+        if purge_default:
+            conn.execute(
+                text(f"DELETE FROM {table}_default WHERE created_at < :cutoff"),
+                {"cutoff": _start(cutoff)}
+            )
+
+    return expired
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar() is True
+
+
+def migrate_to_partitioned(conn: Connection, table: str) -> int:
+    """
+    Convert a log table created before partitioning into the partitioned
+    layout, in one transaction.
+
+    The old table is renamed, the partitioned table (with its default
+    partition and rollup trigger) is created from the model, monthly
+    partitions are created for the whole range of existing rows, and the
+    rows are copied over, which also backfills the rollup table.
+
+    Returns:
+        Number of rows migrated (0 if the table already is partitioned)
+    """
+    if is_partitioned(conn, table):
+        return 0
+
+    ROLLUP_TABLES[table].create(conn, checkfirst=True)
+
+    legacy = f"{table}_unpartitioned"
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+    # Index names are schema-wide; the rows are copied, so the old indexes can go
+    conn.execute(text(f"ALTER TABLE {legacy} DROP CONSTRAINT IF EXISTS {table}_pkey"))
+    for index in conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :legacy"), {"legacy": legacy}
+    ).scalars().all():
+        conn.execute(text(f"DROP INDEX {index}"))
+
+    Base.metadata.tables[table].create(conn)
+
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+    if oldest is not None:
+        month, last = current_month(oldest), current_month()
+        while month < last:
+            create_partition(conn, table, month)
+            month = add_months(month, 1)
+    ensure_partitions(conn)
+
+    columns = ", ".join(column.name for column in Base.metadata.tables[table].columns)
+    migrated = conn.execute(text(
+        f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy}"
+    )).rowcount
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    return migrated
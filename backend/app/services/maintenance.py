@@ -0,0 +1,166 @@
+"""
+Periodic database maintenance jobs, run by app.services.scheduler.
+
+Large deletes are done in small batches, each in its own short
+transaction with a statement timeout, so a sweep never holds locks on a
+big table for long and leaves room for autovacuum between batches.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, async_engine
+from app.services.log_partitions import RETENTION_MONTHS, apply_retention, ensure_partitions, retention_cutoff
+from app.services.nutrition_service import NutritionService
+from app.services.scheduler import JobScheduler
+
+SWEEP_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "5000"))
+# Per batch; a batch that hits it is retried at half the size
+SWEEP_STATEMENT_TIMEOUT_MS = int(os.getenv("MAINTENANCE_STATEMENT_TIMEOUT_MS", "5000"))
+# Per job run; the rest is left for the next run
+SWEEP_MAX_RUNTIME = float(os.getenv("MAINTENANCE_MAX_RUNTIME", "60"))
+SWEEP_PAUSE = float(os.getenv("MAINTENANCE_BATCH_PAUSE", "0.05"))
+
+EMAIL_OUTBOX_SENT_RETENTION_DAYS = int(os.getenv("EMAIL_OUTBOX_SENT_RETENTION_DAYS", "7"))
+EMAIL_OUTBOX_FAILED_RETENTION_DAYS = int(os.getenv("EMAIL_OUTBOX_FAILED_RETENTION_DAYS", "30"))
+
+MIN_BATCH_SIZE = 100
+QUERY_CANCELED = "57014"
+
+
+async def delete_in_batches(
+    db: AsyncSession,
+    table: str,
+    condition: str,
+    params: Optional[dict] = None,
+    batch_size: int = SWEEP_BATCH_SIZE,
+    statement_timeout_ms: int = SWEEP_STATEMENT_TIMEOUT_MS,
+    max_runtime: float = SWEEP_MAX_RUNTIME,
+    pause: float = SWEEP_PAUSE,
+    scheduler: Optional[JobScheduler] = None
+) -> int:
+    """
+    Delete the rows of `table` matching `condition`, one batch per transaction.
+
+    Each batch picks up to `batch_size` matching rows by ctid (skipping
+    rows locked by other transactions) and deletes them through a TID
+    scan. The work stops when a batch comes back short, after
+    `max_runtime` seconds, or when the scheduler is stopping.
+
+    Args:
+        db: Database session (committed after every batch)
+        table: Table (or partition) name
+        condition: SQL condition selecting the rows to delete
+        params: Bind parameters of the condition
+        batch_size: Rows per batch
+        statement_timeout_ms: Upper bound for a single batch
+        max_runtime: Upper bound for the whole call, in seconds
+        pause: Seconds to sleep between batches
+        scheduler: Scheduler whose shutdown should interrupt the sweep
+
+    Returns:
+        Number of rows deleted
+    """
+    deadline = time.monotonic() + max_runtime
+    deleted = 0
+
+    while time.monotonic() < deadline and not (scheduler and scheduler.stopping):
+        try:
+            await db.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+            result = await db.execute(
+                text(
+                    f"DELETE FROM {table} WHERE ctid = ANY(ARRAY("
+                    f"SELECT ctid FROM {table} WHERE {condition} "
+                    f"LIMIT :batch_size FOR UPDATE SKIP LOCKED))"
+                ),
+                {**(params or {}), "batch_size": batch_size}
+            )
+            await db.commit()
+        except DBAPIError as e:
+            await db.rollback()
+            if getattr(e.orig, "sqlstate", None) != QUERY_CANCELED or batch_size <= MIN_BATCH_SIZE:
+                raise
+            batch_size = max(MIN_BATCH_SIZE, batch_size // 2)
+            continue
+
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+        await asyncio.sleep(pause)
+
+    return deleted
+
+
+def register_maintenance_jobs(scheduler: JobScheduler):
+    """Register the periodic maintenance jobs on a scheduler"""
+
+    async def sweep_magic_links():
+        async with AsyncSessionLocal() as db:
+            return await delete_in_batches(db, "magic_links", "expires_at < now()", scheduler=scheduler)
+
+    async def sweep_sessions():
+        # Revoked sessions are kept a day so revocations can still be audited
+        async with AsyncSessionLocal() as db:
+            return await delete_in_batches(
+                db, "user_sessions",
+                "expires_at < now() OR revoked_at < now() - interval '1 day'",
+                scheduler=scheduler
+            )
+
+    async def sweep_email_outbox():
+        async with AsyncSessionLocal() as db:
+            return await delete_in_batches(
+                db, "email_outbox",
+                "(status = 'SENT' AND sent_at < now() - make_interval(days => :sent_days)) "
+                "OR (status = 'FAILED' AND created_at < now() - make_interval(days => :failed_days))",
+                {"sent_days": EMAIL_OUTBOX_SENT_RETENTION_DAYS, "failed_days": EMAIL_OUTBOX_FAILED_RETENTION_DAYS},
+                scheduler=scheduler
+            )
+
+    async def sweep_rate_limits():
+        # Keys whose tat has passed are back to a full burst; dropping them changes nothing
+        async with AsyncSessionLocal() as db:
+            return await delete_in_batches(
+                db, "rate_limit_buckets", "tat < extract(epoch FROM now())", scheduler=scheduler
+            )
+
+    async def maintain_log_partitions():
+        # Partition creation and drops are metadata-only; the expired rows
+        # that landed in the default partitions are deleted in batches.
+        async with async_engine.begin() as conn:
+            created = await conn.run_sync(ensure_partitions)
+            expired = await conn.run_sync(apply_retention, purge_default=False)
+
+        purged = 0
+        async with AsyncSessionLocal() as db:
+            for table in RETENTION_MONTHS:
+                purged += await delete_in_batches(
+                    db, f"{table}_default", "created_at < :cutoff",
+                    {"cutoff": retention_cutoff(table)},
+                    scheduler=scheduler
+                )
+
+        return {"created": len(created), "expired": len(expired), "purged_default_rows": purged}
+
+    async def refresh_nutrition():
+        async with AsyncSessionLocal() as db:
+            return await NutritionService.refresh_stale(db)
+
+    scheduler.add_job("sweep_magic_links", sweep_magic_links,
+                      interval=float(os.getenv("SWEEP_MAGIC_LINKS_INTERVAL", "300")), initial_delay=30)
+    scheduler.add_job("sweep_sessions", sweep_sessions,
+                      interval=float(os.getenv("SWEEP_SESSIONS_INTERVAL", "900")), initial_delay=45)
+    scheduler.add_job("sweep_email_outbox", sweep_email_outbox,
+                      interval=float(os.getenv("SWEEP_EMAIL_OUTBOX_INTERVAL", "3600")), initial_delay=60)
+    scheduler.add_job("sweep_rate_limits", sweep_rate_limits,
+                      interval=float(os.getenv("SWEEP_RATE_LIMITS_INTERVAL", "600")), initial_delay=75)
+    scheduler.add_job("log_partitions", maintain_log_partitions,
+                      interval=float(os.getenv("LOG_PARTITIONS_INTERVAL", "3600")), initial_delay=0)
+    scheduler.add_job("refresh_nutrition", refresh_nutrition,
+                      interval=float(os.getenv("REFRESH_NUTRITION_INTERVAL", "60")), initial_delay=15)
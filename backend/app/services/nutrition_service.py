@@ -0,0 +1,271 @@
+from datetime import datetime, timezone
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import uuid
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Ingredient, Recipe, RecipeIngredient, RecipeNutrition
+from app.services.recipe_service import RecipeService
+from app.services.units import MASS, SAME_UNIT, UNITS, VOLUME
+
+# Recipes recomputed per statement batch
+RECOMPUTE_BATCH_SIZE = 500
+
+
+def _unit(unit: Optional[str]) -> Tuple[float, float]:
+    """(dimension, factor) of a unit, NaN for unknown units"""
+    dimension, factor = UNITS.get((unit or "").strip().lower(), (math.nan, math.nan))
+    return dimension, factor
+
+
+def _nutrients_per_unit(calories: Optional[float], additional_data: Optional[dict]) -> Dict[str, float]:
+    """
+    Per-unit nutrient values of a catalog ingredient.
+
+    `calories_per_unit` supplies "calories"; any numeric values under
+    `additional_data["nutrients"]` (e.g. {"protein": 0.1}) are added as-is.
+    """
+    values = {}
+    if calories is not None:
+        values["calories"] = float(calories)
+    nutrients = (additional_data or {}).get("nutrients") or {}
+    if isinstance(nutrients, dict):
+        for key, value in nutrients.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[key] = float(value)
+    return values
+
+
+class NutritionService:
+    """Materialized recipe nutrition rollups computed from the ingredient catalog"""
+
+    @staticmethod
+    def compute(
+        recipes: Sequence[Tuple[uuid.UUID, Optional[int], List[dict]]],
+        catalog: Dict[str, Tuple[Optional[str], Optional[float], Optional[dict]]]
+    ) -> Dict[uuid.UUID, dict]:
+        """
+        Compute nutrition totals for a batch of recipes in one vectorized pass.
+
+        Each recipe ingredient amount is converted into the unit the catalog
+        ingredient's values refer to (mass, volume or count; mass <-> volume
+        when the catalog gives `additional_data["grams_per_ml"]`), multiplied
+        by the per-unit nutrient matrix and summed per recipe. A recipe's
+        rollup lists the nutrients of the ingredients that contributed to it,
+        so it does not depend on which other recipes share the batch.
+
+        Args:
+            recipes: (recipe id, servings, Recipe.ingredients) tuples
+            catalog: normalized ingredient name -> (unit, calories_per_unit, additional_data)
+
+        Returns:
+            recipe id -> {"totals", "per_serving", "unmatched"}
+        """
+        # Imported on first use: numpy is the largest import of the app and
+        # is only needed here, so keep it off the startup path
+        import numpy as np
+
+        nutrient_values = {name: _nutrients_per_unit(entry[1], entry[2]) for name, entry in catalog.items()}
+        nutrients = sorted({key for values in nutrient_values.values() for key in values})
+        column = {key: i for i, key in enumerate(nutrients)}
+
+        recipe_index, names, amounts = [], [], []
+        recipe_dims, recipe_factors, catalog_dims, catalog_factors, densities = [], [], [], [], []
+        rows = []
+        unmatched = {recipe_id: [] for recipe_id, _, _ in recipes}
+        present = {recipe_id: set() for recipe_id, _, _ in recipes}
+
+        for position, (recipe_id, _, ingredients) in enumerate(recipes):
+            for item in ingredients or []:
+                if not isinstance(item, dict) or not item.get("name"):
+                    continue
+                name = RecipeService.normalize_name(item["name"])
+                entry = catalog.get(name)
+                amount = item.get("amount")
+                if entry is None or not isinstance(amount, (int, float)):
+                    unmatched[recipe_id].append(name)
+                    continue
+
+                recipe_index.append(position)
+                names.append(name)
+                amounts.append(float(amount))
+                recipe_unit, catalog_unit = _unit(item.get("unit")), _unit(entry[0])
+                if (item.get("unit") or "").strip().lower() == (entry[0] or "").strip().lower():
+                    # Same unit on both sides, even one we cannot convert
+                    recipe_unit = catalog_unit = (SAME_UNIT, 1.0)
+                recipe_dims.append(recipe_unit[0])
+                recipe_factors.append(recipe_unit[1])
+                catalog_dims.append(catalog_unit[0])
+                catalog_factors.append(catalog_unit[1])
+                density = (entry[2] or {}).get("grams_per_ml")
+                densities.append(float(density) if isinstance(density, (int, float)) else np.nan)
+                row = np.zeros(len(nutrients))
+                for key, value in nutrient_values[name].items():
+                    row[column[key]] = value
+                rows.append(row)
+
+        totals = np.zeros((len(recipes), len(nutrients)))
+
+        if rows:
+            recipe_index = np.asarray(recipe_index)
+            amounts = np.asarray(amounts)
+            recipe_dims = np.asarray(recipe_dims)
+            catalog_dims = np.asarray(catalog_dims)
+            densities = np.asarray(densities)
+            base_amount = amounts * np.asarray(recipe_factors)
+
+            # Convert into the catalog's dimension, then into the catalog unit
+            converted = np.where(
+                recipe_dims == catalog_dims,
+                base_amount,
+                np.where(
+                    (recipe_dims == VOLUME) & (catalog_dims == MASS),
+                    base_amount * densities,
+                    np.where(
+                        (recipe_dims == MASS) & (catalog_dims == VOLUME),
+                        base_amount / densities,
+                        np.nan
+                    )
+                )
+            ) / np.asarray(catalog_factors)
+
+            convertible = np.isfinite(converted)
+            contributions = np.vstack(rows) * np.where(convertible, converted, 0.0)[:, None]
+            np.add.at(totals, recipe_index, contributions)
+
+            for position in np.flatnonzero(convertible):
+                present[recipes[recipe_index[position]][0]].update(nutrient_values[names[position]])
+            for position in np.flatnonzero(~convertible):
+                unmatched[recipes[recipe_index[position]][0]].append(names[position])
+
+        results = {}
+        for position, (recipe_id, servings, _) in enumerate(recipes):
+            servings = servings if servings and servings > 0 else 1
+            keys = sorted(present[recipe_id])
+            results[recipe_id] = {
+                "totals": {key: round(float(totals[position, column[key]]), 2) for key in keys},
+                "per_serving": {key: round(float(totals[position, column[key]] / servings), 2) for key in keys},
+                "unmatched": sorted(set(unmatched[recipe_id])),
+            }
+        return results
+
+    @staticmethod
+    async def recompute(db: AsyncSession, recipe_ids: Iterable[uuid.UUID]) -> int:
+        """
+        Recompute and store the nutrition rollups of the given recipes.
+
+        The caller commits.
+
+        Args:
+            db: Database session
+            recipe_ids: Recipes to recompute
+
+        Returns:
+            Number of recipes recomputed
+        """
+        recipe_ids = list(dict.fromkeys(recipe_ids))
+        count = 0
+
+        for start in range(0, len(recipe_ids), RECOMPUTE_BATCH_SIZE):
+            chunk = recipe_ids[start:start + RECOMPUTE_BATCH_SIZE]
+            result = await db.execute(
+                select(Recipe.id, Recipe.servings, Recipe.ingredients).where(Recipe.id.in_(chunk))
+            )
+            recipes = [tuple(row) for row in result]
+            if not recipes:
+                continue
+
+            names = set()
+            for _, _, ingredients in recipes:
+                names |= RecipeService.ingredient_names(ingredients)
+
+            catalog = {}
+            if names:
+                lowered = func.lower(Ingredient.name)
+                result = await db.execute(
+                    select(lowered, Ingredient.unit, Ingredient.calories_per_unit, Ingredient.additional_data)
+                    .where(lowered.in_(names))
+                )
+                catalog = {row[0]: tuple(row[1:]) for row in result}
+
+            computed = NutritionService.compute(recipes, catalog)
+            now = datetime.now(timezone.utc)
+            stmt = pg_insert(RecipeNutrition).values([
+                {"recipe_id": recipe_id, "is_stale": False, "computed_at": now, **values}
+                for recipe_id, values in computed.items()
+            ])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[RecipeNutrition.recipe_id],
+                set_={
+                    "totals": stmt.excluded.totals,
+                    "per_serving": stmt.excluded.per_serving,
+                    "unmatched": stmt.excluded.unmatched,
+                    "is_stale": False,
+                    "computed_at": stmt.excluded.computed_at,
+                }
+            ))
+            count += len(computed)
+
+        return count
+
+    @staticmethod
+    async def mark_stale_for_ingredients(db: AsyncSession, names: Iterable[Optional[str]]) -> int:
+        """
+        Flag the rollups of recipes that use any of the given ingredients.
+
+        Only recipes found through the recipe_ingredients index are touched.
+        The caller commits.
+
+        Returns:
+            Number of rollups flagged
+        """
+        names = {RecipeService.normalize_name(name) for name in names if name}
+        if not names:
+            return 0
+
+        affected = select(RecipeIngredient.recipe_id).where(RecipeIngredient.name.in_(names))
+        result = await db.execute(
+            update(RecipeNutrition)
+            .where(RecipeNutrition.recipe_id.in_(affected), RecipeNutrition.is_stale == False)
+            .values(is_stale=True)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @staticmethod
+    async def refresh_stale(db: AsyncSession, limit: int = RECOMPUTE_BATCH_SIZE) -> int:
+        """
+        Recompute up to `limit` stale rollups and commit.
+
+        Returns:
+            Number of recipes recomputed (0 when nothing is stale)
+        """
+        result = await db.execute(
+            select(RecipeNutrition.recipe_id)
+            .where(RecipeNutrition.is_stale == True)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        recipe_ids = result.scalars().all()
+        count = await NutritionService.recompute(db, recipe_ids) if recipe_ids else 0
+        await db.commit()
+        return count
+
+    @staticmethod
+    async def get_or_compute(db: AsyncSession, recipe_id: uuid.UUID) -> Optional[RecipeNutrition]:
+        """
+        Return the materialized rollup of a recipe, recomputing it only if it
+        is missing or stale.
+        """
+        nutrition = await db.get(RecipeNutrition, recipe_id)
+        if nutrition is not None and not nutrition.is_stale:
+            return nutrition
+
+        if not await NutritionService.recompute(db, [recipe_id]):
+            return None
+
+        await db.commit()
+        return await db.get(RecipeNutrition, recipe_id, populate_existing=True)
@@ -0,0 +1,245 @@
+import math
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+
+from app.database import async_engine
+
+TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+# Single round trip: `current` locks the key's row and reads its latest
+# theoretical arrival time (tat), and the upsert, which reads `current`
+# and so runs after it, only advances tat when the request conforms. A
+# refused request gets its Retry-After from that locked value, which no
+# concurrent check can change before this one commits. A new key has no
+# row to lock; if a concurrent check creates it first and this one is
+# refused, current_tat is NULL and the caller retries. Times come from the
+# database clock so all workers agree on them.
+_HIT_SQL = text("""
+    WITH params AS (
+        SELECT CAST(:key AS varchar) AS key,
+               CAST(:interval AS float8) AS step,
+               CAST(:window AS float8) AS burst,
+               extract(epoch FROM clock_timestamp())::float8 AS now
+    ),
+    current AS (
+        SELECT b.tat
+        FROM rate_limit_buckets AS b, params
+        WHERE b.key = params.key
+        FOR UPDATE OF b
+    ),
+    upsert AS (
+        INSERT INTO rate_limit_buckets AS b (key, tat)
+        SELECT params.key, params.now + params.step
+        FROM params LEFT JOIN current ON true
+        ON CONFLICT (key) DO UPDATE
+            SET tat = greatest(b.tat, (SELECT now FROM params)) + (SELECT step FROM params)
+            WHERE greatest(b.tat, (SELECT now FROM params)) + (SELECT step FROM params)
+                  <= (SELECT now + burst FROM params)
+        RETURNING b.tat
+    )
+    SELECT
+        (SELECT tat FROM upsert) AS new_tat,
+        (SELECT tat FROM current) AS current_tat,
+        params.now
+    FROM params
+""")
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process limiter state: one float per key in a dict.
+
+    A check is a dictionary lookup and a little arithmetic, so it costs
+    about a microsecond. Each worker counts separately, so with N workers
+    a client can get up to N times the configured rate.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tat: Dict[str, float] = {}
+
+    async def hit(self, key: str, interval: float, window: float) -> float:
+        return self.hit_sync(key, interval, window)
+
+    def hit_sync(self, key: str, interval: float, window: float) -> float:
+        """Count one request for key; returns 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        tat = max(self._tat.get(key, now), now) + interval
+
+        if tat - now > window:
+            return tat - now - window
+
+        if key not in self._tat and len(self._tat) >= self.max_keys:
+            self._prune(now)
+        self._tat[key] = tat
+        return 0.0
+
+    def _prune(self, now: float):
+        """
+        Forget keys that are back to a full burst; if that frees less than
+        a tenth of the table, also forget the oldest inserted keys, so the
+        scan is paid once per max_keys / 10 new keys at most.
+        """
+        expired = [key for key, tat in self._tat.items() if tat <= now]
+        for key in expired:
+            del self._tat[key]
+
+        target = self.max_keys - max(1, self.max_keys // 10)
+        while len(self._tat) > target:
+            del self._tat[next(iter(self._tat))]
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class PostgresRateLimitBackend:
+    """
+    Limiter state shared by all workers in the UNLOGGED rate_limit_buckets
+    table, updated with one atomic upsert per check (about one database
+    round trip). If the database is unavailable the request is allowed.
+    """
+
+    def __init__(self):
+        self.errors = 0
+
+    async def hit(self, key: str, interval: float, window: float) -> float:
+        params = {"key": key, "interval": interval, "window": window}
+        try:
+            async with async_engine.begin() as conn:
+                row = (await conn.execute(_HIT_SQL, params)).one()
+            if row.new_tat is None and row.current_tat is None:
+                # Refused on a key created concurrently; it has a row to lock now
+                async with async_engine.begin() as conn:
+                    row = (await conn.execute(_HIT_SQL, params)).one()
+        except Exception as e:
+            self.errors += 1
+            print(f"Rate limit check failed, allowing request: {e}")
+            return 0.0
+
+        if row.new_tat is not None:
+            return 0.0
+        return row.current_tat + interval - row.now - window
+
+
+def create_rate_limit_backend():
+    """Backend selected by RATE_LIMIT_BACKEND ("memory" or "postgres")"""
+    if os.getenv("RATE_LIMIT_BACKEND", "memory").lower() == "postgres":
+        return PostgresRateLimitBackend()
+    return MemoryRateLimitBackend(max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")))
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address of a request. X-Forwarded-For is only trusted when
+    RATE_LIMIT_TRUST_FORWARDED is set (i.e. behind a reverse proxy).
+    """
+    if TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse "<limit>/<seconds>", e.g. "10/60", into (limit, window)"""
+    limit, _, window = rate.partition("/")
+    return int(limit), float(window or 60)
+
+
+class RateLimiter:
+    """
+    Generic cell rate algorithm (a token bucket that stores a single
+    timestamp per key): up to `limit` requests at once, refilled evenly
+    over `window` seconds.
+
+    Usable as a FastAPI dependency, keyed by `key_func(request)` (the
+    client IP by default):
+
+        @router.post("/things", dependencies=[Depends(things_per_ip)])
+
+    or called directly with a key taken from the request body:
+
+        await things_per_email.check(request.email.lower())
+
+    Exceeding the limit raises HTTP 429 with a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        window: float,
+        backend=None,
+        key_func: Optional[Callable[[Request], str]] = None
+    ):
+        if limit < 1 or window <= 0:
+            raise ValueError("Rate limit needs limit >= 1 and window > 0")
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.interval = window / limit
+        self.backend = backend
+        self.key_func = key_func or client_ip
+        self.allowed = 0
+        self.limited = 0
+
+    async def hit(self, key: str) -> float:
+        """
+        Count one request for key.
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until it would be
+        """
+        backend = self.backend or rate_limit_backend
+        retry_after = await backend.hit(f"{self.name}:{key}"[:300], self.interval, self.window)
+
+        if retry_after > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    async def check(self, key: str):
+        """
+        Count one request for key.
+
+        Raises:
+            HTTPException 429 with Retry-After if the limit is exceeded
+        """
+        retry_after = await self.hit(key)
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    async def __call__(self, request: Request):
+        await self.check(self.key_func(request))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "window_seconds": self.window,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+# Create a singleton instance
+rate_limit_backend = create_rate_limit_backend()
+
+# Magic link requests create users, write tokens and send mail
+magic_link_per_ip = RateLimiter("magic_link_ip", *parse_rate(os.getenv("RATE_LIMIT_MAGIC_LINK_IP", "10/60")))
+magic_link_per_email = RateLimiter("magic_link_email", *parse_rate(os.getenv("RATE_LIMIT_MAGIC_LINK_EMAIL", "5/900")))
+# Token guessing
+verify_per_ip = RateLimiter("verify_ip", *parse_rate(os.getenv("RATE_LIMIT_VERIFY_IP", "20/60")))
+
+RATE_LIMITERS = {
+    limiter.name: limiter for limiter in (magic_link_per_ip, magic_link_per_email, verify_per_ip)
+}
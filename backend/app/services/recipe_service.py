@@ -0,0 +1,138 @@
+from typing import Iterable, List, Optional, Set
+import uuid
+
+from sqlalchemy import Float, cast, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Recipe, RecipeIngredient
+from app.schemas.recipes import CookableRecipe
+
+
+class RecipeService:
+    """Recipe ingredient indexing and pantry matching"""
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Normalize an ingredient name for matching (trimmed, lower-case)"""
+        return " ".join(name.split()).lower()
+
+    @staticmethod
+    def ingredient_names(ingredients: Iterable[dict]) -> Set[str]:
+        """Distinct normalized ingredient names of a Recipe.ingredients document"""
+        names = set()
+        for item in ingredients or []:
+            name = item.get("name") if isinstance(item, dict) else None
+            if name and name.strip():
+                names.add(RecipeService.normalize_name(name))
+        return names
+
+    @staticmethod
+    async def sync_ingredient_index(db: AsyncSession, recipe: Recipe):
+        """
+        Rebuild the recipe_ingredients rows of a recipe from its ingredients.
+
+        The caller commits. Recipe.ingredient_count is updated to match.
+
+        Args:
+            db: Database session
+            recipe: Recipe whose ingredients were created or changed
+        """
+        names = RecipeService.ingredient_names(recipe.ingredients)
+
+        await db.execute(delete(RecipeIngredient).where(RecipeIngredient.recipe_id == recipe.id))
+        if names:
+            await db.execute(
+                pg_insert(RecipeIngredient)
+                .values([{"recipe_id": recipe.id, "name": name} for name in names])
+                .on_conflict_do_nothing()
+            )
+
+        recipe.ingredient_count = len(names)
+
+    @staticmethod
+    async def find_cookable(
+        db: AsyncSession,
+        pantry: Iterable[str],
+        min_coverage: float = 0.5,
+        limit: int = 20,
+        user_id: Optional[uuid.UUID] = None
+    ) -> List[CookableRecipe]:
+        """
+        Rank recipes by the fraction of their ingredients found in a pantry.
+
+        Only the posting lists of the pantry ingredients are read (through
+        ix_recipe_ingredients_name_recipe_id), so the cost grows with the
+        number of candidate recipes rather than with the whole recipe table.
+
+        Args:
+            db: Database session
+            pantry: Ingredient names available
+            min_coverage: Minimum matched/total ratio (0-1)
+            limit: Maximum number of recipes
+            user_id: If given, the user's private recipes are included too
+
+        Returns:
+            CookableRecipe list, best coverage first, then fewest missing
+        """
+        names = sorted({RecipeService.normalize_name(name) for name in pantry if name.strip()})
+        if not names:
+            return []
+
+        matched = (
+            select(RecipeIngredient.recipe_id, func.count().label("matched"))
+            .where(RecipeIngredient.name.in_(names))
+            .group_by(RecipeIngredient.recipe_id)
+            .subquery()
+        )
+        coverage = cast(matched.c.matched, Float) / cast(Recipe.ingredient_count, Float)
+
+        visible = Recipe.is_public == True
+        if user_id is not None:
+            visible = or_(visible, Recipe.user_id == user_id)
+
+        stmt = (
+            select(
+                Recipe.id,
+                Recipe.name,
+                matched.c.matched,
+                Recipe.ingredient_count.label("total"),
+                coverage.label("coverage")
+            )
+            .join(matched, matched.c.recipe_id == Recipe.id)
+            .where(visible, Recipe.ingredient_count > 0, coverage >= min_coverage)
+            .order_by(
+                coverage.desc(),
+                (Recipe.ingredient_count - matched.c.matched).asc(),
+                Recipe.name
+            )
+            .limit(limit)
+        )
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return []
+
+        # Missing ingredients for the returned recipes only
+        missing = {row.id: [] for row in rows}
+        result = await db.execute(
+            select(RecipeIngredient.recipe_id, RecipeIngredient.name)
+            .where(
+                RecipeIngredient.recipe_id.in_(list(missing)),
+                RecipeIngredient.name.not_in(names)
+            )
+            .order_by(RecipeIngredient.name)
+        )
+        for recipe_id, name in result:
+            missing[recipe_id].append(name)
+
+        return [
+            CookableRecipe(
+                id=row.id,
+                name=row.name,
+                matched=row.matched,
+                total=row.total,
+                coverage=round(row.coverage, 4),
+                missing=missing[row.id]
+            )
+            for row in rows
+        ]
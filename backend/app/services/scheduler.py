@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from app.database import async_engine
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name"""
+    digest = hashlib.sha256(f"smartkitchen:job:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class ScheduledJob:
+    """A coroutine function run every `interval` seconds, with run statistics"""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[Any]], interval: float, initial_delay: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.lock_key = advisory_lock_key(name)
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+        self.last_duration = 0.0
+        self.last_run_at: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "last_duration_seconds": round(self.last_duration, 3),
+            "seconds_since_last_run": round(time.time() - self.last_run_at, 1) if self.last_run_at else None,
+        }
+
+
+class JobScheduler:
+    """
+    In-process periodic job runner started from the application lifespan.
+
+    Every API process runs the scheduler, but each job run first takes a
+    PostgreSQL session advisory lock (`pg_try_advisory_lock`) on a
+    dedicated connection, so a job runs in at most one process at a time;
+    the others skip that tick. Jobs are expected to keep their own
+    transactions short and to return once `stopping` is set.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[Any]], interval: float, initial_delay: float = 0.0):
+        """
+        Register a job; must be called before start().
+
+        Args:
+            name: Unique job name (also determines the advisory lock)
+            func: Coroutine function taking no arguments
+            interval: Seconds between the start of two runs
+            initial_delay: Seconds to wait after startup before the first run
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        self.jobs[name] = ScheduledJob(name, func, interval, initial_delay)
+
+    async def start(self):
+        if self._tasks or not self.enabled:
+            return
+        self._stop = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self.jobs.values()]
+
+    async def stop(self):
+        """Signal running jobs to finish and wait for them"""
+        if not self._tasks:
+            return
+        self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless stopped first; returns False when stopping"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def _loop(self, job: ScheduledJob):
+        if not await self._sleep(job.initial_delay):
+            return
+
+        while True:
+            started = time.monotonic()
+            await self.run_job(job.name)
+            if not await self._sleep(max(0.0, job.interval - (time.monotonic() - started))):
+                return
+
+    async def run_job(self, name: str) -> bool:
+        """
+        Run one job now if no other process holds its lock.
+
+        Returns:
+            True if the job ran (successfully or not), False if it was skipped
+        """
+        job = self.jobs[name]
+
+        try:
+            async with async_engine.connect() as conn:
+                locked = (await conn.execute(select(func.pg_try_advisory_lock(job.lock_key)))).scalar()
+                await conn.commit()
+                if not locked:
+                    job.skipped += 1
+                    return False
+
+                started = time.monotonic()
+                try:
+                    job.last_result = await job.func()
+                    job.last_error = None
+                except Exception as e:
+                    job.failures += 1
+                    job.last_error = f"{type(e).__name__}: {e}"
+                    print(f"Scheduled job {name} failed: {job.last_error}")
+                finally:
+                    job.runs += 1
+                    job.last_duration = time.monotonic() - started
+                    job.last_run_at = time.time()
+                    await conn.execute(select(func.pg_advisory_unlock(job.lock_key)))
+                    await conn.commit()
+        except Exception as e:
+            # Could not get a connection for the lock; try again next tick
+            job.failures += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            print(f"Scheduled job {name} could not run: {job.last_error}")
+
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": bool(self._tasks),
+            "jobs": {name: job.stats() for name, job in self.jobs.items()},
+        }
+
+
+# Create a singleton instance
+scheduler = JobScheduler(enabled=os.getenv("SCHEDULER_ENABLED", "true").lower() == "true")
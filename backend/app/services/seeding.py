@@ -0,0 +1,619 @@
+"""
+Deterministic synthetic data for every table, written with COPY.
+
+Rows are generated in fixed-size chunks. Each chunk draws from its own
+random.Random seeded by (seed, table, chunk), and primary keys and the
+attributes other tables depend on (user emails, ingredient names, appliance
+types) are pure functions of the row index, so children reference parents
+without reading them back and a run is reproducible for the same seed,
+counts, chunk size and anchor date whatever the number of workers.
+
+Chunks are independent jobs: `seed` hands them to a process pool, and each
+writes its rows with binary COPY (asyncpg copy_records_to_table) in one
+transaction. Tables are seeded stage by stage in foreign key order, with all
+chunks of a stage running in parallel. Log rows are assigned to users and
+appliances in contiguous ranges, so concurrent chunks touch different
+rollup rows.
+
+appliance_energy_hourly and user_activity_daily are filled by the log
+tables' insert triggers, which also fire for COPY. rate_limit_buckets holds
+disposable limiter state and is not seeded. Outbox rows are all SENT or
+FAILED so a running EmailOutboxWorker never delivers them, and recipe
+nutrition rows are seeded stale for NutritionService.refresh_stale.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import asyncpg
+import orjson
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.models import ApplianceStatus, EmailStatus, RecipeDifficulty, UserRole
+from app.services.email_service import render_magic_link_email
+from app.services.log_partitions import (
+    add_months,
+    create_partition,
+    current_month,
+    ensure_partitions,
+    partition_name
+)
+from app.services.recipe_service import RecipeService
+
+DEFAULT_CHUNK_SIZE = 50000
+
+QUALIFIERS = ["fresh", "dried", "smoked", "ground", "roasted", "pickled", "frozen", "organic", "wild", "sweet",
+              "red", "green", "whole", "sliced", "toasted"]
+FOODS = {
+    "vegetables": ["tomato", "onion", "garlic", "carrot", "pepper", "spinach", "leek", "zucchini", "celery",
+                   "mushroom", "potato", "cabbage"],
+    "spices": ["paprika", "cumin", "coriander", "turmeric", "cinnamon", "nutmeg", "chili", "clove", "fennel seed"],
+    "dairy": ["milk", "butter", "yogurt", "cream", "parmesan", "mozzarella", "feta", "cheddar"],
+    "grains": ["rice", "oats", "barley", "quinoa", "couscous", "flour", "polenta", "bulgur"],
+    "meat": ["chicken thigh", "beef mince", "pork belly", "lamb shoulder", "turkey breast", "bacon"],
+    "seafood": ["salmon", "cod", "shrimp", "mussels", "tuna", "anchovy"],
+    "fruit": ["lemon", "apple", "mango", "banana", "raspberry", "orange", "pear", "lime"],
+}
+CATEGORY_UNITS = {"vegetables": ["g", "pcs"], "spices": ["tsp", "g"], "dairy": ["ml", "g"], "grains": ["g", "cup"],
+                  "meat": ["g"], "seafood": ["g", "pcs"], "fruit": ["pcs", "g"]}
+# (calories, protein, fat, carbs) per gram of each category, roughly
+CATEGORY_NUTRIENTS = {
+    "vegetables": (0.3, 0.015, 0.003, 0.06), "spices": (3.0, 0.12, 0.1, 0.5), "dairy": (2.5, 0.12, 0.2, 0.04),
+    "grains": (3.6, 0.1, 0.02, 0.75), "meat": (2.2, 0.22, 0.14, 0.0), "seafood": (1.4, 0.2, 0.06, 0.0),
+    "fruit": (0.55, 0.008, 0.003, 0.13),
+}
+TAGS = ["dinner", "lunch", "breakfast", "vegetarian", "quick", "spicy", "baking", "soup", "salad", "family"]
+DISHES = ["soup", "stew", "salad", "bake", "curry", "risotto", "pie", "stir-fry", "tacos", "pasta", "bowl", "gratin"]
+MEALS = [("breakfast", 8), ("lunch", 12), ("dinner", 19)]
+STEPS = ["Prepare the ingredients", "Heat the pan", "Stir well", "Season to taste", "Simmer gently",
+         "Bake until golden", "Let it rest", "Serve warm"]
+
+FIRST_NAMES = ["anna", "ben", "chloe", "david", "emma", "felix", "grace", "hugo", "iris", "jonas", "kate", "liam",
+               "mia", "noah", "olivia", "paul", "quinn", "rosa", "sam", "tara", "umar", "vera", "will", "yara"]
+LAST_NAMES = ["smith", "garcia", "muller", "rossi", "kowalski", "nguyen", "silva", "tanaka", "jensen", "dubois",
+              "okafor", "novak", "larsen", "moreau", "fischer", "costa", "haddad", "ivanova", "brown", "lopez"]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "SmartKitchen/2.3 (Android 14)",
+]
+
+# type -> (actions, temperature range or None, power in kW, duration range in seconds)
+APPLIANCE_TYPES = {
+    "oven": (["preheat", "bake", "broil", "self_clean"], (150.0, 250.0), 2.4, (300, 5400)),
+    "fridge": (["door_open", "defrost", "temperature_check"], (2.0, 6.0), 0.15, (5, 900)),
+    "dishwasher": (["eco_cycle", "normal_cycle", "rinse"], (45.0, 70.0), 1.2, (1800, 9000)),
+    "microwave": (["heat", "defrost"], None, 1.0, (30, 900)),
+    "coffee_maker": (["brew", "descale"], (88.0, 96.0), 1.0, (60, 600)),
+    "induction_hob": (["boil", "simmer", "sear"], (60.0, 250.0), 2.0, (120, 3600)),
+    "air_fryer": (["air_fry", "roast", "reheat"], (160.0, 200.0), 1.5, (300, 2400)),
+}
+APPLIANCE_TYPE_NAMES = list(APPLIANCE_TYPES)
+BRANDS = ["Bosch", "Miele", "Samsung", "LG", "Siemens", "Electrolux", "Whirlpool", "Smeg", "Philips", "Breville"]
+
+# (action, status on success, weight) of the requests ActivityLogMiddleware
+# records: state-changing routes only (ACTIVITY_LOG_METHODS), none under
+# /telemetry (ACTIVITY_LOG_EXCLUDE)
+ACTIVITY_ACTIONS = [
+    ("PATCH /shopping-lists/{list_id}/items/{item_id}", 200, 30),
+    ("POST /shopping-lists/{list_id}/items", 201, 14),
+    ("DELETE /shopping-lists/{list_id}/items/{item_id}", 204, 5),
+    ("POST /recipes/cookable", 200, 12),
+    ("POST /meal-plans/{meal_plan_id}/shopping-list", 201, 6),
+    ("POST /recipes", 201, 6),
+    ("PUT /recipes/{recipe_id}", 200, 5),
+    ("DELETE /recipes/{recipe_id}", 204, 1),
+    ("POST /auth/magic-link", 200, 7),
+    ("POST /auth/verify", 200, 7),
+    ("POST /auth/logout", 200, 3),
+    ("POST /ingredients", 201, 2),
+    ("PUT /ingredients/{ingredient_id}", 200, 1),
+    ("DELETE /ingredients/{ingredient_id}", 204, 1),
+    ("POST /ingredients/import", 200, 1),
+]
+_ACTIVITY_WEIGHTS = [weight for _, _, weight in ACTIVITY_ACTIONS]
+# Path parameter -> table of the row it names; the middleware records the
+# first UUID path parameter as entity_id
+_ENTITY_PARAMS = {
+    "list_id": "shopping_lists", "meal_plan_id": "meal_plans", "recipe_id": "recipes", "ingredient_id": "ingredients",
+}
+_ACTIVITY_ENTITY_TABLES = {
+    action: next((table for param, table in _ENTITY_PARAMS.items() if f"{{{param}}}" in action), None)
+    for action, _, _ in ACTIVITY_ACTIONS
+}
+
+# Table -> columns written by COPY, in insert order
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "users": ("id", "email", "username", "password_hash", "full_name", "role", "is_active", "preferences",
+              "created_at", "updated_at"),
+    "ingredients": ("id", "name", "category", "unit", "calories_per_unit", "additional_data", "created_at",
+                    "updated_at"),
+    "magic_links": ("id", "user_id", "token_hash", "expires_at", "is_used", "created_at"),
+    "user_sessions": ("id", "user_id", "token_hash", "expires_at", "revoked_at", "ip_address", "user_agent",
+                      "created_at"),
+    "email_outbox": ("id", "kind", "recipient", "subject", "body", "status", "attempts", "next_attempt_at",
+                     "last_error", "created_at", "sent_at"),
+    "recipes": ("id", "user_id", "name", "description", "difficulty", "prep_time", "cook_time", "servings",
+                "ingredients", "instructions", "nutrition_info", "tags", "is_public", "image_url",
+                "ingredient_count", "created_at", "updated_at"),
+    "recipe_ingredients": ("recipe_id", "name"),
+    "recipe_nutrition": ("recipe_id", "totals", "per_serving", "unmatched", "is_stale", "computed_at"),
+    "appliances": ("id", "user_id", "name", "type", "brand", "model", "status", "settings", "last_maintenance",
+                   "created_at", "updated_at"),
+    "shopping_lists": ("id", "user_id", "name", "items", "is_completed", "created_at", "updated_at"),
+    "meal_plans": ("id", "user_id", "name", "start_date", "end_date", "description", "is_active", "created_at",
+                   "updated_at"),
+    "meal_plan_recipes": ("id", "meal_plan_id", "recipe_id", "scheduled_date", "meal_type", "notes", "created_at"),
+    "activity_logs": ("id", "user_id", "action", "entity_type", "entity_id", "details", "ip_address", "user_agent",
+                      "created_at"),
+    "appliance_usage_logs": ("id", "appliance_id", "action", "duration", "energy_used", "temperature",
+                             "settings_used", "metrics", "error_logs", "created_at"),
+}
+
+# Seeded in this order; the chunks of one stage run concurrently. Each entry
+# is a generated table; recipes and meal_plans chunks also write the rows
+# of their child tables.
+STAGES: List[Tuple[str, ...]] = [
+    ("users", "ingredients"),
+    ("magic_links", "user_sessions", "email_outbox", "recipes", "appliances", "shopping_lists"),
+    ("meal_plans", "activity_logs", "appliance_usage_logs"),
+]
+GENERATED_TABLES = [table for stage in STAGES for table in stage]
+# Tables whose rows are written by another table's chunks
+CHILD_TABLES = {"recipes": ("recipe_ingredients", "recipe_nutrition"), "meal_plans": ("meal_plan_recipes",)}
+# Tables a generated table references (they must not be empty)
+PARENTS = {
+    "magic_links": ("users",), "user_sessions": ("users",), "email_outbox": ("users",),
+    "recipes": ("users", "ingredients"), "appliances": ("users",), "shopping_lists": ("users", "ingredients"),
+    "meal_plans": ("users", "recipes"), "activity_logs": ("users",), "appliance_usage_logs": ("appliances",),
+}
+# Trigger-maintained rollups of the log tables
+ROLLUP_TABLES = ("appliance_energy_hourly", "user_activity_daily")
+
+_TABLE_CODES = {table: code for code, table in enumerate(COLUMNS, start=1)}
+_MASK64 = (1 << 64) - 1
+_COMBOS = [(category, qualifier, food) for category, foods in FOODS.items() for food in foods
+           for qualifier in QUALIFIERS]
+
+
+def default_counts(users: int) -> Dict[str, int]:
+    """Row counts of the generated tables for a given number of users"""
+    return {
+        "users": users,
+        "ingredients": max(500, min(users // 10, 200000)),
+        "magic_links": users,
+        "user_sessions": users * 2,
+        "email_outbox": users,
+        "recipes": users * 5,
+        "appliances": users * 2,
+        "shopping_lists": users,
+        "meal_plans": users,
+        "activity_logs": users * 50,
+        "appliance_usage_logs": users * 100,
+    }
+
+
+def _mix(value: int) -> int:
+    """Bijective scramble of a 64-bit integer (splitmix64 finalizer)"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _json(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+class SeedPlan:
+    """
+    What to generate: row counts per table, the random seed, and the time
+    range (`days` up to `anchor`) that timestamps fall into.
+    """
+
+    def __init__(
+        self,
+        counts: Dict[str, int],
+        seed: int = 0,
+        days: int = 90,
+        anchor: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        unknown = set(counts) - set(GENERATED_TABLES)
+        if unknown:
+            raise ValueError(f"Cannot seed {', '.join(sorted(unknown))} directly")
+        for table, parents in PARENTS.items():
+            if counts.get(table) and not all(counts.get(parent) for parent in parents):
+                raise ValueError(f"{table} needs rows in {' and '.join(parents)}")
+
+        self.counts = {table: counts.get(table, 0) for table in GENERATED_TABLES}
+        self.seed = seed
+        self.days = days
+        anchor = anchor or datetime.now(timezone.utc).date()
+        self.anchor = datetime(anchor.year, anchor.month, anchor.day, tzinfo=timezone.utc)
+        self.start = self.anchor - timedelta(days=days)
+        self.chunk_size = chunk_size
+        digest = hashlib.sha256(f"smartkitchen-seed:{seed}".encode()).digest()
+        self._id_salt = int.from_bytes(digest[:8], "big")
+
+    def chunks(self, table: str) -> int:
+        return -(-self.counts[table] // self.chunk_size)
+
+    def row_id(self, table: str, index: int) -> uuid.UUID:
+        """Primary key of row `index` of a table; scattered like random UUIDs"""
+        key = (_TABLE_CODES[table] << 48) | index
+        # The low half alone is unique per key; the high half varies with the seed
+        return uuid.UUID(int=(_mix(key ^ self._id_salt) << 64) | _mix(key))
+
+    def timestamp(self, rng: random.Random) -> datetime:
+        return self.anchor - timedelta(seconds=rng.random() * self.days * 86400)
+
+    def pick(self, rng: random.Random, table: str) -> int:
+        """Index of a row of `table`, skewed towards low indices like real popularity"""
+        return int(self.counts[table] * rng.random() ** 2)
+
+    def user_name(self, index: int) -> Tuple[str, str]:
+        mixed = _mix(index)
+        return FIRST_NAMES[mixed % len(FIRST_NAMES)], LAST_NAMES[(mixed >> 20) % len(LAST_NAMES)]
+
+    def user_email(self, index: int) -> str:
+        first, last = self.user_name(index)
+        return f"{first}.{last}.{index}@example.com"
+
+    def ingredient(self, index: int) -> Tuple[str, str]:
+        """(name, category) of catalog row `index`; names are unique"""
+        category, qualifier, food = _COMBOS[index % len(_COMBOS)]
+        round_ = index // len(_COMBOS)
+        return (f"{qualifier} {food} {round_ + 1}" if round_ else f"{qualifier} {food}"), category
+
+    def appliance_type(self, index: int) -> str:
+        return APPLIANCE_TYPE_NAMES[_mix(index) % len(APPLIANCE_TYPE_NAMES)]
+
+    def owner(self, index: int, table: str) -> int:
+        """User (or appliance, for usage logs) of row `index`, in contiguous ranges"""
+        parent = "appliances" if table == "appliance_usage_logs" else "users"
+        return index * self.counts[parent] // self.counts[table]
+
+
+def _users(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        first, last = plan.user_name(n)
+        created_at = plan.timestamp(rng)
+        rows.append((
+            plan.row_id("users", n), plan.user_email(n), f"{first}.{last}.{n}", "",
+            f"{first.title()} {last.title()}", (UserRole.ADMIN if n < 3 else UserRole.USER).name,
+            rng.random() < 0.98,
+            _json({"diet": rng.choice(["none", "none", "vegetarian", "vegan", "pescatarian"]),
+                   "units": rng.choice(["metric", "metric", "imperial"])}),
+            created_at, created_at,
+        ))
+    return {"users": rows}
+
+
+def _ingredients(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        name, category = plan.ingredient(n)
+        calories, protein, fat, carbs = (value * rng.uniform(0.7, 1.3) for value in CATEGORY_NUTRIENTS[category])
+        created_at = plan.timestamp(rng)
+        rows.append((
+            plan.row_id("ingredients", n), name, category, rng.choice(CATEGORY_UNITS[category]),
+            round(calories, 3),
+            _json({"nutrients": {"protein": round(protein, 4), "fat": round(fat, 4), "carbs": round(carbs, 4)}}),
+            created_at, created_at,
+        ))
+    return {"ingredients": rows}
+
+
+def _magic_links(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        created_at = plan.timestamp(rng)
+        rows.append((
+            plan.row_id("magic_links", n), plan.row_id("users", rng.randrange(plan.counts["users"])),
+            hashlib.sha256(f"{plan.seed}:magic_link:{n}".encode()).hexdigest(),
+            created_at + timedelta(minutes=15), rng.random() < 0.9, created_at,
+        ))
+    return {"magic_links": rows}
+
+
+def _user_sessions(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        created_at = plan.timestamp(rng)
+        revoked_at = created_at + timedelta(hours=rng.uniform(1, 240)) if rng.random() < 0.1 else None
+        rows.append((
+            plan.row_id("user_sessions", n), plan.row_id("users", rng.randrange(plan.counts["users"])),
+            hashlib.sha256(f"{plan.seed}:session:{n}".encode()).hexdigest(),
+            created_at + timedelta(days=30), revoked_at, f"10.{rng.randrange(256)}.{rng.randrange(256)}.{n % 250 + 1}",
+            rng.choice(USER_AGENTS), created_at,
+        ))
+    return {"user_sessions": rows}
+
+
+def _email_outbox(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        created_at = plan.timestamp(rng)
+        subject, body = render_magic_link_email(f"{rng.getrandbits(192):048x}", created_at + timedelta(minutes=15))
+        failed = rng.random() < 0.01
+        rows.append((
+            plan.row_id("email_outbox", n), "magic_link", plan.user_email(rng.randrange(plan.counts["users"])),
+            subject, body, (EmailStatus.FAILED if failed else EmailStatus.SENT).name, 5 if failed else 1,
+            created_at, "SMTP 550: mailbox unavailable" if failed else None, created_at,
+            None if failed else created_at + timedelta(seconds=rng.uniform(0.2, 5)),
+        ))
+    return {"email_outbox": rows}
+
+
+def _recipes(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    recipes, index, nutrition = [], [], []
+    for n in range(start, stop):
+        recipe_id = plan.row_id("recipes", n)
+        main, _ = plan.ingredient(plan.pick(rng, "ingredients"))
+        ingredients = []
+        for _ in range(rng.randint(3, 14)):
+            name, category = plan.ingredient(plan.pick(rng, "ingredients"))
+            unit = rng.choice(CATEGORY_UNITS[category])
+            amount = rng.randint(1, 6) if unit in ("pcs", "tsp", "cup") else rng.randrange(10, 500, 10)
+            ingredients.append({"name": name, "amount": amount, "unit": unit})
+        names = RecipeService.ingredient_names(ingredients)
+        created_at = plan.timestamp(rng)
+
+        recipes.append((
+            recipe_id, plan.row_id("users", plan.pick(rng, "users")), f"{main} {rng.choice(DISHES)}",
+            rng.choice([None, "A family favourite", "Quick weeknight dinner", "Best made a day ahead"]),
+            rng.choice(list(RecipeDifficulty)).name, rng.randrange(5, 60, 5), rng.randrange(0, 180, 5),
+            rng.randint(1, 8), _json(ingredients),
+            _json([{"step": step, "text": rng.choice(STEPS)} for step in range(1, rng.randint(3, 9))]),
+            _json({}), _json(rng.sample(TAGS, rng.randint(1, 3))), rng.random() < 0.6,
+            f"https://images.example.com/recipes/{recipe_id}.jpg" if rng.random() < 0.3 else None,
+            len(names), created_at, created_at,
+        ))
+        index.extend((recipe_id, name) for name in names)
+        nutrition.append((recipe_id, "{}", "{}", "[]", True, created_at))
+    return {"recipes": recipes, "recipe_ingredients": index, "recipe_nutrition": nutrition}
+
+
+def _appliances(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    statuses = [ApplianceStatus.ACTIVE.name] * 14 + [ApplianceStatus.INACTIVE.name] * 4 + \
+        [ApplianceStatus.MAINTENANCE.name, ApplianceStatus.ERROR.name]
+    rows = []
+    for n in range(start, stop):
+        kind, brand = plan.appliance_type(n), rng.choice(BRANDS)
+        created_at = plan.timestamp(rng)
+        rows.append((
+            plan.row_id("appliances", n), plan.row_id("users", plan.owner(n, "appliances")),
+            f"{brand} {kind.replace('_', ' ')}", kind, brand, f"{brand[:2].upper()}-{rng.randint(100, 999)}",
+            rng.choice(statuses), _json({"eco_mode": rng.random() < 0.5, "child_lock": rng.random() < 0.2}),
+            created_at + timedelta(days=rng.uniform(0, 30)) if rng.random() < 0.3 else None,
+            created_at, created_at,
+        ))
+    return {"appliances": rows}
+
+
+def _shopping_lists(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    for n in range(start, stop):
+        completed = rng.random() < 0.4
+        items = []
+        for _ in range(rng.randint(3, 25)):
+            name, category = plan.ingredient(plan.pick(rng, "ingredients"))
+            items.append({"id": f"{rng.getrandbits(128):032x}", "name": name, "amount": rng.randint(1, 500),
+                          "unit": rng.choice(CATEGORY_UNITS[category]), "checked": completed or rng.random() < 0.3})
+        items.sort(key=lambda item: (item["name"], item["unit"]))
+        created_at = plan.timestamp(rng)
+        rows.append((
+            plan.row_id("shopping_lists", n), plan.row_id("users", rng.randrange(plan.counts["users"])),
+            f"Groceries {created_at:%b %d}", _json(items), completed, created_at,
+            created_at + timedelta(hours=rng.uniform(0, 72)),
+        ))
+    return {"shopping_lists": rows}
+
+
+def _meal_plans(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    plans, entries = [], []
+    weeks = max(plan.days // 7, 1)
+    for n in range(start, stop):
+        plan_id = plan.row_id("meal_plans", n)
+        week_start = plan.start + timedelta(weeks=rng.randrange(weeks))
+        week_start -= timedelta(days=week_start.weekday())
+        created_at = week_start - timedelta(days=rng.uniform(1, 5))
+        plans.append((
+            plan_id, plan.row_id("users", plan.owner(n, "meal_plans")), f"Week of {week_start:%Y-%m-%d}",
+            week_start, week_start + timedelta(days=6, hours=23, minutes=59),
+            rng.choice([None, "Batch cooking on Sunday", "Lighter week"]),
+            week_start + timedelta(days=7) > plan.anchor, created_at, created_at,
+        ))
+        for day in range(7):
+            for meal in sorted(rng.sample(range(len(MEALS)), 2)):
+                meal_type, hour = MEALS[meal]
+                entries.append((
+                    plan.row_id("meal_plan_recipes", (n * 7 + day) * len(MEALS) + meal), plan_id,
+                    plan.row_id("recipes", plan.pick(rng, "recipes")),
+                    week_start + timedelta(days=day, hours=hour), meal_type, None, created_at,
+                ))
+    return {"meal_plans": plans, "meal_plan_recipes": entries}
+
+
+def _activity_logs(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    actions = rng.choices(ACTIVITY_ACTIONS, weights=_ACTIVITY_WEIGHTS, k=stop - start)
+    rows = []
+    for n, (action, success, _) in zip(range(start, stop), actions):
+        path = action.split(" ", 1)[1]
+        table = _ACTIVITY_ENTITY_TABLES[action]
+        entity_id = plan.row_id(table, plan.pick(rng, table)) if table and plan.counts.get(table) else None
+        status = success if rng.random() < 0.97 else rng.choice([400, 401, 404, 429])
+        rows.append((
+            plan.row_id("activity_logs", n), plan.row_id("users", plan.owner(n, "activity_logs")), action,
+            path.strip("/").split("/", 1)[0], entity_id,
+            _json({"status": status, "duration_ms": round(rng.lognormvariate(2.5, 0.7), 2)}),
+            f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            USER_AGENTS[n % len(USER_AGENTS)], plan.timestamp(rng),
+        ))
+    return {"activity_logs": rows}
+
+
+def _appliance_usage_logs(plan: SeedPlan, rng: random.Random, start: int, stop: int) -> Dict[str, list]:
+    rows = []
+    empty_list = "[]"
+    for n in range(start, stop):
+        appliance = plan.owner(n, "appliance_usage_logs")
+        actions, temperatures, power, (shortest, longest) = APPLIANCE_TYPES[plan.appliance_type(appliance)]
+        duration = rng.randint(shortest, longest)
+        temperature = round(rng.uniform(*temperatures), 1) if temperatures else None
+        error = rng.random() < 0.01
+        rows.append((
+            plan.row_id("appliance_usage_logs", n), plan.row_id("appliances", appliance), rng.choice(actions),
+            duration, round(power * duration / 3600 * rng.uniform(0.6, 1.0), 4), temperature,
+            _json({"eco_mode": rng.random() < 0.5}),
+            _json({"peak_power_w": round(power * 1000 * rng.uniform(0.8, 1.1)), "cycles": rng.randint(1, 4)}),
+            _json([{"code": "E" + str(rng.randint(10, 99)), "message": "sensor timeout"}]) if error else empty_list,
+            plan.timestamp(rng),
+        ))
+    return {"appliance_usage_logs": rows}
+
+
+GENERATORS: Dict[str, Callable[[SeedPlan, random.Random, int, int], Dict[str, list]]] = {
+    "users": _users,
+    "ingredients": _ingredients,
+    "magic_links": _magic_links,
+    "user_sessions": _user_sessions,
+    "email_outbox": _email_outbox,
+    "recipes": _recipes,
+    "appliances": _appliances,
+    "shopping_lists": _shopping_lists,
+    "meal_plans": _meal_plans,
+    "activity_logs": _activity_logs,
+    "appliance_usage_logs": _appliance_usage_logs,
+}
+
+
+def generate_chunk(plan: SeedPlan, table: str, chunk: int) -> Dict[str, list]:
+    """
+    Rows of one chunk of a generated table (and of its child tables).
+
+    Returns:
+        table -> row tuples in COLUMNS order, parents before children
+    """
+    start = chunk * plan.chunk_size
+    stop = min(start + plan.chunk_size, plan.counts[table])
+    rng = random.Random(f"{plan.seed}:{table}:{chunk}")
+    return GENERATORS[table](plan, rng, start, stop)
+
+
+async def copy_chunk(dsn: str, plan: SeedPlan, table: str, chunk: int) -> Dict[str, int]:
+    """
+    Generate one chunk and write it with COPY in a single transaction.
+
+    Returns:
+        table -> rows written
+    """
+    rows = generate_chunk(plan, table, chunk)
+    conn = await asyncpg.connect(dsn)
+    try:
+        # A lost chunk is simply seeded again; no need to wait for the WAL flush
+        await conn.execute("SET synchronous_commit = off")
+        async with conn.transaction():
+            for name, records in rows.items():
+                await conn.copy_records_to_table(name, records=records, columns=COLUMNS[name])
+    finally:
+        await conn.close()
+    return {name: len(records) for name, records in rows.items()}
+
+
+def _run_chunk(dsn: str, plan: SeedPlan, table: str, chunk: int) -> Tuple[str, Dict[str, int]]:
+    """Process pool entry point"""
+    return table, asyncio.run(copy_chunk(dsn, plan, table, chunk))
+
+
+def seed(
+    dsn: str,
+    plan: SeedPlan,
+    workers: int,
+    report: Optional[Callable[[str, Dict[str, int], float], None]] = None
+) -> Dict[str, int]:
+    """
+    Seed all generated tables of a plan, stage by stage, with `workers`
+    processes writing chunks concurrently.
+
+    Args:
+        dsn: asyncpg connection string (postgresql://...)
+        plan: Tables, counts and randomness to seed
+        workers: Number of worker processes
+        report: Called with (table, rows written per table, seconds since
+            its stage started) when all chunks of a table are written
+
+    Returns:
+        table -> rows written
+    """
+    written: Dict[str, int] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stage in STAGES:
+            started = time.perf_counter()
+            pending = {table: plan.chunks(table) for table in stage if plan.counts[table]}
+            stage_rows: Dict[str, Dict[str, int]] = {table: {} for table in pending}
+            futures = [
+                pool.submit(_run_chunk, dsn, plan, table, chunk)
+                for table, chunks in pending.items() for chunk in range(chunks)
+            ]
+            for future in as_completed(futures):
+                table, counts = future.result()
+                for name, count in counts.items():
+                    stage_rows[table][name] = stage_rows[table].get(name, 0) + count
+                    written[name] = written.get(name, 0) + count
+                pending[table] -= 1
+                if pending[table] == 0 and report:
+                    report(table, stage_rows[table], time.perf_counter() - started)
+    return written
+
+
+def seeded_tables() -> List[str]:
+    """Every table that seeding writes to, directly or through triggers"""
+    children = [child for table in GENERATED_TABLES for child in CHILD_TABLES.get(table, ())]
+    return GENERATED_TABLES + children + list(ROLLUP_TABLES)
+
+
+def non_empty_tables(conn: Connection) -> List[str]:
+    return [
+        table for table in seeded_tables()
+        if conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar()
+    ]
+
+
+def truncate(conn: Connection):
+    """Remove all rows from the seeded tables (and their log partitions)"""
+    conn.execute(text(f"TRUNCATE {', '.join(seeded_tables())} CASCADE"))
+
+
+def prepare_partitions(conn: Connection, plan: SeedPlan) -> List[str]:
+    """
+    Create the monthly log partitions covering the plan's time range, so
+    seeded log rows do not pile up in the default partitions.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    created = ensure_partitions(conn)
+    month, last = current_month(plan.start), current_month(plan.anchor)
+    while month <= last:
+        for table in ("activity_logs", "appliance_usage_logs"):
+            if create_partition(conn, table, month):
+                created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def analyze(conn: Connection):
+    """Refresh planner statistics of the seeded tables"""
+    for table in seeded_tables():
+        conn.execute(text(f"ANALYZE {table}"))
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.database import AsyncSessionLocal, async_engine
+from app.models import User, UserSession
+from app.schemas.auth import UserResponse
+from app.services.cache import TTLCache
+
+# NOTIFY channel carrying the token hashes of revoked sessions
+REVOCATION_CHANNEL = "session_revoked"
+
+_MISSING = object()
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest under which a session token is stored and cached"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def user_response(user: User) -> UserResponse:
+    return UserResponse(
+        id=user.id,
+        email=user.email,
+        username=user.username,
+        full_name=user.full_name,
+        role=user.role.value,
+        is_active=user.is_active,
+        created_at=user.created_at
+    )
+
+
+class SessionStore:
+    """
+    Login sessions in user_sessions with an in-process cache in front.
+
+    Validating a cached session costs a hash and a dictionary lookup, with
+    no database round trip. Unknown, expired and revoked tokens are cached
+    as well, so repeated bad tokens do not reach the database either.
+
+    Revoking a session evicts it from this process immediately and
+    publishes its hash with NOTIFY when the transaction commits; processes
+    running `start_listener` evict it as soon as the notification arrives,
+    and any other process stops accepting it within `cache_ttl` seconds.
+    """
+
+    def __init__(self, session_ttl: timedelta, cache_size: int = 10000, cache_ttl: float = 30.0):
+        self.session_ttl = session_ttl
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self._listener: Optional[AsyncConnection] = None
+        self._driver_connection = None
+        # Bumped on every revocation so a lookup that raced with one is not cached
+        self.generation = 0
+
+    async def create(
+        self,
+        db: AsyncSession,
+        user: User,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> Tuple[str, UserSession]:
+        """
+        Start a session for a user.
+
+        Args:
+            db: Database session
+            user: Authenticated user
+            ip_address: Client address, for the user's session list
+            user_agent: Client User-Agent header
+
+        Returns:
+            (session token to hand to the client, stored UserSession)
+        """
+        token = secrets.token_urlsafe(32)
+        session = UserSession(
+            user_id=user.id,
+            token_hash=hash_token(token),
+            expires_at=datetime.now(timezone.utc) + self.session_ttl,
+            ip_address=ip_address,
+            user_agent=user_agent[:500] if user_agent else None
+        )
+
+        db.add(session)
+        await db.commit()
+
+        return token, session
+
+    async def validate(self, token: Optional[str]) -> Optional[UserResponse]:
+        """
+        Resolve a session token to its user.
+
+        A database session is only opened on a cache miss.
+
+        Returns:
+            The session's user, or None if the token is unknown, expired or
+            revoked, or the user is inactive
+        """
+        if not token:
+            return None
+
+        key = hash_token(token)
+        entry = self.cache.get(key, _MISSING)
+
+        if entry is _MISSING:
+            generation = self.generation
+            async with AsyncSessionLocal() as db:
+                entry = await self._load(db, key)
+            if generation == self.generation:
+                self.cache.set(key, entry)
+
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return user
+
+    @staticmethod
+    async def _load(db: AsyncSession, key: str) -> Optional[Tuple[datetime, UserResponse]]:
+        result = await db.execute(
+            select(UserSession.expires_at, User)
+            .join(User, User.id == UserSession.user_id)
+            .where(
+                UserSession.token_hash == key,
+                UserSession.revoked_at.is_(None),
+                UserSession.expires_at > func.now(),
+                User.is_active
+            )
+        )
+        row = result.first()
+
+        if row is None:
+            return None
+        return row.expires_at, user_response(row.User)
+
+    async def revoke(self, db: AsyncSession, token: str) -> bool:
+        """
+        Revoke one session.
+
+        Returns:
+            True if an active session was revoked
+        """
+        return bool(await self._revoke(db, UserSession.token_hash == hash_token(token)))
+
+    async def revoke_user(self, db: AsyncSession, user_id: uuid.UUID) -> int:
+        """
+        Revoke every active session of a user (e.g. on deactivation).
+
+        Returns:
+            Number of sessions revoked
+        """
+        return len(await self._revoke(db, UserSession.user_id == user_id))
+
+    async def _revoke(self, db: AsyncSession, condition) -> List[str]:
+        # Mark, collect and announce the revoked hashes in one statement;
+        # the notifications are delivered when the transaction commits
+        revoked = (
+            update(UserSession)
+            .where(condition, UserSession.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+            .returning(UserSession.token_hash)
+            .cte("revoked")
+        )
+        result = await db.execute(
+            select(revoked.c.token_hash, func.pg_notify(REVOCATION_CHANNEL, revoked.c.token_hash))
+        )
+        hashes = [row.token_hash for row in result]
+        await db.commit()
+
+        self.generation += 1
+        for key in hashes:
+            self.cache.delete(key)
+        return hashes
+
+    def _on_revoked(self, connection, pid, channel, payload):
+        self.generation += 1
+        self.cache.delete(payload)
+
+    async def start_listener(self):
+        """LISTEN for revocations from other processes on a dedicated connection"""
+        if self._listener is not None:
+            return
+
+        conn = await async_engine.connect()
+        try:
+            raw = await conn.get_raw_connection()
+            self._driver_connection = raw.driver_connection
+            await self._driver_connection.add_listener(REVOCATION_CHANNEL, self._on_revoked)
+        except Exception:
+            await conn.close()
+            raise
+        self._listener = conn
+
+    async def stop_listener(self):
+        """Stop listening and return the connection to the pool"""
+        if self._listener is None:
+            return
+
+        try:
+            await self._driver_connection.remove_listener(REVOCATION_CHANNEL, self._on_revoked)
+        finally:
+            await self._listener.close()
+            self._listener = None
+            self._driver_connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache": self.cache.stats(),
+            "listening": self._listener is not None,
+            "generation": self.generation,
+        }
+
+
+# Create a singleton instance
+session_store = SessionStore(
+    session_ttl=timedelta(hours=float(os.getenv("SESSION_TTL_HOURS", "24"))),
+    cache_size=int(os.getenv("SESSION_CACHE_SIZE", "10000")),
+    cache_ttl=float(os.getenv("SESSION_CACHE_TTL", "30")),
+)
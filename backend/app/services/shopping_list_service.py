@@ -0,0 +1,357 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+import enum
+import json
+import uuid
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import MealPlan, MealPlanRecipe, Recipe, ShoppingList
+from app.services.recipe_service import RecipeService
+from app.services.units import BASE_UNITS, MASS, UNITS, VOLUME
+
+
+# Attempts of an item write that lost a race against a concurrent insert or
+# removal shifting the item's array position
+MAX_ITEM_WRITE_ATTEMPTS = 3
+
+# Locates one item of a list by id. The UPDATE below recomputes everything
+# from the row it locks (which PostgreSQL re-reads after waiting for a
+# concurrent writer) and only trusts `position` if the element there still
+# has the item's id, so concurrent edits of other items are never lost.
+_ITEM_TARGET = """
+    WITH params AS (
+        SELECT CAST(:list_id AS uuid) AS list_id,
+               CAST(:item_id AS text) AS item_id,
+               CAST(:patch AS jsonb) AS patch,
+               CAST(:list_version AS integer) AS list_version,
+               CAST(:item_version AS integer) AS item_version
+    ),
+    target AS (
+        SELECT s.id, s.version, e.position, e.item
+        FROM shopping_lists s
+        JOIN params p ON s.id = p.list_id
+        LEFT JOIN LATERAL (
+            SELECT CAST(ordinality - 1 AS integer) AS position, value AS item
+            FROM jsonb_array_elements(s.items) WITH ORDINALITY
+            WHERE value ->> 'id' = p.item_id
+            LIMIT 1
+        ) e ON true
+    ),
+"""
+_ITEM_GUARD = """
+        FROM target t, params p
+        WHERE s.id = t.id
+          AND s.items -> t.position ->> 'id' = p.item_id
+          AND (p.list_version IS NULL OR s.version = p.list_version)
+          AND (p.item_version IS NULL
+               OR coalesce(CAST(s.items -> t.position ->> 'version' AS integer), 0) = p.item_version)
+"""
+_ITEM_RESULT = """
+    SELECT t.version AS current_version, t.item AS current_item, u.version AS new_version, u.item AS new_item
+    FROM target t LEFT JOIN updated u ON true
+"""
+
+# Merges the patch into the item in place and bumps both versions
+_UPDATE_ITEM_SQL = text(_ITEM_TARGET + """
+    updated AS (
+        UPDATE shopping_lists s
+        SET items = jsonb_set(
+                s.items,
+                ARRAY[CAST(t.position AS text)],
+                (s.items -> t.position) || p.patch || jsonb_build_object(
+                    'version', coalesce(CAST(s.items -> t.position ->> 'version' AS integer), 0) + 1
+                )
+            ),
+            version = s.version + 1,
+            updated_at = now()
+""" + _ITEM_GUARD + """
+        RETURNING s.version, s.items -> t.position AS item
+    )
+""" + _ITEM_RESULT)
+
+_REMOVE_ITEM_SQL = text(_ITEM_TARGET + """
+    updated AS (
+        UPDATE shopping_lists s
+        SET items = s.items - t.position,
+            version = s.version + 1,
+            updated_at = now()
+""" + _ITEM_GUARD + """
+        RETURNING s.version, t.item
+    )
+""" + _ITEM_RESULT)
+
+_ADD_ITEM_SQL = text("""
+    WITH params AS (
+        SELECT CAST(:list_id AS uuid) AS list_id,
+               CAST(:item AS jsonb) AS item,
+               CAST(:list_version AS integer) AS list_version
+    ),
+    target AS (
+        SELECT s.version FROM shopping_lists s JOIN params p ON s.id = p.list_id
+    ),
+    updated AS (
+        UPDATE shopping_lists s
+        SET items = s.items || jsonb_build_array(p.item),
+            version = s.version + 1,
+            updated_at = now()
+        FROM params p
+        WHERE s.id = p.list_id AND (p.list_version IS NULL OR s.version = p.list_version)
+        RETURNING s.version
+    )
+    SELECT t.version AS current_version, u.version AS new_version
+    FROM target t LEFT JOIN updated u ON true
+""")
+
+
+class ItemWriteStatus(enum.Enum):
+    DONE = "done"
+    LIST_NOT_FOUND = "list_not_found"
+    ITEM_NOT_FOUND = "item_not_found"
+    # If-Match list version is stale
+    PRECONDITION_FAILED = "precondition_failed"
+    # Expected item version is stale, or the position race kept being lost
+    CONFLICT = "conflict"
+
+
+def _display(amount: float, dimension: int):
+    """Present a base-unit amount in a readable unit (kg/l above 1000 g/ml)"""
+    if dimension in (MASS, VOLUME) and amount >= 1000:
+        return round(amount / 1000, 3), "kg" if dimension == MASS else "l"
+    return round(amount, 3), BASE_UNITS[dimension]
+
+
+class ShoppingListService:
+    """Shopping list generation from meal plans and item-level edits"""
+
+    @staticmethod
+    def aggregate(ingredient_lists: Iterable[List[dict]]) -> List[dict]:
+        """
+        Merge recipe ingredient lists into consolidated shopping list items.
+
+        Amounts of the same ingredient are summed in one pass after converting
+        them to the base unit of their dimension (g, ml or pieces), so
+        "200 g" and "1 kg" of flour become one "1.2 kg" line. Units that
+        cannot be converted are only merged with the same unit.
+
+        Args:
+            ingredient_lists: Recipe.ingredients documents, one per scheduled meal
+
+        Returns:
+            Shopping list items sorted by name
+        """
+        totals = {}
+
+        for ingredients in ingredient_lists:
+            for item in ingredients or []:
+                if not isinstance(item, dict) or not item.get("name"):
+                    continue
+
+                name = RecipeService.normalize_name(item["name"])
+                unit = (item.get("unit") or "").strip().lower()
+                amount = item.get("amount")
+                dimension, factor = UNITS.get(unit, (None, 1.0))
+                key = (name, dimension if dimension is not None else unit)
+
+                entry = totals.setdefault(key, {"name": name, "amount": None, "unit": unit, "dimension": dimension})
+                if isinstance(amount, (int, float)) and not isinstance(amount, bool):
+                    entry["amount"] = (entry["amount"] or 0.0) + amount * factor
+
+        items = []
+        for entry in totals.values():
+            amount, unit = entry["amount"], entry["unit"] or None
+            if entry["dimension"] is not None and amount is not None:
+                amount, unit = _display(amount, entry["dimension"])
+
+            items.append({
+                "id": uuid.uuid4().hex,
+                "name": entry["name"],
+                "amount": amount,
+                "unit": unit,
+                "checked": False,
+            })
+
+        items.sort(key=lambda item: (item["name"], item["unit"] or ""))
+        return items
+
+    @staticmethod
+    async def generate_for_meal_plan(
+        db: AsyncSession,
+        meal_plan_id: uuid.UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        name: Optional[str] = None
+    ) -> Optional[ShoppingList]:
+        """
+        Generate and persist a consolidated shopping list for a meal plan.
+
+        All scheduled recipes in the date range are read with a single
+        meal_plan_recipes JOIN recipes query that only selects the
+        ingredients column, instead of loading each MealPlanRecipe.recipe
+        lazily.
+
+        Args:
+            db: Database session
+            meal_plan_id: Meal plan to shop for
+            start_date: First scheduled date included (default: plan start)
+            end_date: Last scheduled date included (default: plan end)
+            name: Shopping list name (default: derived from the plan)
+
+        Returns:
+            The created ShoppingList, or None if the meal plan does not exist
+        """
+        meal_plan = await db.get(MealPlan, meal_plan_id)
+        if not meal_plan:
+            return None
+
+        start_date = start_date or meal_plan.start_date
+        end_date = end_date or meal_plan.end_date
+
+        result = await db.execute(
+            select(Recipe.ingredients)
+            .select_from(MealPlanRecipe)
+            .join(Recipe, Recipe.id == MealPlanRecipe.recipe_id)
+            .where(
+                MealPlanRecipe.meal_plan_id == meal_plan_id,
+                MealPlanRecipe.scheduled_date >= start_date,
+                MealPlanRecipe.scheduled_date <= end_date
+            )
+        )
+
+        shopping_list = ShoppingList(
+            user_id=meal_plan.user_id,
+            name=name or f"{meal_plan.name} ({start_date:%Y-%m-%d} - {end_date:%Y-%m-%d})",
+            items=ShoppingListService.aggregate(result.scalars()),
+            is_completed=False
+        )
+
+        db.add(shopping_list)
+        await db.commit()
+        await db.refresh(shopping_list)
+
+        return shopping_list
+
+    @staticmethod
+    async def add_item(
+        db: AsyncSession,
+        list_id: uuid.UUID,
+        item: dict,
+        list_version: Optional[int] = None
+    ) -> Tuple[ItemWriteStatus, Optional[int], Optional[dict]]:
+        """
+        Append an item to a list with one UPDATE (`items || [item]`); the
+        rest of the document never leaves the database.
+
+        Args:
+            db: Database session
+            list_id: Shopping list to add to
+            item: Item fields (name, amount, unit, checked); an id is assigned
+            list_version: If given, only write if the list is at this version
+
+        Returns:
+            (status, list version after the write or current version, item)
+        """
+        item = {**item, "id": uuid.uuid4().hex, "version": 0}
+        row = (await db.execute(_ADD_ITEM_SQL, {
+            "list_id": list_id, "item": json.dumps(item), "list_version": list_version
+        })).first()
+
+        if row is None:
+            return ItemWriteStatus.LIST_NOT_FOUND, None, None
+        if row.new_version is None:
+            return ItemWriteStatus.PRECONDITION_FAILED, row.current_version, None
+
+        await db.commit()
+        return ItemWriteStatus.DONE, row.new_version, item
+
+    @staticmethod
+    async def update_item(
+        db: AsyncSession,
+        list_id: uuid.UUID,
+        item_id: str,
+        changes: dict,
+        list_version: Optional[int] = None,
+        item_version: Optional[int] = None
+    ) -> Tuple[ItemWriteStatus, Optional[int], Optional[dict]]:
+        """
+        Merge `changes` into one item in place with jsonb_set, bumping the
+        item's and the list's version.
+
+        Concurrent edits of other items of the same list both apply, since
+        each UPDATE rewrites only its element of the latest row version.
+        Conflicting edits of the same item are caught with `item_version`,
+        and edits based on a stale list with `list_version`.
+
+        Args:
+            db: Database session
+            list_id: Shopping list
+            item_id: Item id within the list
+            changes: Fields to overwrite
+            list_version: If given, only write if the list is at this version
+            item_version: If given, only write if the item is at this version
+
+        Returns:
+            (status, list version after the write or current version, item
+            after the write or current item)
+        """
+        return await ShoppingListService._write_item(
+            db, _UPDATE_ITEM_SQL, list_id, item_id, changes, list_version, item_version
+        )
+
+    @staticmethod
+    async def remove_item(
+        db: AsyncSession,
+        list_id: uuid.UUID,
+        item_id: str,
+        list_version: Optional[int] = None,
+        item_version: Optional[int] = None
+    ) -> Tuple[ItemWriteStatus, Optional[int], Optional[dict]]:
+        """
+        Remove one item in place (`items - position`), with the same version
+        checks as update_item.
+
+        Returns:
+            (status, list version after the write or current version, the
+            removed or current item)
+        """
+        return await ShoppingListService._write_item(
+            db, _REMOVE_ITEM_SQL, list_id, item_id, {}, list_version, item_version
+        )
+
+    @staticmethod
+    async def _write_item(
+        db: AsyncSession,
+        statement,
+        list_id: uuid.UUID,
+        item_id: str,
+        changes: dict,
+        list_version: Optional[int],
+        item_version: Optional[int]
+    ) -> Tuple[ItemWriteStatus, Optional[int], Optional[dict]]:
+        params = {
+            "list_id": list_id,
+            "item_id": item_id,
+            "patch": json.dumps(changes),
+            "list_version": list_version,
+            "item_version": item_version,
+        }
+
+        for _ in range(MAX_ITEM_WRITE_ATTEMPTS):
+            row = (await db.execute(statement, params)).first()
+
+            if row is None:
+                return ItemWriteStatus.LIST_NOT_FOUND, None, None
+            if row.new_version is not None:
+                await db.commit()
+                return ItemWriteStatus.DONE, row.new_version, row.new_item
+            if row.current_item is None:
+                return ItemWriteStatus.ITEM_NOT_FOUND, row.current_version, None
+            if list_version is not None and row.current_version != list_version:
+                return ItemWriteStatus.PRECONDITION_FAILED, row.current_version, row.current_item
+            if item_version is not None and row.current_item.get("version", 0) != item_version:
+                return ItemWriteStatus.CONFLICT, row.current_version, row.current_item
+            # The item moved (or the versions changed) between locating and
+            # locking the row; locate it again in a fresh snapshot
+
+        return ItemWriteStatus.CONFLICT, row.current_version, row.current_item
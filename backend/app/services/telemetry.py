@@ -0,0 +1,203 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import async_engine
+from app.models import Appliance, ApplianceUsageLog
+from app.schemas.telemetry import TelemetryEvent
+
+# 10 bind parameters per row stays below the 32767 parameter limit of the
+# PostgreSQL wire protocol.
+MAX_ROWS_PER_STATEMENT = 3000
+
+
+class TelemetryBuffer:
+    """
+    Bounded in-memory buffer between telemetry producers and the database.
+
+    Producers enqueue validated events; flush workers drain the queue and
+    write one multi-row INSERT per batch, when either `batch_size` events
+    are pending or `flush_interval` seconds passed since the first one.
+    A full queue is the backpressure signal: `offer` refuses the whole
+    batch (HTTP callers answer 503), `put` waits (WebSocket callers stop
+    reading, which slows the device down through TCP flow control).
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 100000,
+        batch_size: int = 2000,
+        flush_interval: float = 0.5,
+        workers: int = 2
+    ):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.workers = workers
+        self.queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping
+
+    async def start(self):
+        """Start the flush workers (called from the application lifespan)"""
+        if self._tasks:
+            return
+        self._stopping = False
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop accepting events, write out everything queued and stop the workers"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        # One sentinel per worker, queued behind all pending events
+        for _ in self._tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def _to_row(event: TelemetryEvent) -> Dict[str, Any]:
+        return {
+            "appliance_id": event.appliance_id,
+            "action": event.action,
+            "duration": event.duration,
+            "energy_used": event.energy_used,
+            "temperature": event.temperature,
+            "settings_used": event.settings_used or {},
+            "metrics": event.metrics or {},
+            "error_logs": event.error_logs or [],
+            "created_at": event.timestamp or datetime.now(timezone.utc),
+        }
+
+    def offer(self, events: List[TelemetryEvent]) -> bool:
+        """
+        Enqueue a batch of events without waiting.
+
+        Returns:
+            False (and enqueues nothing) if the buffer cannot take all of them
+        """
+        if not self.running or self.max_pending - self.queue.qsize() < len(events):
+            self.rejected += len(events)
+            return False
+
+        for event in events:
+            self.queue.put_nowait(self._to_row(event))
+        self.accepted += len(events)
+        return True
+
+    async def put(self, event: TelemetryEvent) -> bool:
+        """
+        Enqueue one event, waiting while the buffer is full.
+
+        Returns:
+            False if the buffer is not accepting events (shutting down)
+        """
+        if not self.running:
+            self.rejected += 1
+            return False
+        await self.queue.put(self._to_row(event))
+        self.accepted += 1
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            row = await self.queue.get()
+            if row is None:
+                return
+
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+
+            while len(batch) < self.batch_size:
+                try:
+                    row = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    @staticmethod
+    async def _insert(conn, rows: List[Dict[str, Any]]):
+        # A single INSERT ... VALUES statement per chunk (rather than an
+        # executemany) so the statement-level rollup trigger runs once
+        for start in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+            await conn.execute(insert(ApplianceUsageLog.__table__).values(rows[start:start + MAX_ROWS_PER_STATEMENT]))
+
+    async def _flush(self, rows: List[Dict[str, Any]]):
+        """Write rows with multi-row INSERTs, dropping rows of unknown appliances"""
+        try:
+            try:
+                async with async_engine.begin() as conn:
+                    await self._insert(conn, rows)
+            except IntegrityError:
+                # Some events reference appliances that do not exist (anymore)
+                async with async_engine.begin() as conn:
+                    known = set((await conn.execute(
+                        select(Appliance.id).where(Appliance.id.in_({row["appliance_id"] for row in rows}))
+                    )).scalars())
+                    valid = [row for row in rows if row["appliance_id"] in known]
+                    if valid:
+                        await self._insert(conn, valid)
+                self.dropped += len(rows) - len(valid)
+                rows = valid
+        except Exception as e:
+            self.failed_batches += 1
+            self.dropped += len(rows)
+            print(f"Telemetry flush of {len(rows)} events failed: {e}")
+            return
+
+        self.batches += 1
+        self.written += len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.queue.qsize() if self.queue is not None else 0,
+            "max_pending": self.max_pending,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+        }
+
+
+# Create a singleton instance
+telemetry_buffer = TelemetryBuffer(
+    max_pending=int(os.getenv("TELEMETRY_MAX_PENDING", "100000")),
+    batch_size=int(os.getenv("TELEMETRY_BATCH_SIZE", "2000")),
+    flush_interval=float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "0.5")),
+    workers=int(os.getenv("TELEMETRY_FLUSH_WORKERS", "2")),
+)
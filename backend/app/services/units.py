@@ -0,0 +1,35 @@
+from typing import Dict, Tuple
+
+# Unit dimensions; SAME_UNIT marks two identical (possibly unknown) units
+MASS, VOLUME, COUNT, SAME_UNIT = 0, 1, 2, 3
+
+# unit -> (dimension, factor to the dimension's base unit: g, ml or piece)
+UNITS: Dict[str, Tuple[int, float]] = {
+    "mg": (MASS, 0.001),
+    "g": (MASS, 1.0),
+    "gram": (MASS, 1.0),
+    "grams": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "oz": (MASS, 28.349523125),
+    "lb": (MASS, 453.59237),
+    "lbs": (MASS, 453.59237),
+    "ml": (VOLUME, 1.0),
+    "cl": (VOLUME, 10.0),
+    "dl": (VOLUME, 100.0),
+    "l": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 4.92892159375),
+    "tbsp": (VOLUME, 14.78676478125),
+    "fl oz": (VOLUME, 29.5735295625),
+    "cup": (VOLUME, 236.5882365),
+    "cups": (VOLUME, 236.5882365),
+    "": (COUNT, 1.0),
+    "pc": (COUNT, 1.0),
+    "pcs": (COUNT, 1.0),
+    "piece": (COUNT, 1.0),
+    "pieces": (COUNT, 1.0),
+    "each": (COUNT, 1.0),
+    "unit": (COUNT, 1.0),
+}
+
+# Base unit names of each dimension
+BASE_UNITS = {MASS: "g", VOLUME: "ml", COUNT: "pcs"}
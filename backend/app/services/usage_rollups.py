@@ -0,0 +1,94 @@
+from datetime import date, datetime
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ApplianceEnergyHourly, UserActivityDaily
+
+GRANULARITIES = ("hour", "day")
+
+
+class UsageRollupService:
+    """Dashboard reads over the pre-aggregated log rollup tables"""
+
+    @staticmethod
+    async def appliance_energy(
+        db: AsyncSession,
+        appliance_id: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        granularity: str = "hour"
+    ) -> List[dict]:
+        """
+        Energy use of an appliance per hour or day (UTC).
+
+        Reads appliance_energy_hourly, so the cost depends on the number of
+        buckets in the range rather than on the number of raw events.
+
+        Args:
+            db: Database session
+            appliance_id: Appliance to report on
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            granularity: "hour" or "day"
+
+        Returns:
+            Rows of period start, events, duration and energy_used, ordered by period
+        """
+        hourly = ApplianceEnergyHourly
+        if granularity == "day":
+            period = func.timezone("UTC", func.date_trunc("day", func.timezone("UTC", hourly.bucket)))
+        else:
+            period = hourly.bucket
+
+        result = await db.execute(
+            select(
+                period.label("period"),
+                func.sum(hourly.events).label("events"),
+                func.sum(hourly.duration).label("duration"),
+                func.sum(hourly.energy_used).label("energy_used")
+            )
+            .where(
+                hourly.appliance_id == appliance_id,
+                hourly.bucket >= start,
+                hourly.bucket < end
+            )
+            .group_by("period")
+            .order_by("period")
+        )
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    async def user_activity(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        start: date,
+        end: date,
+        action: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Daily (UTC) action counts of a user from user_activity_daily.
+
+        Args:
+            db: Database session
+            user_id: User to report on
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            action: Only count this action
+
+        Returns:
+            Rows of day, action and events ordered by day and action
+        """
+        daily = UserActivityDaily
+        query = select(daily.day, daily.action, daily.events).where(
+            daily.user_id == user_id,
+            daily.day >= start,
+            daily.day <= end
+        )
+        if action:
+            query = query.where(daily.action == action)
+
+        result = await db.execute(query.order_by(daily.day, daily.action))
+        return [dict(row._mapping) for row in result]
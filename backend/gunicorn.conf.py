@@ -0,0 +1,63 @@
+"""
+Production serving profile: gunicorn managing uvicorn workers.
+
+    cd backend && gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (preload_app) and forked into
+WEB_CONCURRENCY workers, one per available CPU by default. Each worker
+then replaces the connection pools it inherited with its own (post_fork),
+so no database connection is shared between processes, and runs its own
+lifespan: background buffers, the maintenance scheduler (advisory-locked,
+so jobs still run once at a time) and replica checks.
+
+Signals to the master:
+    HUP    re-read this file, start new workers and gracefully stop the old
+           ones (same code: the app stays preloaded in the master)
+    USR2   start a new master with new code next to the old one; then send
+           TERM to the old master (see run_server.sh reload)
+    TERM   graceful stop, workers finish requests within GRACEFUL_TIMEOUT
+"""
+
+import os
+import sys
+
+
+def _cpu_count() -> int:
+    """CPUs this process may run on (respects affinity, e.g. taskset/cpusets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY") or _cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app before forking: startup cost is paid once, and workers
+# share the imported code pages copy-on-write
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Recycle workers after a number of requests, staggered by the jitter so
+# they do not all restart at once
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0")) or max_requests // 10
+
+pidfile = os.getenv("PIDFILE", "/tmp/smartkitchen-gunicorn.pid") or None
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+
+
+def when_ready(server):
+    server.log.info(f"SmartKitchen API ready with {server.cfg.workers} workers")
+
+
+def post_fork(server, worker):
+    # Engines are created at import time, so with a preloaded app the worker
+    # inherited the master's pools; without preload it imports its own
+    if "app.database" in sys.modules:
+        sys.modules["app.database"].db_manager.reset_after_fork()
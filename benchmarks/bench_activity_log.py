@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Activity log benchmark: request-path overhead and flush throughput.
+
+Serves a trivial POST endpoint with and without ActivityLogMiddleware,
+reports the per-request overhead of recording activity, and how fast the
+buffered entries of a throwaway user reach activity_logs through multi-row
+INSERTs. The user (and its activity) is deleted afterwards. Requires a
+reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_activity_log.py --requests 20000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from fastapi import FastAPI, Request
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, db_manager
+from app.middleware import ActivityLogMiddleware
+from app.models import ActivityLog, User
+from app.services.activity_log import ActivityLogBuffer
+from common import Timer, percentile, print_header, print_result, summarize
+
+
+def build_app(buffer, user_id):
+    app = FastAPI()
+
+    @app.post("/things/{thing_id}")
+    async def touch_thing(thing_id: uuid.UUID, request: Request):
+        request.state.user_id = user_id
+        return {"id": str(thing_id)}
+
+    if buffer is not None:
+        app.add_middleware(ActivityLogMiddleware, buffer=buffer)
+    return app
+
+
+async def run(app, requests, concurrency):
+    latencies = []
+    remaining = iter(range(requests))
+    loop = asyncio.get_running_loop()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for _ in remaining:
+                start = loop.time()
+                response = await client.post(f"/things/{uuid.uuid4()}")
+                latencies.append(loop.time() - start)
+                assert response.status_code == 200, response.text
+
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, timer.elapsed
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - activity logging")
+    print(f"  requests={args.requests} concurrency={args.concurrency} batch={args.batch}\n")
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    buffer = ActivityLogBuffer(max_pending=args.requests, batch_size=args.batch, flush_interval=0.5)
+
+    try:
+        baseline, elapsed = await run(build_app(None, user_id), args.requests, args.concurrency)
+        print_result("no middleware", summarize(baseline, elapsed))
+
+        await buffer.start()
+        latencies, elapsed = await run(build_app(buffer, user_id), args.requests, args.concurrency)
+        result = summarize(latencies, elapsed)
+        result["overhead_p50_ms"] = round((percentile(latencies, 50) - percentile(baseline, 50)) * 1000, 3)
+        print_result("activity middleware", result)
+
+        with Timer() as drain:
+            await buffer.stop()
+        stats = buffer.stats()
+        print_result("flush", {
+            "written": stats["written"],
+            "batches": stats["batches"],
+            "overwritten": stats["overwritten"],
+            "dropped": stats["dropped"],
+            "drain_s_after_load": round(drain.elapsed, 3),
+        })
+    finally:
+        await buffer.stop()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(ActivityLog).where(ActivityLog.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000, help="Entries per INSERT batch")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: blocking Session queries inside async handlers vs AsyncSession.
+
+Both variants serve the same catalog query from an in-process FastAPI app,
+so a blocking query stalls the shared event loop exactly like it would under
+uvicorn. Requires a reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_async_db.py --requests 2000 --concurrency 50 --query-delay 0.01
+"""
+
+import argparse
+import asyncio
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import db_manager, get_async_db, get_db
+from app.models import Ingredient
+from common import Timer, print_header, print_result, summarize
+
+
+def build_app(query_delay: float, limit: int) -> FastAPI:
+    """Build an app exposing the same catalog query through both session types."""
+    app = FastAPI()
+
+    def catalog_query():
+        stmt = select(Ingredient).order_by(Ingredient.name).limit(limit)
+        if query_delay:
+            # Simulate a slow query by running pg_sleep in the same statement
+            stmt = stmt.where(func.pg_sleep(query_delay).is_not(None))
+        return stmt
+
+    @app.get("/sync")
+    async def sync_in_async(db: Session = Depends(get_db)):
+        return [row.name for row in db.execute(catalog_query()).scalars()]
+
+    @app.get("/async")
+    async def fully_async(db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(catalog_query())
+        return [row.name for row in result.scalars()]
+
+    return app
+
+
+async def run_load(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            loop = asyncio.get_running_loop()
+            while not queue.empty():
+                queue.get_nowait()
+                start = loop.time()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(loop.time() - start)
+
+        # Warm up both connection pools before measuring
+        await client.get(path)
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, timer.elapsed)
+
+
+async def main_async(args):
+    app = build_app(args.query_delay, args.limit)
+
+    print_header("SmartKitchen Benchmark - sync Session vs AsyncSession")
+    print(f"  requests={args.requests} concurrency={args.concurrency} "
+          f"query_delay={args.query_delay}s limit={args.limit}\n")
+
+    for label, path in (("sync-in-async", "/sync"), ("async", "/async")):
+        result = await run_load(app, path, args.requests, args.concurrency)
+        print_result(label, result)
+
+    await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-delay", type=float, default=0.005,
+                        help="Seconds of pg_sleep added to each query")
+    parser.add_argument("--limit", type=int, default=50,
+                        help="Ingredients returned per request")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
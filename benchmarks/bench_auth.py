@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Auth benchmark: per-request overhead of the session dependency.
+
+Seeds a throwaway user with a session, then requests GET / (no auth) and
+GET /auth/me with the session cache enabled and disabled (every request
+reads user_sessions), and reports latency plus the overhead over the
+unauthenticated baseline. The user is deleted afterwards. Requires a
+reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_auth.py --requests 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, db_manager
+from app.main import app
+from app.models import User
+from app.services.sessions import session_store
+from common import Timer, percentile, print_header, print_result, summarize
+
+
+async def seed():
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="")
+        db.add(user)
+        await db.commit()
+        token, _ = await session_store.create(db, user)
+        return user.id, token
+
+
+async def run(client, path, headers, requests, concurrency):
+    latencies = []
+    remaining = iter(range(requests))
+    loop = asyncio.get_running_loop()
+
+    async def worker():
+        for _ in remaining:
+            start = loop.time()
+            response = await client.get(path, headers=headers)
+            latencies.append(loop.time() - start)
+            assert response.status_code == 200, response.text
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, timer.elapsed
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - session validation")
+    print(f"  requests={args.requests} concurrency={args.concurrency}\n")
+
+    user_id, token = await seed()
+    headers = {"Authorization": f"Bearer {token}"}
+    cache_ttl = session_store.cache.ttl
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            baseline, elapsed = await run(client, "/", {}, args.requests, args.concurrency)
+            print_result("no auth", summarize(baseline, elapsed))
+
+            for label, ttl in (("session, uncached", 0.0), ("session, cached", cache_ttl)):
+                session_store.cache.ttl = ttl
+                session_store.cache.clear()
+                latencies, elapsed = await run(client, "/auth/me", headers, args.requests, args.concurrency)
+                result = summarize(latencies, elapsed)
+                result["overhead_p50_ms"] = round((percentile(latencies, 50) - percentile(baseline, 50)) * 1000, 3)
+                print_result(label, result)
+    finally:
+        session_store.cache.ttl = cache_ttl
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Email outbox benchmark: request-path cost and background delivery rate.
+
+Starts a local SMTP sink (see smtp_sink.py) with a per-message delay, then
+measures what a login request pays to send a magic link inline over a new
+SMTP connection versus enqueueing it in the outbox, and how fast the
+outbox workers drain the queued messages over reused connections.
+Benchmark messages are deleted afterwards. Requires a reachable
+PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_email_outbox.py --messages 2000 --workers 4 --smtp-delay 0.02
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import EmailOutbox
+from app.services.email_outbox import EmailOutboxWorker
+from app.services.email_service import SMTPEmailService
+from common import Timer, print_header, print_result, summarize
+
+# smtp_sink.py lives in the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from smtp_sink import SMTPSink  # noqa: E402
+
+KIND = "benchmark"
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - email outbox")
+    print(f"  messages={args.messages} workers={args.workers} batch={args.batch} "
+          f"smtp_delay={args.smtp_delay}s fail_rate={args.fail_rate}\n")
+
+    sink = SMTPSink(port=0, delay=args.smtp_delay, fail_rate=args.fail_rate)
+    await sink.start()
+
+    def sender():
+        return SMTPEmailService("127.0.0.1", sink.port, starttls=False)
+
+    try:
+        # What the request paid before: connect, send and quit inline
+        latencies = []
+        with Timer() as total:
+            for i in range(args.inline):
+                smtp = sender()
+                with Timer() as timer:
+                    try:
+                        await asyncio.to_thread(smtp.send_message, f"inline{i}@bench.example.com", "Bench", "Body")
+                    except Exception:
+                        pass
+                    await asyncio.to_thread(smtp.close)
+                latencies.append(timer.elapsed)
+        print_result("inline smtp send", summarize(latencies, total.elapsed))
+
+        # What the request pays now: one outbox INSERT
+        outbox = EmailOutboxWorker(workers=args.workers, batch_size=args.batch, poll_interval=0.2,
+                                   max_attempts=3, backoff_base=0.1, sender_factory=sender)
+        latencies = []
+        with Timer() as total:
+            async with AsyncSessionLocal() as db:
+                for i in range(args.messages):
+                    with Timer() as timer:
+                        await outbox.enqueue(db, f"user{i}@bench.example.com", "Bench", "Body", kind=KIND)
+                    latencies.append(timer.elapsed)
+        print_result("outbox enqueue", summarize(latencies, total.elapsed))
+
+        # Background delivery
+        connections_before = sink.connections
+        with Timer() as drain:
+            await outbox.start()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + args.timeout
+            while outbox.sent + outbox.failed < args.messages and loop.time() < deadline:
+                await asyncio.sleep(0.05)
+            await outbox.stop()
+
+        stats = outbox.stats()
+        print_result("outbox drain", {
+            "sent": stats["sent"],
+            "per_sec": round(stats["sent"] / drain.elapsed, 1),
+            "retried": stats["retried"],
+            "failed": stats["failed"],
+            "batches": stats["batches"],
+            "smtp_connections": sink.connections - connections_before,
+            "avg_delivery_s": stats["avg_delivery_seconds"],
+        })
+    finally:
+        await sink.stop()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(EmailOutbox).where(EmailOutbox.kind == KIND))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--inline", type=int, default=200, help="Inline sends for the baseline")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--smtp-delay", type=float, default=0.02, help="Sink delay per message (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of deferred messages")
+    parser.add_argument("--timeout", type=float, default=300)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
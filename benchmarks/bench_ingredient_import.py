@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Bulk import benchmark: batched ON CONFLICT upserts vs one commit per row.
+
+Generates synthetic ingredients under a unique name prefix, imports them
+twice (insert pass, then update pass) and removes them afterwards.
+Requires a reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_ingredient_import.py --rows 100000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import json
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, select
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import Ingredient
+from app.services.ingredient_import import import_ingredients
+from common import Timer, print_header, print_result
+
+
+async def synthetic_lines(prefix: str, rows: int, calories: float):
+    for i in range(rows):
+        yield json.dumps({
+            "name": f"{prefix}-{i:08d}",
+            "category": f"category-{i % 25}",
+            "unit": "g",
+            "calories_per_unit": calories + i % 100,
+            "additional_data": {"source": "benchmark"},
+        })
+
+
+async def row_at_a_time(prefix: str, rows: int):
+    """The pre-bulk path: SELECT for duplicates, INSERT, commit, refresh per row"""
+    async with AsyncSessionLocal() as db:
+        for i in range(rows):
+            name = f"{prefix}-{i:08d}"
+            await db.execute(select(Ingredient).where(Ingredient.name == name))
+            ingredient = Ingredient(name=name, category="baseline", unit="g",
+                                    calories_per_unit=1.0, additional_data={})
+            db.add(ingredient)
+            await db.commit()
+            await db.refresh(ingredient)
+
+
+async def cleanup(prefix: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Ingredient).where(Ingredient.name.like(f"{prefix}-%")))
+        await db.commit()
+
+
+async def main_async(args):
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+
+    print_header("SmartKitchen Benchmark - bulk ingredient import")
+    print(f"  rows={args.rows} batch_size={args.batch_size}\n")
+
+    try:
+        for label, calories in (("bulk insert", 1.0), ("bulk update", 2.0)):
+            async with AsyncSessionLocal() as db:
+                with Timer() as timer:
+                    result = await import_ingredients(
+                        db, synthetic_lines(prefix, args.rows, calories), "ndjson", args.batch_size
+                    )
+            print_result(label, {
+                "inserted": result.inserted,
+                "updated": result.updated,
+                "failed": result.failed,
+                "seconds": round(timer.elapsed, 2),
+                "rows_per_min": round(args.rows / timer.elapsed * 60),
+            })
+
+        if args.baseline_rows:
+            baseline_prefix = f"{prefix}-baseline"
+            with Timer() as timer:
+                await row_at_a_time(baseline_prefix, args.baseline_rows)
+            print_result("row-at-a-time", {
+                "rows": args.baseline_rows,
+                "seconds": round(timer.elapsed, 2),
+                "rows_per_min": round(args.baseline_rows / timer.elapsed * 60),
+            })
+    finally:
+        await cleanup(prefix)
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--baseline-rows", type=int, default=2000,
+                        help="Rows for the one-row-per-request baseline (0 to skip)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
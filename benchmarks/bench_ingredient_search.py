@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: keystroke-rate autocomplete latency on a large catalog.
+
+Seeds synthetic ingredient names under a unique prefix (unless --no-seed),
+replays every keystroke of a set of typed (and mistyped) queries through
+search_ingredients and reports latency percentiles. Seeded rows are removed
+afterwards. Requires a reachable PostgreSQL at DATABASE_URL with pg_trgm.
+
+Usage:
+    python benchmarks/bench_ingredient_search.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, text
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import Ingredient
+from app.services.ingredient_import import import_ingredients
+from app.services.ingredient_search import search_ingredients
+from common import Timer, print_header, print_result, summarize
+
+WORDS = [
+    "tomato", "basil", "garlic", "onion", "pepper", "salt", "butter", "cream",
+    "cheese", "chicken", "beef", "pork", "rice", "flour", "sugar", "lemon",
+    "lime", "ginger", "cumin", "paprika", "oregano", "thyme", "carrot",
+    "potato", "spinach", "mushroom", "olive", "vinegar", "honey", "yogurt",
+]
+QUERIES = ["tomato", "tomatoe", "galric", "chick", "mushrom", "paprika", "chese", "ol"]
+
+
+async def synthetic_lines(prefix: str, rows: int):
+    combos = itertools.cycle(itertools.permutations(WORDS, 3))
+    for i in range(rows):
+        words = " ".join(next(combos))
+        yield json.dumps({"name": f"{words} {prefix}{i}", "category": "benchmark"})
+
+
+async def main_async(args):
+    prefix = f"bench{uuid.uuid4().hex[:6]}"
+    rng = random.Random(42)
+
+    print_header("SmartKitchen Benchmark - ingredient search")
+
+    try:
+        if args.rows:
+            async with AsyncSessionLocal() as db:
+                with Timer() as timer:
+                    await import_ingredients(db, synthetic_lines(prefix, args.rows), "ndjson", 2000)
+                await db.execute(text("ANALYZE ingredients"))
+                await db.commit()
+            print(f"  seeded {args.rows} names in {timer.elapsed:.1f}s\n")
+
+        latencies = []
+        async with AsyncSessionLocal() as db:
+            for _ in range(args.repeat):
+                query = rng.choice(QUERIES)
+                # Replay each keystroke, like an autocomplete input would
+                for end in range(1, len(query) + 1):
+                    with Timer() as timer:
+                        await search_ingredients(db, query[:end], limit=args.limit)
+                    latencies.append(timer.elapsed)
+
+        print_result("search", summarize(latencies, sum(latencies)))
+    finally:
+        if args.rows:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(Ingredient).where(Ingredient.name.like(f"% {prefix}%")))
+                await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=100000,
+                        help="Synthetic names to seed (0 to use the existing catalog)")
+    parser.add_argument("--repeat", type=int, default=200, help="Queries to type")
+    parser.add_argument("--limit", type=int, default=10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
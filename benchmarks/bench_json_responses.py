@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+JSON response benchmark: Pydantic listing responses vs the orjson fast path.
+
+Serves synthetic recipe and ingredient listing pages through FastAPI the
+way the routers do: per-row RecipeResponse models (or IngredientPage dumps
+with the json-based ETag) validated against the response_model, versus
+column rows turned into dicts and rendered by orjson (FAST_JSON_RESPONSES).
+Reports milliseconds per page of --rows rows and the speedup. Row fetching
+is not included, so no database is needed.
+
+Usage:
+    python benchmarks/bench_json_responses.py --rows 10000 --requests 20
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from app.models import Recipe, RecipeDifficulty
+from app.responses import FastJSONResponse, dumps, row_to_dict
+from app.routers.ingredients import INGREDIENT_FIELDS, _body_etag, _compute_etag
+from app.routers.recipes import RECIPE_COLUMNS, _ingredient_item
+from app.schemas.ingredients import IngredientPage
+from app.schemas.recipes import RecipePage, RecipeResponse
+from common import Timer, print_header, print_result
+
+UNITS = ["g", "ml", "pcs", "tbsp"]
+
+
+def make_rows(keys, values):
+    """Row tuples as a Result would return them"""
+    return IteratorResult(SimpleResultMetaData(keys), iter(values)).all()
+
+
+def recipe_values(count):
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        yield {
+            "name": f"recipe {i:06d}",
+            "description": "A synthetic recipe for benchmarking",
+            "difficulty": random.choice(list(RecipeDifficulty)),
+            "prep_time": random.randint(5, 60),
+            "cook_time": random.randint(5, 120),
+            "servings": random.randint(1, 8),
+            "ingredients": [
+                {"name": f"ingredient {random.randint(0, 999)}", "amount": random.randint(1, 500),
+                 "unit": random.choice(UNITS)}
+                for _ in range(8)
+            ],
+            "instructions": [{"step": step, "text": "Stir well"} for step in range(1, 6)],
+            "nutrition_info": {"calories": random.randint(100, 900)},
+            "tags": ["dinner", "quick"],
+            "is_public": True,
+            "image_url": None,
+            "id": uuid.uuid4(),
+            "user_id": uuid.uuid4(),
+            "created_at": now - timedelta(days=i),
+            "updated_at": now,
+        }
+
+
+def ingredient_values(count):
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        yield {
+            "name": f"ingredient {i:06d}",
+            "category": "pantry",
+            "unit": random.choice(UNITS),
+            "calories_per_unit": round(random.uniform(0, 9), 3),
+            "id": uuid.uuid4(),
+            "additional_data": {"nutrients": {"protein": 0.1}},
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def build_app(recipes, recipe_rows, ingredient_rows):
+    app = FastAPI()
+
+    @app.get("/recipes/pydantic", response_model=RecipePage)
+    async def recipes_pydantic():
+        return RecipePage(items=[RecipeResponse.model_validate(recipe) for recipe in recipes], next_cursor=None)
+
+    @app.get("/recipes/fast", response_model=RecipePage)
+    async def recipes_fast():
+        items = [row_to_dict(row) for row in recipe_rows]
+        for item in items:
+            item["ingredients"] = [_ingredient_item(entry) for entry in item["ingredients"]]
+        return FastJSONResponse({"items": items, "next_cursor": None})
+
+    @app.get("/ingredients/pydantic", response_model=IngredientPage)
+    async def ingredients_pydantic():
+        page = IngredientPage(items=[row_to_dict(row) for row in ingredient_rows]).model_dump(mode="json")
+        _compute_etag(page)
+        return page
+
+    @app.get("/ingredients/fast", response_model=IngredientPage)
+    async def ingredients_fast():
+        page = dumps({"items": [row_to_dict(row) for row in ingredient_rows], "next_cursor": None})
+        _body_etag(page)
+        return FastJSONResponse(page)
+
+    return app
+
+
+async def time_path(client, path, requests):
+    response = await client.get(path)
+    assert response.status_code == 200, response.text
+    with Timer() as timer:
+        for _ in range(requests):
+            response = await client.get(path)
+    return timer.elapsed / requests, response.json()
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - JSON list responses")
+    print(f"  rows={args.rows} requests={args.requests}\n")
+
+    recipe_dicts = list(recipe_values(args.rows))
+    keys = [column.key for column in RECIPE_COLUMNS]
+    recipe_rows = make_rows(keys, [tuple(recipe[key] for key in keys) for recipe in recipe_dicts])
+    recipes = [Recipe(**recipe) for recipe in recipe_dicts]
+    ingredient_dicts = list(ingredient_values(args.rows))
+    ingredient_rows = make_rows(INGREDIENT_FIELDS, [
+        tuple(ingredient[key] for key in INGREDIENT_FIELDS) for ingredient in ingredient_dicts
+    ])
+
+    app = build_app(recipes, recipe_rows, ingredient_rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for listing in ("recipes", "ingredients"):
+            slow, slow_body = await time_path(client, f"/{listing}/pydantic", args.requests)
+            fast, fast_body = await time_path(client, f"/{listing}/fast", args.requests)
+            assert slow_body == fast_body, f"{listing}: fast path output differs"
+            per_10k = 10000 / args.rows * 1000
+            print_result(f"{listing} pydantic", {"ms_per_page": round(slow * 1000, 1),
+                                                 "ms_per_10k_rows": round(slow * per_10k, 1)})
+            print_result(f"{listing} orjson", {"ms_per_page": round(fast * 1000, 1),
+                                               "ms_per_10k_rows": round(fast * per_10k, 1),
+                                               "speedup": round(slow / fast, 2)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per page")
+    parser.add_argument("--requests", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
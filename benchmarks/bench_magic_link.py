@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Magic link benchmark: exactly-once verification under concurrency.
+
+Seeds a throwaway user, issues magic links and fires several concurrent
+verifications of each token, each on its own connection. The atomic
+AuthService.verify_token must consume every token exactly once; the old
+SELECT / UPDATE / SELECT sequence is run the same way for comparison and
+usually lets duplicates through. Reports latency and per-token success
+counts, and exits non-zero if any token was not consumed exactly once by
+verify_token. The user is deleted afterwards. Requires a reachable
+PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_magic_link.py --tokens 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from collections import Counter
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, func, select
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import MagicLink, User
+from app.services.auth_service import AuthService
+from app.services.sessions import hash_token
+from common import Timer, print_header, print_result, summarize
+
+
+async def verify_three_step(db, token):
+    """Baseline: find the unused link, mark it used, then load the user"""
+    magic_link = (await db.execute(
+        select(MagicLink).where(
+            MagicLink.token_hash == hash_token(token),
+            MagicLink.is_used == False,
+            MagicLink.expires_at > func.now()
+        )
+    )).scalars().first()
+    if not magic_link:
+        return None
+
+    magic_link.is_used = True
+    await db.commit()
+    return (await db.execute(select(User).where(User.id == magic_link.user_id))).scalars().first()
+
+
+async def race(verify, email, tokens, concurrency):
+    """Issue `tokens` links and verify each one from `concurrency` sessions at once"""
+    latencies = []
+    successes = Counter()
+    loop = asyncio.get_running_loop()
+
+    async def attempt(token):
+        async with AsyncSessionLocal() as db:
+            start = loop.time()
+            user = await verify(db, token)
+            latencies.append(loop.time() - start)
+        if user is not None:
+            successes[token] += 1
+
+    with Timer() as timer:
+        for _ in range(tokens):
+            async with AsyncSessionLocal() as db:
+                token, _ = await AuthService.create_magic_link(db, email)
+            successes[token] += 0
+            await asyncio.gather(*(attempt(token) for _ in range(concurrency)))
+
+    return latencies, timer.elapsed, Counter(successes.values())
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - magic link verification")
+    print(f"  tokens={args.tokens} concurrency={args.concurrency}\n")
+
+    async with AsyncSessionLocal() as db:
+        user = await AuthService.create_or_get_user(db, f"bench-{uuid.uuid4().hex[:8]}@example.com")
+        user_id, email = user.id, user.email
+
+    exactly_once = True
+    try:
+        for label, verify in (
+            ("select/update/select", verify_three_step),
+            ("update returning", AuthService.verify_token),
+        ):
+            latencies, elapsed, consumed = await race(verify, email, args.tokens, args.concurrency)
+            result = summarize(latencies, elapsed)
+            result["tokens_by_successes"] = dict(sorted(consumed.items()))
+            print_result(label, result)
+
+            if verify is AuthService.verify_token:
+                exactly_once = set(consumed) == {1}
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+    print(f"\n  exactly-once consumption: {'OK' if exactly_once else 'VIOLATED'}")
+    if not exactly_once:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent verifications per token")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Metrics benchmark: per-request overhead of MetricsMiddleware and scrape cost.
+
+Serves a trivial endpoint with and without the metrics middleware and
+reports the latency difference, then times rendering /metrics with the
+series produced by the run. No database is needed.
+
+Usage:
+    python benchmarks/bench_metrics.py --requests 20000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from fastapi import FastAPI
+
+from app.metrics import registry
+from app.middleware import MetricsMiddleware
+from common import Timer, percentile, print_header, print_result, summarize
+
+
+def build_app(with_metrics: bool):
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: uuid.UUID):
+        return {"id": str(thing_id)}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def run(app, requests, concurrency):
+    latencies = []
+    remaining = iter(range(requests))
+    loop = asyncio.get_running_loop()
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            for _ in remaining:
+                start = loop.time()
+                response = await client.get(f"/things/{uuid.uuid4()}")
+                latencies.append(loop.time() - start)
+                assert response.status_code == 200, response.text
+
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, timer.elapsed
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - metrics")
+    print(f"  requests={args.requests} concurrency={args.concurrency}\n")
+
+    baseline, elapsed = await run(build_app(False), args.requests, args.concurrency)
+    print_result("no metrics", summarize(baseline, elapsed))
+
+    latencies, elapsed = await run(build_app(True), args.requests, args.concurrency)
+    result = summarize(latencies, elapsed)
+    result["overhead_p50_ms"] = round((percentile(latencies, 50) - percentile(baseline, 50)) * 1000, 3)
+    print_result("metrics middleware", result)
+
+    with Timer() as timer:
+        for _ in range(args.scrapes):
+            body = registry.render()
+    print_result("render /metrics", {
+        "lines": body.count("\n"),
+        "ms_per_scrape": round(timer.elapsed / args.scrapes * 1000, 3),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scrapes", type=int, default=200)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
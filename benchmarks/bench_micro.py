@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks: auth helpers, schema serialization and query construction.
+
+Times the CPU-bound building blocks behind the hot endpoints in isolation:
+token generation and hashing, magic link rendering and cached session
+validation; Pydantic and orjson serialization of recipes, ingredients and
+users; building and compiling the listing, search and auth statements for
+PostgreSQL. With --db, AuthService calls are also timed against
+DATABASE_URL using a throwaway user that is deleted afterwards.
+
+Usage:
+    python benchmarks/bench_micro.py --min-time 0.2
+    python benchmarks/bench_micro.py --db
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, func, not_, select, update
+from sqlalchemy.dialects import postgresql
+
+from app.models import Ingredient, MagicLink, Recipe, RecipeDifficulty, User, UserRole
+from app.responses import dumps
+from app.routers.ingredients import _listing_query, _serialize_ingredient
+from app.routers.recipes import RECIPE_COLUMNS
+from app.schemas.recipes import RecipePage, RecipeResponse
+from app.services.auth_service import AuthService
+from app.services.email_service import render_magic_link_email
+from app.services.ingredient_search import build_search_query
+from app.services.sessions import SessionStore, hash_token, user_response
+from common import measure, measure_async, print_header, print_result
+
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def sample_user():
+    now = datetime.now(timezone.utc)
+    return User(id=uuid.uuid4(), email="cook@example.com", username="cook", password_hash="",
+                full_name="Home Cook", role=UserRole.USER, is_active=True, created_at=now, updated_at=now)
+
+
+def sample_recipe():
+    now = datetime.now(timezone.utc)
+    return Recipe(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), name="Tomato soup", description="Simple and quick",
+        difficulty=RecipeDifficulty.MEDIUM, prep_time=10, cook_time=25, servings=4,
+        ingredients=[{"name": f"ingredient {i}", "amount": i + 1, "unit": "g"} for i in range(10)],
+        instructions=[{"step": i, "text": "Stir"} for i in range(6)], nutrition_info={"calories": 320},
+        tags=["soup", "vegetarian"], is_public=True, image_url=None, created_at=now, updated_at=now,
+    )
+
+
+def sample_ingredient():
+    now = datetime.now(timezone.utc)
+    return Ingredient(id=uuid.uuid4(), name="tomato", category="vegetables", unit="g", calories_per_unit=0.18,
+                      additional_data={"nutrients": {"protein": 0.009}}, created_at=now, updated_at=now)
+
+
+def compiled(stmt):
+    return stmt.compile(dialect=DIALECT)
+
+
+def run_auth(min_time):
+    user = sample_user()
+    token = AuthService.generate_token()
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
+    store = SessionStore(session_ttl=timedelta(days=1), cache_ttl=60)
+    store.cache.set(hash_token(token), (expires_at, user_response(user)))
+
+    print_result("generate_token", measure(AuthService.generate_token, min_time))
+    print_result("hash_token", measure(lambda: hash_token(token), min_time))
+    print_result("render_magic_link_email", measure(lambda: render_magic_link_email(token, expires_at), min_time))
+    print_result("user_response", measure(lambda: user_response(user), min_time))
+    print_result("session validate cached", asyncio.run(measure_async(lambda: store.validate(token), min_time)))
+
+
+def run_serialization(min_time):
+    recipe, ingredient, user = sample_recipe(), sample_ingredient(), sample_user()
+    recipe_model = RecipeResponse.model_validate(recipe)
+    recipe_dict = {column.key: getattr(recipe, column.key) for column in RECIPE_COLUMNS}
+    page = RecipePage(items=[recipe_model] * 100)
+
+    print_result("recipe model_validate", measure(lambda: RecipeResponse.model_validate(recipe), min_time))
+    print_result("recipe model_dump_json", measure(recipe_model.model_dump_json, min_time))
+    print_result("recipe orjson dict", measure(lambda: dumps(recipe_dict), min_time))
+    print_result("recipe page(100) json", measure(page.model_dump_json, min_time))
+    print_result("ingredient serialize", measure(lambda: _serialize_ingredient(ingredient), min_time))
+    print_result("user response json", measure(lambda: user_response(user).model_dump_json(), min_time))
+
+
+def run_queries(min_time):
+    token_hash = hash_token(AuthService.generate_token())
+    fields = {"id", "name", "unit"}
+
+    def verify_statement():
+        # As built by AuthService.verify_token
+        consumed = (
+            update(MagicLink)
+            .where(MagicLink.token_hash == token_hash, not_(MagicLink.is_used), MagicLink.expires_at > func.now())
+            .values(is_used=True)
+            .returning(MagicLink.user_id)
+            .cte("consumed")
+        )
+        return select(User).join(consumed, User.id == consumed.c.user_id)
+
+    print_result("ingredient listing build", measure(lambda: _listing_query(None, "vegetables", None), min_time))
+    print_result("ingredient listing compile", measure(
+        lambda: compiled(_listing_query(fields, "vegetables", None).limit(51)), min_time
+    ))
+    print_result("search query build", measure(lambda: build_search_query("tomat", 10), min_time))
+    print_result("search query compile", measure(lambda: compiled(build_search_query("tomat", 10)), min_time))
+    print_result("recipe listing compile", measure(
+        lambda: compiled(select(*RECIPE_COLUMNS).where(Recipe.tags.contains(["soup"]))
+                         .order_by(Recipe.name, Recipe.id).limit(51)), min_time
+    ))
+    print_result("verify token compile", measure(lambda: compiled(verify_statement()), min_time))
+
+
+async def run_db(min_time):
+    from app.database import AsyncSessionLocal, db_manager
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await AuthService.create_or_get_user(db, email=email)
+
+            async def create_link():
+                await AuthService.create_magic_link(db, email)
+
+            async def create_and_verify():
+                token, _ = await AuthService.create_magic_link(db, email)
+                await AuthService.verify_token(db, token)
+
+            async def lookup_user():
+                await AuthService.create_or_get_user(db, email=email)
+
+            async def username_scan():
+                await AuthService.next_username(db, user.username)
+
+            print_result("db create_magic_link", await measure_async(create_link, min_time))
+            print_result("db create+verify token", await measure_async(create_and_verify, min_time))
+            print_result("db create_or_get_user hit", await measure_async(lookup_user, min_time))
+            print_result("db next_username", await measure_async(username_scan, min_time))
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.email == email))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed loop")
+    parser.add_argument("--db", action="store_true", help="Also time AuthService calls against DATABASE_URL")
+    args = parser.parse_args()
+
+    print_header("SmartKitchen Benchmark - micro")
+    print("\n  auth")
+    run_auth(args.min_time)
+    print("\n  serialization")
+    run_serialization(args.min_time)
+    print("\n  query construction")
+    run_queries(args.min_time)
+    if args.db:
+        print("\n  auth service (database)")
+        asyncio.run(run_db(args.min_time))
+
+
+if __name__ == "__main__":
+    main()
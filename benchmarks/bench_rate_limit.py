@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Rate limiter benchmark: cost per check and accuracy under concurrency.
+
+Measures a limiter check with the in-memory backend and with the shared
+PostgreSQL backend, then fires concurrent checks for one key at the shared
+backend and verifies that exactly `limit` of them are allowed. Benchmark
+keys are deleted afterwards. Requires a reachable PostgreSQL at
+DATABASE_URL for the shared backend.
+
+Usage:
+    python benchmarks/bench_rate_limit.py --checks 100000 --db-checks 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import RateLimitBucket
+from app.services.rate_limit import MemoryRateLimitBackend, PostgresRateLimitBackend, RateLimiter
+from common import Timer, print_header, print_result, summarize
+
+PREFIX = "bench"
+
+
+async def run_checks(limiter, keys, checks, concurrency):
+    latencies = []
+    remaining = iter(range(checks))
+    loop = asyncio.get_running_loop()
+
+    async def worker():
+        for i in remaining:
+            start = loop.time()
+            await limiter.hit(keys[i % len(keys)])
+            latencies.append(loop.time() - start)
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, timer.elapsed
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - rate limiting")
+    print(f"  checks={args.checks} db_checks={args.db_checks} keys={args.keys} "
+          f"concurrency={args.concurrency}\n")
+
+    keys = [f"203.0.113.{i % 250}-{i}" for i in range(args.keys)]
+
+    memory = MemoryRateLimitBackend()
+    limiter = RateLimiter(f"{PREFIX}_memory", 10, 60, backend=memory)
+    with Timer() as timer:
+        for i in range(args.checks):
+            memory.hit_sync(f"{limiter.name}:{keys[i % len(keys)]}", limiter.interval, limiter.window)
+    print_result("memory hit_sync", {
+        "checks": args.checks,
+        "us_per_check": round(timer.elapsed / args.checks * 1e6, 3),
+    })
+
+    latencies, elapsed = await run_checks(limiter, keys, args.checks, 1)
+    print_result("memory RateLimiter.hit", summarize(latencies, elapsed))
+
+    shared = PostgresRateLimitBackend()
+    ok = True
+    try:
+        limiter = RateLimiter(f"{PREFIX}_pg", 10, 60, backend=shared)
+        latencies, elapsed = await run_checks(limiter, keys, args.db_checks, args.concurrency)
+        print_result("postgres RateLimiter.hit", summarize(latencies, elapsed))
+
+        # Concurrent checks on one key must allow exactly `limit` requests
+        burst = RateLimiter(f"{PREFIX}_burst", args.limit, 3600, backend=shared)
+        key = uuid.uuid4().hex
+        results = await asyncio.gather(*(burst.hit(key) for _ in range(args.limit * 5)))
+        allowed = sum(1 for retry_after in results if retry_after == 0)
+        ok = allowed == args.limit and shared.errors == 0
+        print_result("postgres burst", {
+            "requests": len(results),
+            "limit": args.limit,
+            "allowed": allowed,
+            "errors": shared.errors,
+            "ok": ok,
+        })
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RateLimitBucket).where(RateLimitBucket.key.like(f"{PREFIX}\\_%")))
+            await db.commit()
+        await db_manager.dispose()
+
+    if not ok:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--checks", type=int, default=100000)
+    parser.add_argument("--db-checks", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10, help="Limit for the concurrent burst")
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shopping list benchmark: single joined query vs per-entry recipe loads.
+
+Seeds a throwaway user with 100 recipes and a 4-week meal plan, then
+generates the consolidated shopping list repeatedly with
+ShoppingListService and with an N+1 loader (one SELECT per scheduled
+recipe) for comparison. The user and everything it owns is deleted
+afterwards. Requires a reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_shopping_list.py --recipes 100 --repeat 50
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, select
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import MealPlan, MealPlanRecipe, Recipe, User
+from app.services.shopping_list_service import ShoppingListService
+from common import Timer, print_header, print_result, summarize
+
+PANTRY = [
+    ("flour", "g"), ("sugar", "g"), ("butter", "g"), ("milk", "ml"), ("egg", None),
+    ("olive oil", "tbsp"), ("garlic", None), ("onion", None), ("tomato", "g"),
+    ("rice", "kg"), ("chicken", "g"), ("cream", "cup"), ("salt", "tsp"),
+    ("pepper", "tsp"), ("basil", "g"), ("lemon", None), ("pasta", "g"), ("cheese", "oz"),
+]
+
+
+async def seed(recipes: int, days: int):
+    rng = random.Random(7)
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="")
+        db.add(user)
+        await db.flush()
+
+        recipe_rows = [
+            Recipe(user_id=user.id, name=f"Benchmark recipe {i}", servings=4,
+                   ingredients=[{"name": name, "amount": rng.randint(1, 400), "unit": unit}
+                                for name, unit in rng.sample(PANTRY, 12)],
+                   instructions=[])
+            for i in range(recipes)
+        ]
+        db.add_all(recipe_rows)
+
+        meal_plan = MealPlan(user_id=user.id, name="Benchmark plan",
+                             start_date=start, end_date=start + timedelta(days=days))
+        db.add(meal_plan)
+        await db.flush()
+
+        db.add_all([
+            MealPlanRecipe(meal_plan_id=meal_plan.id, recipe_id=recipe.id,
+                           scheduled_date=start + timedelta(hours=i * days * 24 // recipes))
+            for i, recipe in enumerate(recipe_rows)
+        ])
+        await db.commit()
+        return user.id, meal_plan.id
+
+
+async def generate_n_plus_one(db, meal_plan_id):
+    """Baseline: load the schedule, then each scheduled recipe separately"""
+    meal_plan = await db.get(MealPlan, meal_plan_id)
+    entries = (await db.execute(
+        select(MealPlanRecipe).where(MealPlanRecipe.meal_plan_id == meal_plan_id)
+    )).scalars().all()
+    ingredient_lists = []
+    for entry in entries:
+        recipe = (await db.execute(select(Recipe).where(Recipe.id == entry.recipe_id))).scalars().first()
+        ingredient_lists.append(recipe.ingredients)
+    return meal_plan, ShoppingListService.aggregate(ingredient_lists)
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - meal plan shopping list")
+    print(f"  recipes={args.recipes} days={args.days} repeat={args.repeat}\n")
+
+    user_id, meal_plan_id = await seed(args.recipes, args.days)
+    try:
+        for label, generate in (
+            ("n+1 loads", lambda db: generate_n_plus_one(db, meal_plan_id)),
+            ("single query", lambda db: ShoppingListService.generate_for_meal_plan(db, meal_plan_id)),
+        ):
+            latencies = []
+            async with AsyncSessionLocal() as db:
+                for _ in range(args.repeat):
+                    with Timer() as timer:
+                        await generate(db)
+                    latencies.append(timer.elapsed)
+            print_result(label, summarize(latencies, sum(latencies)))
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--recipes", type=int, default=100)
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
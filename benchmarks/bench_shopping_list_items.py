@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shopping list item benchmark: in-place jsonb_set updates vs ORM document rewrites.
+
+Seeds a throwaway user with one shopping list of --items items, then ticks
+off random items --updates times by loading the list through the ORM,
+replacing the items array and committing, and with
+ShoppingListService.update_item (one UPDATE ... jsonb_set). Reports latency,
+the JSON payload exchanged with the database per update and the WAL bytes
+written per update (pg_current_wal_insert_lsn, so keep other writers off the
+database while it runs). A concurrent run then has --clients clients tick
+disjoint sets of items at the same time and counts the ticks that were lost.
+The user and its list are deleted afterwards. Requires a reachable
+PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_shopping_list_items.py --items 200 --updates 500 --clients 4
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, text
+
+from app.database import AsyncSessionLocal, db_manager
+from app.models import ShoppingList, User
+from app.services.seeding import CATEGORY_UNITS, FOODS, QUALIFIERS
+from app.services.shopping_list_service import ShoppingListService
+from common import Timer, print_header, print_result, summarize
+
+WAL_LSN = text("SELECT CAST(pg_current_wal_insert_lsn() AS text)")
+WAL_DIFF = text("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), CAST(:start AS pg_lsn))")
+
+
+def make_items(count: int):
+    rng = random.Random(7)
+    items = []
+    for i in range(count):
+        category = rng.choice(list(FOODS))
+        items.append({"id": uuid.uuid4().hex, "name": f"{rng.choice(QUALIFIERS)} {rng.choice(FOODS[category])} {i}",
+                      "amount": rng.randint(1, 500), "unit": rng.choice(CATEGORY_UNITS[category]), "checked": False})
+    return items
+
+
+async def seed(items: int):
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="")
+        db.add(user)
+        await db.flush()
+        shopping_list = ShoppingList(user_id=user.id, name="Benchmark list", items=make_items(items))
+        db.add(shopping_list)
+        await db.commit()
+        return user.id, shopping_list.id, [item["id"] for item in shopping_list.items]
+
+
+async def tick_orm(db, list_id, item_id, checked):
+    """Baseline: read the whole document, change one item, write it all back"""
+    shopping_list = await db.get(ShoppingList, list_id, populate_existing=True)
+    items = [dict(item) for item in shopping_list.items]
+    for item in items:
+        if item["id"] == item_id:
+            item["checked"] = checked
+    shopping_list.items = items
+    await db.commit()
+    # Document read plus document written
+    return 2 * len(json.dumps(items))
+
+
+async def tick_jsonb_set(db, list_id, item_id, checked):
+    changes = {"checked": checked}
+    _, _, item = await ShoppingListService.update_item(db, list_id, item_id, changes)
+    # Patch sent plus item returned
+    return len(json.dumps(changes)) + len(json.dumps(item))
+
+
+async def reset(list_id):
+    async with AsyncSessionLocal() as db:
+        shopping_list = await db.get(ShoppingList, list_id)
+        shopping_list.items = [{**item, "checked": False} for item in shopping_list.items]
+        await db.commit()
+
+
+async def run_sequential(label, tick, list_id, item_ids, updates):
+    rng = random.Random(11)
+    latencies, payload = [], 0
+    async with AsyncSessionLocal() as db:
+        start = (await db.execute(WAL_LSN)).scalar()
+        await db.commit()
+        for _ in range(updates):
+            with Timer() as timer:
+                payload += await tick(db, list_id, rng.choice(item_ids), rng.random() < 0.5)
+            latencies.append(timer.elapsed)
+        wal = (await db.execute(WAL_DIFF, {"start": start})).scalar()
+        await db.commit()
+
+    row = summarize(latencies, sum(latencies))
+    row["payload_bytes_per_op"] = round(payload / updates)
+    row["wal_bytes_per_op"] = round(float(wal) / updates)
+    print_result(label, row)
+
+
+async def run_concurrent(label, tick, list_id, item_ids, clients):
+    await reset(list_id)
+    shares = [item_ids[i::clients] for i in range(clients)]
+
+    async def client(share):
+        async with AsyncSessionLocal() as db:
+            for item_id in share:
+                await tick(db, list_id, item_id, True)
+
+    with Timer() as timer:
+        await asyncio.gather(*(client(share) for share in shares))
+
+    async with AsyncSessionLocal() as db:
+        items = (await db.get(ShoppingList, list_id)).items
+    lost = sum(1 for item in items if not item["checked"])
+    print_result(label, {"ticks": len(item_ids), "lost": lost, "seconds": round(timer.elapsed, 2)})
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - shopping list item updates")
+    print(f"  items={args.items} updates={args.updates} clients={args.clients}\n")
+
+    user_id, list_id, item_ids = await seed(args.items)
+    try:
+        for label, tick in (("orm rewrite", tick_orm), ("jsonb_set", tick_jsonb_set)):
+            await run_sequential(label, tick, list_id, item_ids, args.updates)
+        for label, tick in (("orm rewrite concurrent", tick_orm), ("jsonb_set concurrent", tick_jsonb_set)):
+            await run_concurrent(label, tick, list_id, item_ids, args.clients)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=200, help="Items on the list")
+    parser.add_argument("--updates", type=int, default=500, help="Sequential updates per method")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients for the lost update check")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
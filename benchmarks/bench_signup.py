@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Signup benchmark: username allocation for users sharing an email prefix.
+
+Signs up users whose emails all share the same local part (so they all
+want the same username) with the old one-SELECT-per-candidate probing and
+with AuthService.create_or_get_user, then runs a concurrent burst to check
+that racing signups all succeed with distinct usernames. Reports latency
+and SQL statements per signup. All created users are deleted afterwards.
+Requires a reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_signup.py --users 10000 --legacy-users 500
+"""
+
+import argparse
+import asyncio
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from sqlalchemy import delete, event, func, select
+
+from app.database import AsyncSessionLocal, async_engine, db_manager
+from app.models import User
+from app.services.auth_service import AuthService
+from common import Timer, print_header, print_result, summarize
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self)
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+async def signup_probing(db, email):
+    """Baseline: probe username, username1, username2, ... one SELECT each"""
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if user:
+        return user
+
+    username = base_username = email.split('@')[0]
+    counter = 1
+    while (await db.execute(select(User.id).where(User.username == username))).first():
+        username = f"{base_username}{counter}"
+        counter += 1
+
+    user = User(email=email, username=username, password_hash="", full_name=username, is_active=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def run(signup, emails, concurrency, counter):
+    latencies = []
+    remaining = iter(emails)
+    loop = asyncio.get_running_loop()
+    start_count = counter.count
+
+    async def worker():
+        async with AsyncSessionLocal() as db:
+            for email in remaining:
+                start = loop.time()
+                await signup(db, email)
+                latencies.append(loop.time() - start)
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    result = summarize(latencies, timer.elapsed)
+    result["statements_per_signup"] = round((counter.count - start_count) / len(emails), 2)
+    return result
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - signup username allocation")
+    print(f"  users={args.users} legacy_users={args.legacy_users} "
+          f"burst={args.burst} concurrency={args.concurrency}\n")
+
+    run_id = uuid.uuid4().hex[:8]
+    domain = f"{run_id}.bench.example.com"
+    counter = StatementCounter()
+
+    def emails(label, count):
+        # Same local part everywhere: every signup wants the username "bench<run_id>"
+        return [f"bench{run_id}@{label}{i}.{domain}" for i in range(count)]
+
+    try:
+        if args.legacy_users:
+            result = await run(signup_probing, emails("legacy", args.legacy_users), 1, counter)
+            print_result("probing (legacy)", result)
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(User).where(User.email.like(f"%.{domain}")))
+                await db.commit()
+
+        result = await run(AuthService.create_or_get_user, emails("seq", args.users), 1, counter)
+        print_result("prefix scan + insert", result)
+
+        result = await run(AuthService.create_or_get_user, emails("burst", args.burst), args.concurrency, counter)
+        print_result("concurrent burst", result)
+
+        async with AsyncSessionLocal() as db:
+            total, distinct = (await db.execute(
+                select(func.count(), func.count(func.distinct(User.username)))
+                .where(User.email.like(f"%.{domain}"))
+            )).one()
+        expected = args.users + args.burst
+        status = "OK" if total == distinct == expected else "MISMATCH"
+        print(f"\n  users created: {total}/{expected}, distinct usernames: {distinct} -> {status}")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.email.like(f"%.{domain}")))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=10000, help="Sequential signups sharing one prefix")
+    parser.add_argument("--legacy-users", type=int, default=500,
+                        help="Signups for the probing baseline (quadratic, keep small; 0 to skip)")
+    parser.add_argument("--burst", type=int, default=1000, help="Concurrent signups after the sequential run")
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: app import time, time to first response and throughput.
+
+Measures importing app.main in fresh interpreters, then starts the API as a
+single uvicorn process and as gunicorn with uvicorn workers (preloaded and
+not), reporting the time until the first successful GET / and the request
+rate on GET / with all workers serving. GET / does not touch the database,
+so no PostgreSQL is required (background services log connection errors).
+
+Usage:
+    python benchmarks/bench_startup.py --imports 5 --workers 4 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+
+from common import Timer, print_header, print_result, summarize
+
+BACKEND = common.backend_path
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure_imports(runs):
+    """Seconds to import app.main, and whole interpreter runs, in fresh processes"""
+    imports, processes = [], []
+    for _ in range(runs):
+        with Timer() as timer:
+            output = subprocess.run(
+                [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND, check=True,
+                capture_output=True, text=True
+            ).stdout
+        imports.append(float(output.strip().splitlines()[-1]))
+        processes.append(timer.elapsed)
+    return imports, processes
+
+
+def start_server(command, port, env):
+    return subprocess.Popen(
+        command, cwd=BACKEND, env={**os.environ, **env, "PORT": str(port)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+
+def wait_until_serving(port, timeout=60.0):
+    """Seconds until GET / answers 200"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    raise RuntimeError(f"server on port {port} did not start within {timeout}s")
+
+
+async def load(port, requests, concurrency):
+    latencies = []
+    remaining = iter(range(requests))
+    loop = asyncio.get_running_loop()
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+        async def worker():
+            for _ in remaining:
+                start = loop.time()
+                response = await client.get("/")
+                latencies.append(loop.time() - start)
+                assert response.status_code == 200, response.text
+
+        with Timer() as timer:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, timer.elapsed
+
+
+def run_server(label, command, port, env, args):
+    process = start_server(command, port, env)
+    try:
+        first_response = wait_until_serving(port)
+        # Let the remaining workers finish booting before measuring throughput
+        time.sleep(args.settle)
+        latencies, elapsed = asyncio.run(load(port, args.requests, args.concurrency))
+        result = summarize(latencies, elapsed)
+        result["first_response_s"] = round(first_response, 3)
+        print_result(label, result)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--imports", type=int, default=5, help="Fresh-interpreter import runs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait for all workers")
+    args = parser.parse_args()
+
+    print_header("SmartKitchen Benchmark - startup and serving")
+    print(f"  workers={args.workers} requests={args.requests} concurrency={args.concurrency}\n")
+
+    imports, processes = measure_imports(args.imports)
+    print_result("import app.main", {
+        "runs": len(imports),
+        "median_ms": round(statistics.median(imports) * 1000, 1),
+        "min_ms": round(min(imports) * 1000, 1),
+        "process_median_ms": round(statistics.median(processes) * 1000, 1),
+    })
+
+    # Keep background services from adding noise
+    env = {"SCHEDULER_ENABLED": "false", "WEB_CONCURRENCY": str(args.workers), "PIDFILE": ""}
+    gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"]
+
+    run_server("uvicorn, 1 process", [
+        sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"
+    ], args.port, env, args)
+    run_server(f"gunicorn, {args.workers} preloaded", gunicorn, args.port + 1,
+               {**env, "GUNICORN_PRELOAD": "true"}, args)
+    run_server(f"gunicorn, {args.workers} no preload", gunicorn, args.port + 2,
+               {**env, "GUNICORN_PRELOAD": "false"}, args)
+
+
+if __name__ == "__main__":
+    main()
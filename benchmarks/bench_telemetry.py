@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Telemetry benchmark: sustained ingestion rate through the buffered pipeline.
+
+Seeds a throwaway user and appliance, then posts event batches to
+POST /telemetry/events from concurrent clients for a fixed duration and
+drains the buffer. Reports accepted and written events/sec, rejected
+(backpressure) events and request latency. Seeded rows are deleted
+afterwards. Requires a reachable PostgreSQL at DATABASE_URL.
+
+Usage:
+    python benchmarks/bench_telemetry.py --duration 30 --clients 20 --batch 500
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal, db_manager
+from app.main import app
+from app.models import Appliance, User
+from app.services.telemetry import telemetry_buffer
+from common import Timer, print_header, print_result, summarize
+
+
+async def seed():
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="")
+        db.add(user)
+        await db.flush()
+        appliance = Appliance(user_id=user.id, name="Benchmark oven", type="oven")
+        db.add(appliance)
+        await db.commit()
+        return user.id, appliance.id
+
+
+async def main_async(args):
+    print_header("SmartKitchen Benchmark - telemetry ingestion")
+    print(f"  duration={args.duration}s clients={args.clients} batch={args.batch}\n")
+
+    user_id, appliance_id = await seed()
+    rng = random.Random(1)
+    payload = {"events": [
+        {
+            "appliance_id": str(appliance_id),
+            "action": "heating",
+            "duration": 60,
+            "energy_used": round(rng.uniform(0.01, 0.2), 4),
+            "temperature": round(rng.uniform(150, 230), 1),
+            "metrics": {"fan_rpm": rng.randint(800, 1600)},
+        }
+        for _ in range(args.batch)
+    ]}
+
+    latencies = []
+    rejected_requests = 0
+    await telemetry_buffer.start()
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            loop = asyncio.get_running_loop()
+            stop_at = loop.time() + args.duration
+
+            async def device():
+                nonlocal rejected_requests
+                while loop.time() < stop_at:
+                    start = loop.time()
+                    response = await client.post("/telemetry/events", json=payload)
+                    latencies.append(loop.time() - start)
+                    if response.status_code == 503:
+                        rejected_requests += 1
+                        await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+
+            with Timer() as timer:
+                await asyncio.gather(*(device() for _ in range(args.clients)))
+                await telemetry_buffer.stop()
+
+        stats = telemetry_buffer.stats()
+        print_result("requests", summarize(latencies, timer.elapsed))
+        print_result("events", {
+            "accepted_per_sec": round(stats["accepted"] / timer.elapsed),
+            "written_per_sec": round(stats["written"] / timer.elapsed),
+            "rejected": stats["rejected"],
+            "rejected_requests": rejected_requests,
+            "batches": stats["batches"],
+        })
+    finally:
+        await telemetry_buffer.stop()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=500, help="Events per request")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Shared helpers for the SmartKitchen benchmark scripts.
+Importing this module puts the backend package on the Python path and
+loads environment variables, the same way init_db.py does.
+
+When BENCH_RESULTS_DIR is set, every row passed to print_result is also
+recorded and written to <BENCH_RESULTS_DIR>/<script>.json on exit (or
+<BENCH_RESULTS_NAME>.json), together with the git commit and command line
+(see run_suite.py and compare.py).
+"""
+
+import atexit
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of samples using nearest-rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarize request latencies (in seconds) into a result row.
+
+    Returns:
+        dict with request count, requests/sec and p50/p90/p99 latency in milliseconds
+    """
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_header(title: str):
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+def print_result(label: str, result: Dict[str, float]):
+    details = "  ".join(f"{key}={value}" for key, value in result.items())
+    print(f"  {label:<24} {details}")
+    record_result(label, result)
+
+
+RESULTS_DIR = os.getenv("BENCH_RESULTS_DIR")
+# label -> result row, in the order they were printed
+RESULTS: Dict[str, Dict[str, Any]] = {}
+
+
+def record_result(label: str, result: Dict[str, Any]):
+    """Keep a result row for the JSON results file (labels are made unique)"""
+    key, n = label.strip(), 2
+    while key in RESULTS:
+        key, n = f"{label.strip()} #{n}", n + 1
+    RESULTS[key] = dict(result)
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the working tree, with a -dirty suffix for uncommitted changes"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: Path, name: str):
+    """Write the recorded rows with enough context to compare runs"""
+    payload = {
+        "benchmark": name,
+        "commit": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "argv": sys.argv[1:],
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "results": RESULTS,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str) + "\n")
+
+
+def _save_on_exit():
+    if RESULTS:
+        name = os.getenv("BENCH_RESULTS_NAME") or Path(sys.argv[0]).stem
+        save_results(Path(RESULTS_DIR) / f"{name}.json", name)
+
+
+if RESULTS_DIR:
+    atexit.register(_save_on_exit)
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 3) -> Dict[str, float]:
+    """
+    Time a zero-argument callable: the loop count doubles until one run takes
+    `min_time`, and the best of `repeat` runs is reported.
+
+    Returns:
+        dict with calls per second and microseconds per call
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return {"ops_per_s": round(number / best, 1), "us_per_op": round(best / number * 1e6, 3)}
+
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], min_time: float = 0.2,
+                        repeat: int = 3) -> Dict[str, float]:
+    """measure() for a coroutine function, awaited sequentially"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        best = min(best, time.perf_counter() - started)
+    return {"ops_per_s": round(number / best, 1), "us_per_op": round(best / number * 1e6, 3)}
+
+
+class Timer:
+    """Context manager measuring wall-clock time in seconds."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare benchmark results: deltas between two runs saved as JSON.
+
+Takes two results directories (as written by run_suite.py) or two result
+files and prints, for every row and metric present in both, the old and
+new value and the change in percent. Throughput metrics (rps, ops_per_s,
+speedup) are better when higher; latencies and times (*_ms, *_s,
+us_per_op) and error rates are better when lower. Changes beyond
+--threshold percent are marked as regressions or improvements; other
+metrics (counts, sizes) are listed with --all only.
+
+Usage:
+    python benchmarks/compare.py bench-results/abc1234 bench-results/def5678
+    python benchmarks/compare.py old/loadgen.json new/loadgen.json --threshold 10 --fail
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+HIGHER_IS_BETTER = ("rps", "ops_per_s", "speedup")
+LOWER_IS_BETTER_SUFFIXES = ("_ms", "_s", "_us", "us_per_op", "error_rate")
+
+
+def direction(metric: str) -> Optional[int]:
+    """1 if a larger value is better, -1 if a smaller one is, None if neither"""
+    if metric in HIGHER_IS_BETTER or metric.endswith("_per_s"):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER_SUFFIXES):
+        return -1
+    return None
+
+
+def load(path: Path) -> Dict[str, dict]:
+    """benchmark name -> saved payload, for a results file or directory"""
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    runs = {}
+    for file in files:
+        payload = json.loads(file.read_text())
+        runs[payload.get("benchmark") or file.stem] = payload
+    return runs
+
+
+def compare(old: Dict[str, dict], new: Dict[str, dict], threshold: float, show_all: bool) -> int:
+    """Print the comparison table and return the number of regressions"""
+    regressions = improvements = 0
+    for benchmark in [name for name in new if name in old]:
+        old_run, new_run = old[benchmark], new[benchmark]
+        lines = []
+        for label, new_row in new_run["results"].items():
+            old_row = old_run["results"].get(label)
+            if old_row is None:
+                continue
+            for metric, new_value in new_row.items():
+                old_value = old_row.get(metric)
+                if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (old_value, new_value)):
+                    continue
+                better = direction(metric)
+                change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+                mark = ""
+                if better is not None and abs(change) > threshold:
+                    if change * better < 0:
+                        mark, regressions = "REGRESSION", regressions + 1
+                    else:
+                        mark, improvements = "improved", improvements + 1
+                if mark or show_all:
+                    lines.append(f"  {label:<32} {metric:<14} {old_value:>12} {new_value:>12} {change:>+8.1f}%  {mark}")
+
+        if lines:
+            print(f"\n{benchmark}  ({old_run.get('commit')} -> {new_run.get('commit')})")
+            if old_run.get("argv") != new_run.get("argv"):
+                print(f"  note: arguments differ: {old_run.get('argv')} vs {new_run.get('argv')}")
+            if old_run.get("cpus") != new_run.get("cpus"):
+                print(f"  note: cpu count differs: {old_run.get('cpus')} vs {new_run.get('cpus')}")
+            print("\n".join(lines))
+
+    missing = sorted(set(old) ^ set(new))
+    if missing:
+        print(f"\nOnly in one run: {', '.join(missing)}")
+    print(f"\n{regressions} regression(s), {improvements} improvement(s) beyond {threshold}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("old", type=Path, help="Baseline results directory or file")
+    parser.add_argument("new", type=Path, help="Results directory or file to compare")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Percent change to report")
+    parser.add_argument("--all", action="store_true", help="List every shared metric")
+    parser.add_argument("--fail", action="store_true", help="Exit with status 1 on any regression")
+    args = parser.parse_args()
+
+    regressions = compare(load(args.old), load(args.new), args.threshold, args.all)
+    if regressions and args.fail:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator: login bursts, catalog browsing and CRUD mixes.
+
+Seeds a throwaway catalog (ingredients with realistic names, categories and
+units, and recipes built from them), then runs each scenario with --users
+concurrent virtual users for --duration seconds after a short warm-up:
+
+- login:  all users start at once and loop POST /auth/magic-link, POST
+          /auth/verify (with a token minted in the database, as the real one
+          only goes out by email) and GET /auth/me
+- browse: ingredient pages following cursors (some revalidated with
+          If-None-Match), autocomplete searches, ingredient lookups, recipe
+          pages filtered by tag and recipe lookups
+- crud:   creating, reading, updating and deleting ingredients and recipes
+
+Latency percentiles and throughput are reported per scenario and per
+operation. By default the app runs in-process (lifespan included) with the
+auth rate limits raised; with --url the load goes to a running server, which
+needs RATE_LIMIT_TRUST_FORWARDED=true (each virtual user sends its own
+X-Forwarded-For) or raised limits for the login scenario. Everything seeded or
+created is deleted afterwards. Requires a reachable PostgreSQL at
+DATABASE_URL.
+
+Usage:
+    python benchmarks/loadgen.py --scenario all --users 50 --duration 30
+    python benchmarks/loadgen.py --url http://localhost:8000 --scenario browse
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import uuid
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+import httpx
+
+from app.services.seeding import CATEGORY_UNITS as UNITS, FOODS, QUALIFIERS, TAGS
+from common import print_header, print_result, summarize
+
+SCENARIOS = ("login", "browse", "crud")
+
+
+class Stats:
+    """Latencies and status codes per operation"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, op: str, seconds: float, status_code: int):
+        self.latencies[op].append(seconds)
+        self.statuses[op][status_code] += 1
+
+    def report(self, scenario: str, elapsed: float):
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        statuses = sum(self.statuses.values(), Counter())
+        print_result(scenario, self._row(everything, statuses, elapsed))
+        for op in sorted(self.latencies):
+            print_result(f"{scenario} {op}", self._row(self.latencies[op], self.statuses[op], elapsed))
+
+    @staticmethod
+    def _row(latencies, statuses, elapsed):
+        errors = sum(count for code, count in statuses.items() if not (200 <= code < 300 or code == 304))
+        row = summarize(latencies, elapsed)
+        row["errors"] = errors
+        row["error_rate"] = round(errors / len(latencies), 4) if latencies else 0.0
+        row.update((f"status_{code}", count) for code, count in sorted(statuses.items()) if code >= 400)
+        return row
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, catalog: dict):
+        self.client = client
+        self.stats = stats
+        self.catalog = catalog
+        address = ".".join(str(random.randint(1, 254)) for _ in range(3))
+        self.headers = {"X-Forwarded-For": f"10.{address}"}
+        self.loop = asyncio.get_running_loop()
+        # Ids created by this user in the crud scenario
+        self.ingredients = []
+        self.recipes = []
+
+    async def request(self, op: str, method: str, url: str, **kwargs) -> httpx.Response:
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        started = self.loop.time()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        self.stats.record(op, self.loop.time() - started, response.status_code)
+        return response
+
+    async def login(self):
+        from app.database import AsyncSessionLocal
+        from app.services.auth_service import AuthService
+
+        email = f"{self.catalog['tag']}-{uuid.uuid4().hex[:12]}@example.com"
+        response = await self.request("POST /auth/magic-link", "POST", "/auth/magic-link", json={"email": email})
+        if response.status_code != 200:
+            return
+
+        async with AsyncSessionLocal() as db:
+            token, _ = await AuthService.create_magic_link(db, email)
+        response = await self.request("POST /auth/verify", "POST", "/auth/verify", json={"token": token})
+        if response.status_code != 200:
+            return
+
+        session = {"Authorization": f"Bearer {response.json()['session_token']}"}
+        for _ in range(3):
+            await self.request("GET /auth/me", "GET", "/auth/me", headers=session)
+
+    async def browse(self):
+        choice = random.random()
+        if choice < 0.35:
+            params = {"limit": 50}
+            if random.random() < 0.5:
+                params["category"] = random.choice(list(FOODS))
+            for _ in range(random.randint(1, 5)):
+                response = await self.request("GET /ingredients", "GET", "/ingredients", params=params)
+                if response.status_code != 200:
+                    break
+                if random.random() < 0.3:
+                    # A client revalidating the page it already has (304)
+                    await self.request("GET /ingredients (If-None-Match)", "GET", "/ingredients", params=params,
+                                       headers={"If-None-Match": response.headers["ETag"]})
+                if not response.json()["next_cursor"]:
+                    break
+                params["cursor"] = response.json()["next_cursor"]
+        elif choice < 0.6:
+            term = random.choice(self.catalog["ingredient_names"])[:random.randint(3, 6)]
+            await self.request("GET /ingredients/search", "GET", "/ingredients/search", params={"q": term})
+        elif choice < 0.75:
+            await self.request("GET /ingredients/{id}", "GET",
+                               f"/ingredients/{random.choice(self.catalog['ingredient_ids'])}")
+        elif choice < 0.9:
+            params = {"limit": 20}
+            if random.random() < 0.7:
+                params["tag"] = random.choice(TAGS)
+            await self.request("GET /recipes", "GET", "/recipes", params=params)
+        else:
+            await self.request("GET /recipes/{id}", "GET", f"/recipes/{random.choice(self.catalog['recipe_ids'])}")
+
+    async def crud(self):
+        ingredients, recipes = self.ingredients, self.recipes
+        choice = random.random()
+        if choice < 0.2 or not ingredients:
+            category = random.choice(list(FOODS))
+            response = await self.request("POST /ingredients", "POST", "/ingredients", json={
+                "name": f"{random.choice(FOODS[category])} {self.catalog['tag']}-c{uuid.uuid4().hex[:10]}",
+                "category": category,
+                "unit": random.choice(UNITS[category]),
+                "calories_per_unit": round(random.uniform(0, 9), 2),
+            })
+            if response.status_code == 201:
+                ingredients.append(response.json()["id"])
+        elif choice < 0.45:
+            await self.request("GET /ingredients/{id}", "GET", f"/ingredients/{random.choice(ingredients)}")
+        elif choice < 0.7:
+            await self.request("PUT /ingredients/{id}", "PUT", f"/ingredients/{random.choice(ingredients)}",
+                               json={"calories_per_unit": round(random.uniform(0, 9), 2)})
+        elif choice < 0.8:
+            ingredient_id = ingredients.pop(random.randrange(len(ingredients)))
+            await self.request("DELETE /ingredients/{id}", "DELETE", f"/ingredients/{ingredient_id}")
+        elif choice < 0.9 or not recipes:
+            response = await self.request("POST /recipes", "POST", "/recipes",
+                                          json=recipe_payload(self.catalog, self.catalog["user_id"]))
+            if response.status_code == 201:
+                recipes.append(response.json()["id"])
+        elif choice < 0.95:
+            await self.request("PUT /recipes/{id}", "PUT", f"/recipes/{random.choice(recipes)}",
+                               json={"servings": random.randint(1, 8), "tags": random.sample(TAGS, 2)})
+        else:
+            recipe_id = recipes.pop(random.randrange(len(recipes)))
+            await self.request("DELETE /recipes/{id}", "DELETE", f"/recipes/{recipe_id}")
+
+
+def ingredient_rows(tag, count):
+    """Catalog rows named like "smoked paprika <tag>-17", so searches match on real words"""
+    for n in range(count):
+        category = random.choice(list(FOODS))
+        yield {
+            "name": f"{random.choice(QUALIFIERS)} {random.choice(FOODS[category])} {tag}-{n}",
+            "category": category,
+            "unit": random.choice(UNITS[category]),
+            "calories_per_unit": round(random.uniform(0, 9), 3),
+            "additional_data": {"nutrients": {"protein": round(random.uniform(0, 0.3), 3)}},
+        }
+
+
+def recipe_payload(catalog, user_id):
+    names = random.sample(catalog["ingredient_names"], random.randint(5, 12))
+    return {
+        "user_id": str(user_id),
+        "name": f"{' '.join(names[0].split()[:2])} bake",
+        "description": "Load test recipe",
+        "prep_time": random.randint(5, 45),
+        "cook_time": random.randint(0, 120),
+        "servings": random.randint(1, 8),
+        "ingredients": [{"name": name, "amount": random.randint(1, 500), "unit": "g"} for name in names],
+        "instructions": [{"step": step, "text": "Mix and cook"} for step in range(1, random.randint(3, 8))],
+        "tags": random.sample(TAGS, random.randint(1, 3)),
+        "is_public": True,
+    }
+
+
+async def seed(tag, ingredients, recipes):
+    from sqlalchemy import insert
+
+    from app.database import AsyncSessionLocal
+    from app.models import Ingredient, Recipe, RecipeDifficulty, User
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"{tag}-owner@example.com", username=f"{tag}-owner", password_hash="")
+        db.add(user)
+        await db.flush()
+
+        rows = list(ingredient_rows(tag, ingredients))
+        result = await db.execute(insert(Ingredient).returning(Ingredient.id), rows)
+        ingredient_ids = [str(row[0]) for row in result]
+
+        catalog = {"tag": tag, "user_id": user.id, "ingredient_names": [row["name"] for row in rows],
+                   "ingredient_ids": ingredient_ids}
+        recipe_rows = []
+        for _ in range(recipes):
+            payload = recipe_payload(catalog, user.id)
+            payload["user_id"] = user.id
+            payload["difficulty"] = random.choice(list(RecipeDifficulty))
+            payload["ingredient_count"] = len(payload["ingredients"])
+            recipe_rows.append(payload)
+        result = await db.execute(insert(Recipe).returning(Recipe.id), recipe_rows)
+        catalog["recipe_ids"] = [str(row[0]) for row in result]
+        await db.commit()
+
+    return catalog
+
+
+async def cleanup(tag):
+    from sqlalchemy import delete
+
+    from app.database import AsyncSessionLocal
+    from app.models import EmailOutbox, Ingredient, User
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Ingredient).where(Ingredient.name.like(f"% {tag}-%")))
+        await db.execute(delete(EmailOutbox).where(EmailOutbox.recipient.like(f"{tag}-%")))
+        # Recipes, sessions, magic links and activity go with their users
+        await db.execute(delete(User).where(User.email.like(f"{tag}-%")))
+        await db.commit()
+
+
+@asynccontextmanager
+async def http_clients(url):
+    """Yield a factory of HTTP clients, one per virtual user"""
+    if url:
+        yield lambda: httpx.AsyncClient(base_url=url, timeout=30.0)
+        return
+
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        yield lambda: httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=30.0)
+
+
+async def run_scenario(new_client, scenario, catalog, users, duration):
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def virtual_user():
+        # Its own client, so the session and read-your-writes cookies a user
+        # receives are only sent by that user
+        async with new_client() as client:
+            user = VirtualUser(client, stats, catalog)
+            step = getattr(user, scenario)
+            while loop.time() < deadline:
+                await step()
+
+    started = loop.time()
+    await asyncio.gather(*(virtual_user() for _ in range(users)))
+    return stats, loop.time() - started
+
+
+async def main_async(args):
+    from app.database import db_manager
+
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    # Marks everything this run seeds or creates, for cleanup
+    tag = f"lg{uuid.uuid4().hex[:8]}"
+    print_header("SmartKitchen Benchmark - HTTP load")
+    print(f"  target={args.url or 'in-process'} users={args.users} duration={args.duration}s "
+          f"ingredients={args.ingredients} recipes={args.recipes}\n")
+
+    try:
+        catalog = await seed(tag, args.ingredients, args.recipes)
+        async with http_clients(args.url) as new_client:
+            for scenario in scenarios:
+                if args.warmup:
+                    await run_scenario(new_client, scenario, catalog, args.users, args.warmup)
+                stats, elapsed = await run_scenario(new_client, scenario, catalog, args.users, args.duration)
+                stats.report(scenario, elapsed)
+    finally:
+        await cleanup(tag)
+        await db_manager.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scenario", choices=(*SCENARIOS, "all"), default="all")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unrecorded seconds before each scenario")
+    parser.add_argument("--ingredients", type=int, default=5000, help="Seeded catalog size")
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible traffic")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    if not args.url:
+        # In-process target: the login scenario would otherwise measure 429s
+        for name in ("RATE_LIMIT_MAGIC_LINK_IP", "RATE_LIMIT_MAGIC_LINK_EMAIL", "RATE_LIMIT_VERIFY_IP"):
+            os.environ.setdefault(name, "1000000/60")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: run the standard benchmarks and keep their results as JSON.
+
+Every benchmark writes <out>/<benchmark>.json with its result rows, the git
+commit and its arguments (see common.py). The default output directory is
+bench-results/<commit>, so running the suite on two commits and passing both
+directories to compare.py shows throughput and latency deltas.
+
+The micro-benchmarks and response benchmarks need no database; the rest run
+against DATABASE_URL.
+
+Usage:
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --quick --no-db
+    python benchmarks/run_suite.py --only loadgen bench_auth --out bench-results/baseline
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import common  # noqa: F401  (sets up sys.path and environment)
+
+from common import Timer, git_revision, print_header
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+# name -> (script, arguments, quick arguments, needs a database)
+SUITE = {
+    "bench_micro": ("bench_micro", [], ["--min-time", "0.05"], False),
+    "bench_json_responses": ("bench_json_responses", [], ["--requests", "5"], False),
+    "bench_metrics": ("bench_metrics", [], ["--requests", "5000"], False),
+    "bench_micro_db": ("bench_micro", ["--db"], ["--db", "--min-time", "0.05"], True),
+    "loadgen": ("loadgen", [], ["--duration", "5", "--warmup", "1", "--users", "20", "--ingredients", "1000",
+                                "--recipes", "200"], True),
+    "bench_auth": ("bench_auth", [], ["--requests", "1000"], True),
+    "bench_rate_limit": ("bench_rate_limit", [], ["--checks", "20000", "--db-checks", "500"], True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--out", type=Path, help="Results directory (default: bench-results/<commit>)")
+    parser.add_argument("--quick", action="store_true", help="Shorter runs, for a smoke test")
+    parser.add_argument("--no-db", action="store_true", help="Skip benchmarks that need PostgreSQL")
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help=f"Benchmarks to run (suite: {', '.join(SUITE)}; any bench_*.py also works)")
+    args = parser.parse_args()
+
+    out = args.out or BENCHMARKS_DIR.parent / "bench-results" / (git_revision() or "unknown")
+    names = args.only or list(SUITE)
+    failed = []
+
+    print_header(f"SmartKitchen benchmark suite -> {out}")
+    for name in names:
+        script, arguments, quick_arguments, needs_db = SUITE.get(name, (name, [], [], True))
+        if not (BENCHMARKS_DIR / f"{script}.py").exists():
+            print(f"\n<<< {name}: no such benchmark")
+            failed.append(name)
+            continue
+        if needs_db and args.no_db:
+            continue
+
+        env = {**os.environ, "BENCH_RESULTS_DIR": str(out), "BENCH_RESULTS_NAME": name}
+        print(f"\n>>> {name}", flush=True)
+        with Timer() as timer:
+            code = subprocess.call(
+                [sys.executable, str(BENCHMARKS_DIR / f"{script}.py"), *(quick_arguments if args.quick else arguments)],
+                env=env
+            )
+        print(f"<<< {name}: {'ok' if code == 0 else f'exit code {code}'} in {timer.elapsed:.1f}s")
+        if code != 0:
+            failed.append(name)
+
+    print(f"\nResults in {out}")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,12 +29,38 @@ export const authAPI = {
     const response = await api.post('/auth/logout');
     return response.data;
   },
+
+  getCurrentUser: async () => {
+    const response = await api.get('/auth/me');
+    return response.data;
+  },
 };
 
 // Ingredients API
 export const ingredientsAPI = {
-  getAll: async () => {
-    const response = await api.get('/ingredients');
+  getAll: async (params = {}) => {
+    // Follow keyset cursors until the whole (filtered) catalog is loaded
+    const items = [];
+    let cursor;
+    do {
+      const response = await api.get('/ingredients', {
+        params: { ...params, limit: 1000, cursor },
+      });
+      items.push(...response.data.items);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return items;
+  },
+
+  getPage: async (params = {}) => {
+    const response = await api.get('/ingredients', { params });
+    return response.data;
+  },
+
+  search: async (q, limit = 10) => {
+    const response = await api.get('/ingredients/search', {
+      params: { q, limit },
+    });
     return response.data;
   },
 
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Bulk ingredient import script for SmartKitchen.
+Upserts ingredients by name from a CSV (with header row) or NDJSON file.
+
+Usage:
+    python import_ingredients.py nutrition.csv
+    python import_ingredients.py nutrition.ndjson --batch-size 2000
+    cat nutrition.ndjson | python import_ingredients.py - --format ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.database import AsyncSessionLocal, async_engine
+from app.services.ingredient_import import (
+    DEFAULT_BATCH_SIZE,
+    SUPPORTED_FORMATS,
+    import_ingredients
+)
+
+
+async def read_lines(stream):
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+async def run(args, fmt):
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+    try:
+        async with AsyncSessionLocal() as db:
+            return await import_ingredients(
+                db=db,
+                lines=read_lines(stream),
+                fmt=fmt,
+                batch_size=args.batch_size
+            )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import ingredients from CSV or NDJSON")
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS,
+                        help="Input format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per upsert statement (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        suffix = Path(args.path).suffix.lower()
+        fmt = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(suffix)
+    if fmt is None:
+        parser.error("cannot detect format, pass --format csv|ndjson")
+
+    print("=" * 60)
+    print("SmartKitchen Ingredient Import")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    result = asyncio.run(run(args, fmt))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n  Rows read:  {result.total_rows}")
+    print(f"  Inserted:   {result.inserted}")
+    print(f"  Updated:    {result.updated}")
+    print(f"  Failed:     {result.failed}")
+    print(f"  Elapsed:    {elapsed:.2f}s ({result.total_rows / elapsed * 60:,.0f} rows/minute)")
+
+    if result.errors:
+        print("\n  Errors:")
+        for error in result.errors:
+            print(f"    line {error.line}: {error.error}")
+        if result.errors_truncated:
+            print(f"    ... and {result.failed - len(result.errors)} more")
+
+    print("=" * 60)
+    sys.exit(1 if result.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
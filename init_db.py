@@ -22,9 +22,11 @@ from app.models import Base
 
 
 def get_table_names():
-    """Get all table names from the database."""
+    """Get all table names from the database (without log partitions)."""
     inspector = inspect(engine)
-    return inspector.get_table_names()
+    with engine.connect() as conn:
+        partitions = set(conn.execute(text("SELECT relname FROM pg_class WHERE relispartition")).scalars())
+    return [table for table in inspector.get_table_names() if table not in partitions]
 
 
 def main():
@@ -74,14 +76,21 @@ def main():
     expected_tables = [
         'users',
         'magic_links',
+        'user_sessions',
+        'email_outbox',
+        'rate_limit_buckets',
         'recipes',
+        'recipe_ingredients',
+        'recipe_nutrition',
         'ingredients',
         'appliances',
         'meal_plans',
         'meal_plan_recipes',
         'shopping_lists',
         'activity_logs',
-        'appliance_usage_logs'
+        'appliance_usage_logs',
+        'appliance_energy_hourly',
+        'user_activity_daily'
     ]
 
     print(f"\n  Expected tables: {len(expected_tables)}")
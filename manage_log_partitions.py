@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Log partition maintenance for SmartKitchen.
+Manages the monthly partitions of activity_logs and appliance_usage_logs.
+
+Usage:
+    python manage_log_partitions.py ensure --months-ahead 3
+    python manage_log_partitions.py retention --archive-schema log_archive
+    python manage_log_partitions.py migrate
+    python manage_log_partitions.py list
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.database import engine
+from app.services.log_partitions import (
+    ARCHIVE_SCHEMA,
+    MONTHS_AHEAD,
+    RETENTION_MONTHS,
+    apply_retention,
+    ensure_partitions,
+    list_partitions,
+    migrate_to_partitioned
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly log partitions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ensure = subparsers.add_parser("ensure", help="Create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+
+    retention = subparsers.add_parser("retention", help="Drop or archive expired partitions")
+    retention.add_argument("--archive-schema", default=ARCHIVE_SCHEMA,
+                           help="Move expired partitions to this schema instead of dropping them")
+
+    subparsers.add_parser("migrate", help="Convert unpartitioned log tables (copies all rows)")
+    subparsers.add_parser("list", help="List monthly partitions")
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SmartKitchen Log Partitions")
+    print("=" * 60)
+
+    with engine.begin() as conn:
+        if args.command == "ensure":
+            created = ensure_partitions(conn, months_ahead=args.months_ahead)
+            print(f"  Created {len(created)} partition(s)")
+            for name in created:
+                print(f"    + {name}")
+
+        elif args.command == "retention":
+            expired = apply_retention(conn, archive_schema=args.archive_schema)
+            action = f"Archived to {args.archive_schema}" if args.archive_schema else "Dropped"
+            print(f"  {action}: {len(expired)} partition(s)")
+            for name in expired:
+                print(f"    - {name}")
+
+        elif args.command == "migrate":
+            for table in RETENTION_MONTHS:
+                migrated = migrate_to_partitioned(conn, table)
+                print(f"  {table}: {migrated} row(s) migrated")
+
+        else:
+            for table, months in RETENTION_MONTHS.items():
+                print(f"\n  {table} (retention: {months} months)")
+                for name, month in list_partitions(conn, table):
+                    print(f"    {month:%Y-%m}  {name}")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,56 @@
 #!/bin/bash
 # SmartKitchen API Server Startup Script
+#
+#   ./run_server.sh          development server with auto-reload
+#   ./run_server.sh prod     multi-worker server (backend/gunicorn.conf.py)
+#   ./run_server.sh reload   load new code into a running prod server without downtime
+#   ./run_server.sh stop     graceful stop of the prod server
 
-echo "Starting SmartKitchen API Server..."
-echo "=================================="
+MODE="${1:-dev}"
+PIDFILE="${PIDFILE:-/tmp/smartkitchen-gunicorn.pid}"
+export PIDFILE
 
 # Load environment variables
-export $(cat .env | xargs)
+if [ -f .env ]; then
+    export $(grep -v '^#' .env | xargs)
+fi
 
-# Start uvicorn server
 cd backend
-uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+
+case "$MODE" in
+    dev)
+        echo "Starting SmartKitchen API Server..."
+        echo "=================================="
+        uvicorn app.main:app --reload --host 0.0.0.0 --port "${PORT:-8000}"
+        ;;
+    prod)
+        echo "Starting SmartKitchen API Server (production)..."
+        echo "=================================="
+        exec gunicorn -c gunicorn.conf.py app.main:app
+        ;;
+    reload)
+        # USR2 starts a new master from the current code next to the old one
+        # (its pid goes to $PIDFILE.2); once its workers serve, the old master
+        # stops its workers gracefully and the new one takes over $PIDFILE
+        OLD_PID=$(cat "$PIDFILE") || exit 1
+        kill -USR2 "$OLD_PID"
+        for _ in $(seq 1 60); do
+            if [ -s "$PIDFILE.2" ]; then
+                sleep "${RELOAD_WARMUP:-2}"
+                kill -TERM "$OLD_PID"
+                echo "Reloaded: $OLD_PID -> $(cat "$PIDFILE.2")"
+                exit 0
+            fi
+            sleep 1
+        done
+        echo "New master did not start; $OLD_PID keeps serving" >&2
+        exit 1
+        ;;
+    stop)
+        kill -TERM "$(cat "$PIDFILE")"
+        ;;
+    *)
+        echo "Usage: $0 [dev|prod|reload|stop]" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Synthetic data seeding script for SmartKitchen.
+Fills every table with deterministic, realistic data at a chosen scale,
+written with COPY from parallel worker processes.
+
+Row counts scale with --users (see app.services.seeding.default_counts);
+single tables can be overridden with --rows. The same --seed, counts,
+--chunk-size and --anchor always produce the same rows.
+
+Usage:
+    python seed_data.py --users 1000
+    python seed_data.py --users 100000 --workers 8 --truncate
+    python seed_data.py --users 20000 --rows appliance_usage_logs=10000000 --days 60
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_path = Path(__file__).parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy.engine import make_url
+
+from app.database import ASYNC_DATABASE_URL, engine
+from app.services.log_partitions import RETENTION_MONTHS
+from app.services.seeding import (
+    DEFAULT_CHUNK_SIZE,
+    GENERATED_TABLES,
+    SeedPlan,
+    analyze,
+    default_counts,
+    non_empty_tables,
+    prepare_partitions,
+    seed,
+    truncate
+)
+
+
+def parse_rows(values):
+    overrides = {}
+    for value in values:
+        table, _, count = value.partition("=")
+        if table not in GENERATED_TABLES or not count.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected TABLE=N with TABLE one of: {', '.join(GENERATED_TABLES)}"
+            )
+        overrides[table] = int(count)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic data")
+    parser.add_argument("--users", type=int, default=1000, help="Scale: number of users (default: 1000)")
+    parser.add_argument("--rows", action="append", default=[], metavar="TABLE=N",
+                        help="Row count override for one table (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--days", type=int, default=90, help="Days of history before --anchor (default: 90)")
+    parser.add_argument("--anchor", type=date.fromisoformat, help="Last seeded day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per COPY transaction (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--truncate", action="store_true", help="Empty the seeded tables first")
+    parser.add_argument("--yes", action="store_true", help="Do not ask before truncating")
+    args = parser.parse_args()
+
+    try:
+        counts = {**default_counts(args.users), **parse_rows(args.rows)}
+        plan = SeedPlan(counts, seed=args.seed, days=args.days, anchor=args.anchor, chunk_size=args.chunk_size)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    print("=" * 60)
+    print("SmartKitchen Data Seeding")
+    print("=" * 60)
+    print(f"\n  Seed {plan.seed}, {plan.days} days up to {plan.anchor:%Y-%m-%d}, {args.workers} worker(s)")
+    for table, count in plan.counts.items():
+        print(f"    {table:<24} {count:>12,}")
+    for table, months in RETENTION_MONTHS.items():
+        if plan.days > months * 30:
+            print(f"  Note: {table} rows older than {months} months are dropped by log retention")
+
+    with engine.begin() as conn:
+        existing = non_empty_tables(conn)
+        if existing and args.truncate:
+            if not args.yes:
+                response = input(f"\n  Truncate {', '.join(existing)}? (yes/no): ")
+                if response.lower() not in ['yes', 'y']:
+                    sys.exit(1)
+            truncate(conn)
+            print("  ✓ Tables truncated")
+        elif existing:
+            print(f"\n  ✗ Tables already contain data: {', '.join(existing)}")
+            print("    Seeded keys would collide; rerun with --truncate")
+            sys.exit(1)
+
+        created = prepare_partitions(conn, plan)
+        print(f"  ✓ {len(created)} log partition(s) created")
+    # Workers open their own connections
+    engine.dispose()
+
+    print("\n  Seeding...")
+    dsn = make_url(ASYNC_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+    def report(table, rows, elapsed):
+        details = ", ".join(f"{name} {count:,}" for name, count in rows.items())
+        print(f"    ✓ {details} in {elapsed:.1f}s ({rows[table] / elapsed:,.0f} {table}/s)")
+
+    start = time.perf_counter()
+    written = seed(dsn, plan, workers=args.workers, report=report)
+    elapsed = time.perf_counter() - start
+
+    print("\n  Analyzing...")
+    with engine.begin() as conn:
+        analyze(conn)
+
+    total = sum(written.values())
+    print("\n" + "=" * 60)
+    print(f"Seeded {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
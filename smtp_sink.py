@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Local SMTP sink for SmartKitchen development and benchmarks.
+Accepts every message and throws it away (or prints it), so the email outbox
+can be exercised without a real mail server.
+
+Usage:
+    python smtp_sink.py --port 1025 --verbose
+    SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=false ./run_server.sh
+
+Options such as --delay and --fail-rate simulate a slow or flaky server.
+"""
+
+import argparse
+import asyncio
+import random
+from email import message_from_bytes
+
+
+class SMTPSink:
+    """
+    Minimal SMTP server (HELO/EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT).
+
+    Args:
+        delay: Seconds to wait before acknowledging each message
+        fail_rate: Fraction of messages answered with a temporary 451 error
+        verbose: Print a line per received message
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025, delay: float = 0.0,
+                 fail_rate: float = 0.0, verbose: bool = False):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.server = None
+        self.connections = 0
+        self.received = 0
+        self.rejected = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+
+        async def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 smartkitchen-smtp-sink ready")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip().split(" ", 1)[0].upper()
+
+                if command == "EHLO":
+                    await reply("250-smartkitchen-smtp-sink")
+                    await reply("250-8BITMIME")
+                    await reply("250 SIZE 10485760")
+                elif command in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = bytearray()
+                    while True:
+                        chunk = await reader.readline()
+                        if not chunk or chunk in (b".\r\n", b".\n"):
+                            break
+                        data += chunk[1:] if chunk.startswith(b"..") else chunk
+
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    if random.random() < self.fail_rate:
+                        self.rejected += 1
+                        await reply("451 Temporary failure, try again later")
+                        continue
+
+                    self.received += 1
+                    if self.verbose:
+                        message = message_from_bytes(bytes(data))
+                        print(f"[{self.received}] To: {message['To']}  Subject: {message['Subject']}")
+                    await reply("250 OK: queued")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    sink = SMTPSink(args.host, args.port, args.delay, args.fail_rate, args.verbose)
+    await sink.start()
+    print("=" * 60)
+    print(f"SmartKitchen SMTP sink listening on {sink.host}:{sink.port}")
+    print("=" * 60)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"  connections={sink.connections} received={sink.received} rejected={sink.rejected}")
+    finally:
+        await sink.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds per message")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of messages to defer")
+    parser.add_argument("--verbose", action="store_true", help="Print every message")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()